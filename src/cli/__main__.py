@@ -8,6 +8,7 @@ from cli.export_command import export_command
 from cli.link_local_command import link_local
 from cli.bandcamp_command import bandcamp_wishlist_add
 from cli.match_files_command import match_files
+from cli.undo_command import undo
 
 
 def _get_version() -> str:
@@ -37,6 +38,7 @@ def cli():
 # Register all commands
 cli.add_command(export_command, name="rekordbox-export")
 cli.add_command(link_local, name="rekordbox-link-local")
+cli.add_command(undo, name="rekordbox-undo")
 cli.add_command(match_files, name="match-files")
 cli.add_command(bandcamp_wishlist_add, name="bandcamp-wishlist-add")
 
@@ -28,9 +28,25 @@ from services.bandcamp_wishlist import BandcampWishlistAutomator
     type=float,
     default=2.0,
     show_default=True,
-    help="Delay in seconds between processing tracks",
+    help="Delay in seconds between track pages opened in the browser",
 )
-def bandcamp_wishlist_add(input_csv: str, progress_csv: str, delay: float):
+@click.option(
+    "--search-concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Bandcamp searches to run at once",
+)
+@click.option(
+    "--search-rate",
+    type=click.FloatRange(min=0.1),
+    default=2.0,
+    show_default=True,
+    help="Maximum Bandcamp search requests per second",
+)
+def bandcamp_wishlist_add(
+    input_csv: str, progress_csv: str, delay: float, search_concurrency: int, search_rate: float
+):
     """Add tracks from a CSV to your Bandcamp wishlist.
 
     This command automates adding tracks to your Bandcamp wishlist with progress tracking
@@ -44,6 +60,9 @@ def bandcamp_wishlist_add(input_csv: str, progress_csv: str, delay: float):
 
       # Use custom progress file and delay
       dj-tool bandcamp-wishlist-add -i tracks.csv -p progress.csv -d 3.0
+
+      # Search more gently
+      dj-tool bandcamp-wishlist-add -i tracks.csv --search-concurrency 2 --search-rate 1
     """
     # Prompt for credentials
     click.echo("=" * 60)
@@ -59,7 +78,12 @@ def bandcamp_wishlist_add(input_csv: str, progress_csv: str, delay: float):
 
     # Initialize automator
     automator = BandcampWishlistAutomator(
-        username=username, password=password, delay_between_tracks=delay, progress_csv=progress_csv
+        username=username,
+        password=password,
+        delay_between_tracks=delay,
+        progress_csv=progress_csv,
+        search_concurrency=search_concurrency,
+        search_rate=search_rate,
     )
 
     try:
@@ -1,16 +1,21 @@
 """CLI command for linking local files to Rekordbox streaming tracks."""
 import click
+import os
 import sys
 from pathlib import Path
 from services.rekordbox import RekordboxAdapter
 from services.link_local_service import LinkLocalService
+from services.conversion_cache import default_cache_path
+from services.db_backup import BACKUP_RETENTION
+from services.link_checkpoint import default_checkpoint_path
+from services.link_plan import LinkPlan
 
 
 @click.command(name="link-local")
 @click.option(
     '--csv', 'csv_path',
-    required=True,
     type=click.Path(exists=True),
+    default=None,
     help='CSV file with rekordboxId (or artist/title), and file path'
 )
 @click.option(
@@ -22,7 +27,7 @@ from services.link_local_service import LinkLocalService
 @click.option(
     '--match-threshold',
     type=float,
-    default=0.75,
+    default=None,
     help='Similarity threshold for fuzzy matching (0.0-1.0, default: 0.75)'
 )
 @click.option(
@@ -87,12 +92,55 @@ from services.link_local_service import LinkLocalService
     default=None,
     help='Output directory for converted files (default: same as source)'
 )
+@click.option(
+    '--convert-jobs',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Number of conversions to run at once (default: number of CPU cores)'
+)
+@click.option(
+    '--no-conversion-cache',
+    is_flag=True,
+    default=False,
+    help='Always convert again instead of reusing files converted by earlier runs'
+)
 @click.option(
     '--skip-reanalyze',
     is_flag=True,
     default=False,
     help='Skip forcing Rekordbox to re-analyze linked tracks (re-analysis is automatic by default)'
 )
+@click.option(
+    '--keep-backups',
+    type=click.IntRange(min=0),
+    default=BACKUP_RETENTION,
+    show_default=True,
+    help='Database backups to keep next to master.db (0 keeps all)'
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    default=False,
+    help='Continue an interrupted --apply run from its checkpoint instead of starting over'
+)
+@click.option(
+    '--save-plan', 'save_plan',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Save the dry run\'s matches and decisions to a plan file for --apply-plan'
+)
+@click.option(
+    '--apply-plan', 'apply_plan',
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help='Write the updates of a saved plan without matching again (replaces --csv)'
+)
+@click.option(
+    '--pipeline',
+    is_flag=True,
+    default=False,
+    help='Read, match, validate, convert and write rows in concurrent stages'
+)
 def link_local(
     csv_path,
     no_id_match,
@@ -107,7 +155,14 @@ def link_local(
     convert_to,
     convert_from,
     conversion_dir,
-    skip_reanalyze
+    convert_jobs,
+    no_conversion_cache,
+    skip_reanalyze,
+    keep_backups,
+    resume,
+    save_plan,
+    apply_plan,
+    pipeline
 ):
     """Convert streaming tracks to local file references.
     
@@ -118,6 +173,22 @@ def link_local(
     regenerate waveforms and beat grids. Use --skip-reanalyze to disable.
     
     Optionally converts audio files to a different format using ffmpeg.
+    Conversions are remembered in ~/.cache/dj-tool/conversions.db, so files
+    converted by an earlier run with the same settings are reused.
+    
+    With --apply, each row's progress is recorded in a checkpoint file next
+    to the CSV (tracks.checkpoint.csv) and updates are committed in batches.
+    If the run is interrupted, rerun it with --resume to skip rows already
+    written and reuse finished conversions.
+    
+    A dry run with --save-plan stores its matches, resolved paths and
+    conversion decisions. --apply-plan then writes exactly those updates
+    without parsing or matching again, refusing files changed since.
+    
+    With --pipeline, CSV reading, matching, validation, conversion and
+    database writes overlap, connected by bounded queues; each row's output
+    is printed when it finishes and the summary reports each stage's
+    throughput.
     
     \b
     Examples:
@@ -141,8 +212,63 @@ def link_local(
       
       # Convert only MP3 and AAC files to FLAC
       rekordbox link-local --csv tracks.csv --convert-to flac --convert-from mp3 --convert-from aac --apply
+      
+      # Run at most 4 conversions at once
+      rekordbox link-local --csv tracks.csv --convert-to aiff --convert-jobs 4 --apply
+      
+      # Continue after an interruption
+      rekordbox link-local --csv tracks.csv --convert-to aiff --apply --resume
+      
+      # Review once, then write what was reviewed
+      rekordbox link-local --csv tracks.csv --no-id-match --save-plan plan.json
+      rekordbox link-local --apply-plan plan.json
     """
     # Validate arguments
+    if bool(csv_path) == bool(apply_plan):
+        click.echo("Error: Specify either --csv or --apply-plan", err=True)
+        sys.exit(1)
+    
+    plan = None
+    if apply_plan:
+        planned_options = [
+            name for name, given in (
+                ('--no-id-match', no_id_match), ('--match-threshold', match_threshold is not None),
+                ('--limit', limit),
+                ('--allow-mismatch', allow_mismatch), ('--force', force),
+                ('--convert-to', convert_to), ('--convert-from', convert_from),
+                ('--conversion-dir', conversion_dir), ('--skip-reanalyze', skip_reanalyze),
+                ('--save-plan', save_plan),
+            ) if given
+        ]
+        if planned_options:
+            click.echo(f"Error: {', '.join(planned_options)} cannot be used with --apply-plan "
+                       "(settings come from the plan)", err=True)
+            sys.exit(1)
+        try:
+            plan = LinkPlan.load(Path(apply_plan))
+        except (OSError, ValueError) as e:
+            click.echo(f"Error: Cannot read plan: {e}", err=True)
+            sys.exit(1)
+        
+        # Matching and conversion settings come from the plan
+        settings = plan.settings
+        csv_path = plan.csv_path
+        no_id_match = settings["use_fuzzy_match"]
+        match_threshold = settings["match_threshold"]
+        allow_mismatch = settings["allow_mismatch"]
+        force = settings["force"]
+        convert_to = settings["convert_format"]
+        convert_from = settings["convert_from_formats"]
+        conversion_dir = settings["conversion_output_dir"]
+        skip_reanalyze = not settings["force_reanalyze"]
+        apply = True
+    elif save_plan and apply:
+        click.echo("Error: --save-plan only works with a dry run", err=True)
+        sys.exit(1)
+    
+    if match_threshold is None:
+        match_threshold = 0.75
+    
     if match_threshold < 0.0 or match_threshold > 1.0:
         click.echo("Error: --match-threshold must be between 0.0 and 1.0", err=True)
         sys.exit(1)
@@ -174,6 +300,8 @@ def link_local(
     click.echo("Rekordbox Link Local Files")
     click.echo("=" * 60)
     click.echo(f"CSV: {csv_path}")
+    if plan is not None:
+        click.echo(f"Plan: {apply_plan} (made {plan.created}, {len(plan.writes)} update(s))")
     click.echo(f"Mode: {'DRY RUN (preview only)' if actual_dry_run else 'APPLY CHANGES'}")
     
     if no_id_match:
@@ -190,6 +318,17 @@ def link_local(
             click.echo(f"Convert only from: {', '.join(f.upper() for f in convert_from)}")
         if conversion_dir:
             click.echo(f"Conversion output: {conversion_dir}")
+        if convert_jobs:
+            click.echo(f"Parallel conversions: {convert_jobs}")
+        if no_conversion_cache:
+            click.echo("Conversion cache: disabled")
+    
+    checkpoint_path = default_checkpoint_path(Path(apply_plan or csv_path))
+    if resume:
+        click.echo(f"Resuming from: {checkpoint_path}")
+    
+    if pipeline:
+        click.echo("Execution: Pipelined stages")
     
     if not skip_reanalyze:
         click.echo(f"Force re-analysis: Yes (tracks will be re-analyzed in Rekordbox)")
@@ -221,6 +360,12 @@ def link_local(
     click.echo("✓ Connected to database")
     click.echo()
     
+    if plan is not None and plan.database and adapter.db_path:
+        if os.path.abspath(plan.database) != os.path.abspath(adapter.db_path):
+            click.echo(f"✗ Error: Plan was made against {plan.database}, not {adapter.db_path}", err=True)
+            adapter.close()
+            sys.exit(1)
+    
     try:
         # Initialize service
         service = LinkLocalService(
@@ -236,7 +381,15 @@ def link_local(
             convert_format=convert_to,
             convert_from_formats=list(convert_from) if convert_from else None,
             conversion_output_dir=Path(conversion_dir) if conversion_dir else None,
-            force_reanalyze=not skip_reanalyze
+            force_reanalyze=not skip_reanalyze,
+            conversion_workers=convert_jobs,
+            conversion_cache_path=None if no_conversion_cache else default_cache_path(),
+            keep_backups=keep_backups,
+            checkpoint_path=checkpoint_path,
+            resume=resume,
+            plan_path=Path(save_plan) if save_plan else None,
+            plan=plan,
+            pipeline=pipeline
         )
         
         # Execute
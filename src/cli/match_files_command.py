@@ -1,10 +1,14 @@
 """Match files CLI command."""
 import sys
+from pathlib import Path
 
 import click
 
 from services.file_path_matcher import FilePathMatcher
 
+# Scan cache file created next to the output CSV
+SCAN_CACHE_FILENAME = ".match-files-scan-cache.db"
+
 
 @click.command(name="match-files")
 @click.option(
@@ -47,13 +51,39 @@ from services.file_path_matcher import FilePathMatcher
     default=None,
     help="Optional path for detailed Markdown report",
 )
-def match_files(input_csv: str, scan_dir: str, output_csv: str, similarity: float, report_path: str):
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes used for similarity scoring",
+)
+@click.option(
+    "--no-scan-cache",
+    "no_scan_cache",
+    is_flag=True,
+    default=False,
+    help="Re-list every directory instead of reusing the scan cache next to the output CSV",
+)
+def match_files(
+    input_csv: str,
+    scan_dir: str,
+    output_csv: str,
+    similarity: float,
+    report_path: str,
+    workers: int,
+    no_scan_cache: bool,
+):
     """Fuzzy-match CSV tracks to local music files.
 
     This command scans a directory for music files and matches them with tracks from
     a CSV export based on artist and title similarity. The output CSV contains only
     successfully matched tracks with their file paths.
 
+    Directory listings are cached in a SQLite file next to the output CSV, so
+    later runs only re-list directories that changed since the previous scan.
+
     \b
     Examples:
       # Basic matching
@@ -65,10 +95,22 @@ def match_files(input_csv: str, scan_dir: str, output_csv: str, similarity: floa
 
       # Lower threshold for more matches (may include false positives)
       dj-tool match-files -i tracks.csv -s ~/Music -o matched.csv -t 0.4
+
+      # Score tracks on 8 CPU cores
+      dj-tool match-files -i tracks.csv -s ~/Music -o matched.csv --workers 8
+
+      # Ignore the scan cache and list every directory again
+      dj-tool match-files -i tracks.csv -s ~/Music -o matched.csv --no-scan-cache
     """
     try:
+        scan_cache_path = None
+        if not no_scan_cache:
+            scan_cache_path = str(Path(output_csv).resolve().parent / SCAN_CACHE_FILENAME)
+
         # Create matcher with specified threshold
-        matcher = FilePathMatcher(similarity_threshold=similarity)
+        matcher = FilePathMatcher(
+            similarity_threshold=similarity, workers=workers, scan_cache_path=scan_cache_path
+        )
 
         # Process: load, scan, match, export
         matcher.process(csv_path=input_csv, scan_dir=scan_dir, output_path=output_csv, report_path=report_path)
@@ -0,0 +1,122 @@
+"""CLI command for reverting link-local writes from the undo journal."""
+import click
+import sys
+from pathlib import Path
+from services.rekordbox import RekordboxAdapter
+from services.undo_journal import UndoJournal, default_journal_path
+
+
+@click.command(name="undo")
+@click.option(
+    '--db-path',
+    type=click.Path(),
+    default=None,
+    help='Explicit path to Rekordbox database'
+)
+@click.option(
+    '--journal', 'journal_path',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Undo journal (default: master.undo.jsonl next to the database)'
+)
+@click.option(
+    '--run', 'run_id',
+    default=None,
+    help='Run to revert (default: the most recent one not yet undone)'
+)
+@click.option(
+    '--list', 'list_runs',
+    is_flag=True,
+    default=False,
+    help='List journaled runs and exit'
+)
+@click.option(
+    '--force',
+    is_flag=True,
+    default=False,
+    help='Also restore rows that changed after the run'
+)
+def undo(db_path, journal_path, run_id, list_runs, force):
+    """Revert the database rows changed by a link-local --apply run.
+
+    Every write link-local makes is journaled with the row's previous
+    FolderPath, FileSize, ServiceID and analysis fields. This command puts
+    those values back in one transaction, touching only the journaled rows.
+    Rows edited since the run are skipped unless --force is given.
+
+    \b
+    Examples:
+      # Show journaled runs
+      dj-tool rekordbox-undo --list
+
+      # Revert the last run
+      dj-tool rekordbox-undo
+
+      # Revert a specific run
+      dj-tool rekordbox-undo --run 20240101_120000_000000
+    """
+    adapter = RekordboxAdapter()
+
+    if journal_path is None:
+        resolved_db = db_path or adapter.find_database()
+        if resolved_db is None:
+            click.echo("✗ Error: Database not found - please specify --db-path", err=True)
+            sys.exit(1)
+        journal_path = default_journal_path(Path(resolved_db))
+    journal = UndoJournal(Path(journal_path))
+
+    runs = journal.runs()
+    if list_runs:
+        if not runs:
+            click.echo(f"No journaled runs in {journal.path}")
+        for run in runs:
+            status = "undone" if run.undone else "active"
+            click.echo(f"{run.run}  {run.rows:>6} row change(s)  {status}")
+        return
+
+    run_id = run_id or journal.last_run()
+    if run_id is None:
+        click.echo(f"Nothing to undo in {journal.path}")
+        return
+
+    entries = journal.entries(run_id)
+    if not entries:
+        click.echo(f"✗ Error: Run {run_id} not found in {journal.path}", err=True)
+        sys.exit(1)
+    if any(run.run == run_id and run.undone for run in runs) and not force:
+        click.echo(f"✗ Error: Run {run_id} was already undone (use --force to replay it)", err=True)
+        sys.exit(1)
+
+    track_count = len({entry.track_id for entry in entries})
+    click.echo(f"Reverting run {run_id}: {track_count} track(s)")
+    click.echo()
+    click.echo("⚠ IMPORTANT: Please close Rekordbox before continuing!")
+    click.confirm("   Have you closed Rekordbox?", abort=True)
+    click.echo()
+
+    if not adapter.connect(db_path):
+        click.echo(f"✗ Error: {adapter.error_message}", err=True)
+        sys.exit(1)
+
+    try:
+        outcome = adapter.undo_journal_entries(entries, force=force)
+        if outcome is None:
+            click.echo(f"✗ Error: {adapter.error_message}", err=True)
+            sys.exit(1)
+
+        restored, skipped = outcome
+        # A partly reverted run stays active, so undoing it again (once the
+        # skipped rows are sorted out) needs no --force
+        if not skipped:
+            journal.mark_undone(run_id)
+
+        click.echo(f"✓ Restored {restored} track(s)")
+        if skipped:
+            click.echo(f"⊘ Skipped {len(skipped)} track(s) changed since the run or no longer in the database:")
+            for track_id in skipped[:20]:
+                click.echo(f"    {track_id}")
+            if len(skipped) > 20:
+                click.echo(f"    ... and {len(skipped) - 20} more")
+            click.echo(f"  Run {run_id} is not marked undone. Use --force to restore them anyway.")
+    finally:
+        adapter.close()
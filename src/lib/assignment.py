@@ -0,0 +1,180 @@
+"""One-to-one assignment of tracks to candidate files.
+
+Solves a sparse bipartite matching problem: every track has a short list of
+(file, similarity) candidates and each file may be used by at most one
+track. The assignment matches as many tracks as possible and, among those
+assignments, maximizes the total similarity (min-cost max-flow with cost
+1 - similarity, solved by successive shortest paths).
+
+Candidate graphs are split into connected components first. Components
+without a conflict (every track's best file is unique to it) are resolved
+directly; only the rest go through the flow solver, each on its own small
+graph.
+"""
+import heapq
+from typing import Dict, List, Tuple
+
+# (file index, similarity) candidates of one track, best first
+Candidates = List[Tuple[int, float]]
+
+
+def _components(candidates: Dict[int, Candidates]) -> List[List[int]]:
+    """Group tracks that (transitively) share candidate files."""
+    parent: Dict[int, int] = {}
+
+    def find(track: int) -> int:
+        root = track
+        while parent[root] != root:
+            root = parent[root]
+        while parent[track] != root:
+            parent[track], track = root, parent[track]
+        return root
+
+    file_owner: Dict[int, int] = {}
+    for track in candidates:
+        parent[track] = track
+    for track, options in candidates.items():
+        for file_index, _ in options:
+            owner = file_owner.setdefault(file_index, track)
+            if owner != track:
+                root_a, root_b = find(owner), find(track)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups: Dict[int, List[int]] = {}
+    for track in sorted(candidates):
+        groups.setdefault(find(track), []).append(track)
+    return list(groups.values())
+
+
+def _solve_component(
+    tracks: List[int], candidates: Dict[int, Candidates]
+) -> Dict[int, Tuple[int, float]]:
+    """Min-cost max-flow assignment for one connected component."""
+    # Node ids: 0 = source, 1 = sink, tracks and files follow
+    track_node = {track: 2 + i for i, track in enumerate(tracks)}
+    files = sorted({f for track in tracks for f, _ in candidates[track]})
+    file_node = {f: 2 + len(tracks) + i for i, f in enumerate(files)}
+    node_count = 2 + len(tracks) + len(files)
+
+    # Edge arrays: to, capacity, cost; edge e ^ 1 is its reverse edge
+    to: List[int] = []
+    cap: List[int] = []
+    cost: List[float] = []
+    adjacency: List[List[int]] = [[] for _ in range(node_count)]
+
+    def add_edge(u: int, v: int, edge_cost: float) -> None:
+        adjacency[u].append(len(to))
+        to.append(v)
+        cap.append(1)
+        cost.append(edge_cost)
+        adjacency[v].append(len(to))
+        to.append(u)
+        cap.append(0)
+        cost.append(-edge_cost)
+
+    for track in tracks:
+        add_edge(0, track_node[track], 0.0)
+        for file_index, similarity in candidates[track]:
+            add_edge(track_node[track], file_node[file_index], 1.0 - similarity)
+    for file_index in files:
+        add_edge(file_node[file_index], 1, 0.0)
+
+    potential = [0.0] * node_count
+    while True:
+        dist = [float('inf')] * node_count
+        via_edge = [-1] * node_count
+        dist[0] = 0.0
+        heap = [(0.0, 0)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == 1:
+                # Nodes beyond the sink do not matter for this augmentation
+                break
+            for e in adjacency[u]:
+                if cap[e] == 0:
+                    continue
+                v = to[e]
+                # Potentials keep reduced costs >= 0 (up to float rounding)
+                nd = d + max(cost[e] + potential[u] - potential[v], 0.0)
+                if nd < dist[v]:
+                    dist[v] = nd
+                    via_edge[v] = e
+                    heapq.heappush(heap, (nd, v))
+
+        sink_dist = dist[1]
+        if sink_dist == float('inf'):
+            break
+
+        # Capping at the sink distance keeps the potentials valid after an
+        # early stop
+        for node in range(node_count):
+            potential[node] += min(dist[node], sink_dist)
+
+        node = 1
+        while node != 0:
+            e = via_edge[node]
+            cap[e] -= 1
+            cap[e ^ 1] += 1
+            node = to[e ^ 1]
+
+    node_file = {node: f for f, node in file_node.items()}
+    assignment = {}
+    for track in tracks:
+        similarities = dict(candidates[track])
+        for e in adjacency[track_node[track]]:
+            # A saturated forward edge to a file node is the chosen candidate
+            if e % 2 == 0 and cap[e] == 0 and to[e] in node_file:
+                file_index = node_file[to[e]]
+                assignment[track] = (file_index, similarities[file_index])
+    return assignment
+
+
+def assign_candidates(candidates: Dict[int, Candidates]) -> Dict[int, Tuple[int, float]]:
+    """Assign each track at most one file, using each file at most once.
+
+    Args:
+        candidates: Track index -> (file index, similarity) candidates,
+            best first
+
+    Returns:
+        Track index -> (file index, similarity) for every assigned track
+    """
+    assignment: Dict[int, Tuple[int, float]] = {}
+
+    for tracks in _components(candidates):
+        best_files = [candidates[track][0][0] for track in tracks if candidates[track]]
+        if len(best_files) == len(set(best_files)) and len(best_files) == len(tracks):
+            # No two tracks want the same file: everyone gets their best
+            for track in tracks:
+                assignment[track] = candidates[track][0]
+            continue
+        assignment.update(_solve_component(tracks, candidates))
+
+    return assignment
+
+
+def greedy_assignment(candidates: Dict[int, Candidates]) -> Dict[int, Tuple[int, float]]:
+    """Give each file to the most similar track that ranks it first.
+
+    Tracks losing their best file stay unassigned (ties go to the lower
+    track index). Used as the baseline the optimal assignment is compared
+    against.
+
+    Args:
+        candidates: Track index -> (file index, similarity) candidates,
+            best first
+
+    Returns:
+        Track index -> (file index, similarity) for every assigned track
+    """
+    winners: Dict[int, Tuple[int, float]] = {}
+    for track in sorted(candidates):
+        if not candidates[track]:
+            continue
+        file_index, similarity = candidates[track][0]
+        if file_index not in winners or similarity > winners[file_index][1]:
+            winners[file_index] = (track, similarity)
+    return {track: (file_index, similarity) for file_index, (track, similarity) in winners.items()}
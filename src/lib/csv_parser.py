@@ -1,9 +1,16 @@
 """CSV parser for track mapping files."""
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional
-from lib.path_utils import normalize_path
+from typing import IO, Iterator, List, Dict, Optional, Union
+from lib.path_utils import DirectoryCache, stat_path
+
+# Rows whose file paths are resolved and stat'ed together
+STAT_BATCH_SIZE = 64
+
+# Threads looking up file paths (file checks are latency-bound on network shares)
+STAT_WORKERS = 8
 
 
 @dataclass
@@ -23,6 +30,19 @@ class TrackMapping:
     matched_track_id: Optional[int] = None
     match_confidence: Optional[float] = None
     match_ambiguous: bool = False
+    
+    # CSV row number (header is row 1)
+    row_num: int = 0
+
+
+@dataclass
+class CSVRowError:
+    """A row that could not be parsed (yielded by iter_parse)."""
+    row_num: int
+    message: str
+    artist: str = ""
+    title: str = ""
+    file_path: str = ""
 
 
 class CSVParser:
@@ -35,13 +55,15 @@ class CSVParser:
         'file_path': ['file path', 'path', 'filepath']
     }
     
-    def __init__(self, require_id: bool = True):
+    def __init__(self, require_id: bool = True, stat_workers: int = STAT_WORKERS):
         """Initialize parser.
         
         Args:
             require_id: If True, require rekordbox_id column. If False, ID is optional.
+            stat_workers: Threads checking the file paths of a batch concurrently
         """
         self.require_id = require_id
+        self.stat_workers = max(1, stat_workers)
     
     def parse(self, csv_path: str) -> List[TrackMapping]:
         """Parse CSV and return validated track mappings.
@@ -56,13 +78,45 @@ class CSVParser:
             FileNotFoundError: If CSV file doesn't exist
             ValueError: If CSV format is invalid
         """
+        mappings = []
+        
+        for item in self.iter_parse(csv_path):
+            if isinstance(item, CSVRowError):
+                raise ValueError(f"Error parsing row {item.row_num}: {item.message}")
+            mappings.append(item)
+        
+        return mappings
+    
+    def iter_parse(
+        self,
+        csv_path: str,
+        stat_batch_size: int = STAT_BATCH_SIZE
+    ) -> Iterator[Union[TrackMapping, CSVRowError]]:
+        """Parse CSV lazily, one row at a time.
+        
+        Headers are validated before this returns. Rows are then read as the
+        iterator is consumed, with the file system lookups of every
+        stat_batch_size rows done together: concurrently on stat_workers
+        threads, resolving and listing each parent directory once. A bad row is yielded as a
+        CSVRowError instead of aborting the parse.
+        
+        Args:
+            csv_path: Path to CSV file
+            stat_batch_size: Rows whose file paths are resolved together
+            
+        Returns:
+            Iterator of TrackMapping or CSVRowError, in file order
+            
+        Raises:
+            FileNotFoundError: If CSV file doesn't exist
+            ValueError: If CSV headers are invalid
+        """
         csv_file = Path(csv_path)
         if not csv_file.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
         
-        mappings = []
-        
-        with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        f = open(csv_file, 'r', encoding='utf-8-sig', newline='')
+        try:
             reader = csv.DictReader(f)
             
             if not reader.fieldnames:
@@ -70,15 +124,106 @@ class CSVParser:
             
             # Validate and map headers
             column_map = self.validate_headers(list(reader.fieldnames))
+        except Exception:
+            f.close()
+            raise
+        
+        return self._iter_rows(f, reader, column_map, max(1, stat_batch_size))
+    
+    def _iter_rows(
+        self,
+        f: IO[str],
+        reader: csv.DictReader,
+        column_map: Dict[str, str],
+        stat_batch_size: int
+    ) -> Iterator[Union[TrackMapping, CSVRowError]]:
+        """Yield parsed rows, resolving file paths batch by batch."""
+        directories = DirectoryCache()
+        executor = None
+        if self.stat_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self.stat_workers)
+        
+        try:
+            with f:
+                batch: List[Union[TrackMapping, CSVRowError]] = []
+                for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
+                    try:
+                        batch.append(self._parse_row_fields(row, column_map, row_num))
+                    except Exception as e:
+                        batch.append(self._row_error(row, column_map, row_num, e))
+                    
+                    if len(batch) >= stat_batch_size:
+                        yield from self._resolve_batch(batch, directories, executor)
+                        batch = []
+                
+                yield from self._resolve_batch(batch, directories, executor)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _resolve_batch(
+        self,
+        batch: List[Union[TrackMapping, CSVRowError]],
+        directories: DirectoryCache,
+        executor: Optional[ThreadPoolExecutor] = None
+    ) -> List[Union[TrackMapping, CSVRowError]]:
+        """Fill in normalized path, existence and size for a batch of rows.
+        
+        Args:
+            batch: Parsed rows (errors are passed through)
+            directories: Directory listings shared by all batches
+            executor: Optional thread pool to check the paths concurrently
             
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
-                try:
-                    mapping = self._parse_row(row, column_map, row_num)
-                    mappings.append(mapping)
-                except Exception as e:
-                    raise ValueError(f"Error parsing row {row_num}: {e}")
+        Returns:
+            Rows in the same order; rows with an unusable path become errors
+        """
+        def resolve(item: Union[TrackMapping, CSVRowError]) -> Optional[Exception]:
+            if isinstance(item, CSVRowError):
+                return None
+            try:
+                self._resolve_path(item, directories)
+            except ValueError as e:
+                return e
+            return None
         
-        return mappings
+        if executor:
+            errors = list(executor.map(resolve, batch))
+        else:
+            errors = [resolve(item) for item in batch]
+        
+        resolved = []
+        for item, e in zip(batch, errors, strict=True):
+            if e is None:
+                resolved.append(item)
+            else:
+                resolved.append(CSVRowError(
+                    row_num=item.row_num,
+                    message=str(e),
+                    artist=item.artist,
+                    title=item.title,
+                    file_path=str(item.file_path)
+                ))
+        return resolved
+    
+    def _row_error(
+        self,
+        row: Dict[str, str],
+        column_map: Dict[str, str],
+        row_num: int,
+        error: Exception
+    ) -> CSVRowError:
+        """Build a CSVRowError keeping whatever raw values the row has."""
+        def raw(field_name: str) -> str:
+            column = column_map.get(field_name)
+            return (row.get(column) or '').strip() if column else ''
+        
+        return CSVRowError(
+            row_num=row_num,
+            message=str(error),
+            artist=raw('artist'),
+            title=raw('title'),
+            file_path=raw('file_path')
+        )
     
     def validate_headers(self, headers: List[str]) -> Dict[str, str]:
         """Map flexible headers to canonical field names.
@@ -136,13 +281,36 @@ class CSVParser:
         Returns:
             TrackMapping object
             
+        Raises:
+            ValueError: If row data is invalid
+        """
+        mapping = self._parse_row_fields(row, column_map, row_num)
+        self._resolve_path(mapping, DirectoryCache())
+        return mapping
+    
+    def _parse_row_fields(
+        self,
+        row: Dict[str, str],
+        column_map: Dict[str, str],
+        row_num: int
+    ) -> TrackMapping:
+        """Parse the columns of a CSV row without touching the file system.
+        
+        Args:
+            row: Dict of column values
+            column_map: Mapping of canonical to actual column names
+            row_num: Row number (for error messages)
+            
+        Returns:
+            TrackMapping object (path fields not filled in yet)
+            
         Raises:
             ValueError: If row data is invalid
         """
         # Extract required fields
-        artist = row.get(column_map['artist'], '').strip()
-        title = row.get(column_map['title'], '').strip()
-        file_path_str = row.get(column_map['file_path'], '').strip()
+        artist = (row.get(column_map['artist']) or '').strip()
+        title = (row.get(column_map['title']) or '').strip()
+        file_path_str = (row.get(column_map['file_path']) or '').strip()
         
         if not artist:
             raise ValueError(f"Artist is empty in row {row_num}")
@@ -154,7 +322,7 @@ class CSVParser:
         # Parse optional ID
         rekordbox_id = None
         if 'rekordbox_id' in column_map:
-            id_str = row.get(column_map['rekordbox_id'], '').strip()
+            id_str = (row.get(column_map['rekordbox_id']) or '').strip()
             if id_str:
                 try:
                     rekordbox_id = int(id_str)
@@ -164,21 +332,29 @@ class CSVParser:
                         f"(must be an integer)"
                     )
         
-        # Normalize and validate file path
-        try:
-            normalized_path = normalize_path(file_path_str)
-        except Exception as e:
-            raise ValueError(f"Invalid file path in row {row_num}: {e}")
-        
-        file_exists = normalized_path.exists()
-        file_size = normalized_path.stat().st_size if file_exists else 0
-        
         return TrackMapping(
             artist=artist,
             title=title,
             file_path=Path(file_path_str),  # Keep original for display
             rekordbox_id=rekordbox_id,
-            normalized_path=normalized_path,
-            file_exists=file_exists,
-            file_size=file_size
+            row_num=row_num
         )
+    
+    def _resolve_path(self, mapping: TrackMapping, directories: DirectoryCache) -> None:
+        """Normalize a mapping's file path and record whether it exists.
+        
+        Args:
+            mapping: Mapping from _parse_row_fields
+            directories: Directory listings shared between rows
+            
+        Raises:
+            ValueError: If the path cannot be normalized
+        """
+        try:
+            normalized_path, file_exists, file_size = stat_path(str(mapping.file_path), directories)
+        except Exception as e:
+            raise ValueError(f"Invalid file path in row {mapping.row_num}: {e}") from e
+        
+        mapping.normalized_path = normalized_path
+        mapping.file_exists = file_exists
+        mapping.file_size = file_size
@@ -1,10 +1,14 @@
 """Fuzzy matching utility for artist/title matching."""
-import re
 from dataclasses import dataclass
 from difflib import SequenceMatcher
-from typing import List, Optional
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Union
+from lib.text_utils import normalize_text
 from models.track import Track
 
+# Weights of the combined similarity score
+SEQUENCE_WEIGHT = 0.7
+WORD_WEIGHT = 0.3
+
 
 @dataclass
 class MatchCandidate:
@@ -16,6 +20,52 @@ class MatchCandidate:
     ambiguous: bool = False
 
 
+@dataclass(slots=True)
+class IndexedTrack:
+    """Database track with its match string cleaned once up front."""
+    track: Track
+    query: str  # clean_text("artist title")
+    words: FrozenSet[str]
+
+
+class TrackIndex:
+    """Inverted token index over database tracks.
+    
+    Maps every cleaned word to the positions of the tracks containing it,
+    so a lookup only scores tracks that share at least one word with the
+    query instead of the whole library.
+    """
+    
+    def __init__(self, entries: List[IndexedTrack]):
+        """Initialize index.
+        
+        Args:
+            entries: Pre-cleaned tracks, in database order
+        """
+        self.entries = entries
+        self.postings: Dict[str, List[int]] = {}
+        for position, entry in enumerate(entries):
+            for word in entry.words:
+                self.postings.setdefault(word, []).append(position)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def candidates(self, words: Iterable[str]) -> List[int]:
+        """Get positions of tracks sharing at least one word.
+        
+        Args:
+            words: Cleaned query words
+            
+        Returns:
+            Sorted track positions (database order)
+        """
+        positions = set()
+        for word in words:
+            positions.update(self.postings.get(word, ()))
+        return sorted(positions)
+
+
 class FuzzyMatcher:
     """Match tracks using artist+title similarity."""
     
@@ -43,20 +93,7 @@ class FuzzyMatcher:
         Returns:
             Cleaned lowercase text
         """
-        if not text:
-            return ""
-        
-        # Remove content in parentheses and brackets
-        text = re.sub(r'\([^)]*\)', '', text)
-        text = re.sub(r'\[[^\]]*\]', '', text)
-        
-        # Remove special characters
-        text = re.sub(r'[^\w\s]', '', text)
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text.lower()
+        return normalize_text(text).text
     
     def calculate_similarity(
         self,
@@ -80,8 +117,10 @@ class FuzzyMatcher:
             Similarity score (0.0-1.0)
         """
         # Combine artist + title for both
-        csv_query = self.clean_text(f"{csv_artist} {csv_title}")
-        db_query = self.clean_text(f"{db_artist} {db_title}")
+        csv_normalized = normalize_text(f"{csv_artist} {csv_title}")
+        db_normalized = normalize_text(f"{db_artist} {db_title}")
+        csv_query = csv_normalized.text
+        db_query = db_normalized.text
         
         if not csv_query or not db_query:
             return 0.0
@@ -90,8 +129,8 @@ class FuzzyMatcher:
         sequence_sim = SequenceMatcher(None, csv_query, db_query).ratio()
         
         # Word overlap similarity (30% weight)
-        csv_words = set(csv_query.split())
-        db_words = set(db_query.split())
+        csv_words = csv_normalized.words
+        db_words = db_normalized.words
         
         if csv_words and db_words:
             intersection = len(csv_words.intersection(db_words))
@@ -101,33 +140,69 @@ class FuzzyMatcher:
             word_sim = 0.0
         
         # Combined score
-        return (sequence_sim * 0.7) + (word_sim * 0.3)
+        return (sequence_sim * SEQUENCE_WEIGHT) + (word_sim * WORD_WEIGHT)
+    
+    def build_index(self, db_tracks: List[Track]) -> TrackIndex:
+        """Clean and index database tracks for repeated lookups.
+        
+        Args:
+            db_tracks: Tracks from database to search
+            
+        Returns:
+            TrackIndex to pass to find_best_match
+        """
+        entries = []
+        for track in db_tracks:
+            normalized = normalize_text(f"{track.artist or ''} {track.title or ''}")
+            entries.append(IndexedTrack(
+                track=track,
+                query=normalized.text,
+                words=normalized.words
+            ))
+        return TrackIndex(entries)
     
     def find_best_match(
         self,
         csv_artist: str,
         csv_title: str,
-        db_tracks: List[Track]
+        db_tracks: Union[List[Track], TrackIndex]
     ) -> Optional[MatchCandidate]:
         """Find best matching track from database.
         
+        Only tracks sharing a word with the query can reach a threshold
+        above SEQUENCE_WEIGHT (the word score would be 0), so those are the
+        only ones scored in that case. Remaining candidates are skipped when
+        a length-based upper bound of the score is below the threshold.
+        Results are identical to scoring every track.
+        
         Args:
             csv_artist: Artist from CSV
             csv_title: Title from CSV
-            db_tracks: List of tracks from database to search
+            db_tracks: Tracks from database to search, or a TrackIndex
+                built from them with build_index (faster for many lookups)
             
         Returns:
             MatchCandidate if found above threshold, None otherwise
         """
+        index = db_tracks if isinstance(db_tracks, TrackIndex) else self.build_index(db_tracks)
+        
+        csv_normalized = normalize_text(f"{csv_artist} {csv_title}")
+        csv_query = csv_normalized.text
+        csv_words = csv_normalized.words
+        
+        if self.threshold > SEQUENCE_WEIGHT:
+            positions = index.candidates(csv_words)
+        else:
+            positions = range(len(index))
+        
         candidates = []
         
-        for track in db_tracks:
-            similarity = self.calculate_similarity(
-                csv_artist, csv_title,
-                track.artist or '', track.title or ''
-            )
+        for position in positions:
+            entry = index.entries[position]
+            similarity = self._score(csv_query, csv_words, entry)
             
             if similarity >= self.threshold:
+                track = entry.track
                 candidates.append(MatchCandidate(
                     track_id=track.id,
                     artist=track.artist or '',
@@ -150,3 +225,41 @@ class FuzzyMatcher:
                 best.ambiguous = True
         
         return best
+    
+    def _score(
+        self,
+        csv_query: str,
+        csv_words: AbstractSet[str],
+        entry: IndexedTrack
+    ) -> float:
+        """Score a query against an indexed track.
+        
+        Same result as calculate_similarity, using the pre-cleaned entry.
+        Returns 0.0 early when the score provably cannot reach the threshold.
+        
+        Args:
+            csv_query: Cleaned query text
+            csv_words: Words of the cleaned query
+            entry: Indexed database track
+            
+        Returns:
+            Similarity score (0.0-1.0)
+        """
+        if not csv_query or not entry.query:
+            return 0.0
+        
+        if csv_words and entry.words:
+            intersection = len(csv_words.intersection(entry.words))
+            union = len(csv_words.union(entry.words))
+            word_sim = intersection / union if union > 0 else 0.0
+        else:
+            word_sim = 0.0
+        
+        # Upper bound of SequenceMatcher.ratio() from the lengths alone
+        length_total = len(csv_query) + len(entry.query)
+        max_sequence_sim = 2.0 * min(len(csv_query), len(entry.query)) / length_total
+        if (max_sequence_sim * SEQUENCE_WEIGHT) + (word_sim * WORD_WEIGHT) < self.threshold:
+            return 0.0
+        
+        sequence_sim = SequenceMatcher(None, csv_query, entry.query).ratio()
+        return (sequence_sim * SEQUENCE_WEIGHT) + (word_sim * WORD_WEIGHT)
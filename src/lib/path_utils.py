@@ -1,8 +1,12 @@
 """Path utility functions for file operations."""
+import os
 import re
+import threading
 import unicodedata
+from concurrent.futures import Future
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, FrozenSet, Optional, Tuple
 
 
 def normalize_path(path: str) -> Path:
@@ -26,6 +30,109 @@ def normalize_path(path: str) -> Path:
     return Path(normalized_str)
 
 
+def _name_key(name: str) -> str:
+    """Comparison key that matches names on case- and normalization-insensitive file systems."""
+    return unicodedata.normalize('NFC', name).casefold()
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Resolved directory path and the names it contains."""
+    resolved_path: Path
+    # _name_key of every entry, or None if the directory could not be listed
+    names: Optional[FrozenSet[str]]
+    # _name_key of entries that are symlinks
+    symlinks: FrozenSet[str]
+
+
+class DirectoryCache:
+    """Thread-safe cache of resolved, listed directories.
+    
+    Every directory is resolved and listed once, however many paths in it
+    are checked and however many threads ask for it at the same time.
+    """
+    
+    def __init__(self):
+        """Initialize directory cache."""
+        self._lock = threading.Lock()
+        self._listings: Dict[str, Future] = {}
+    
+    def get(self, directory: Path) -> DirectoryListing:
+        """Get the listing of a directory, listing it on first use.
+        
+        Args:
+            directory: Directory path (user home already expanded)
+            
+        Returns:
+            DirectoryListing for the directory
+        """
+        key = str(directory)
+        with self._lock:
+            future = self._listings.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._listings[key] = future
+        
+        if owner:
+            try:
+                future.set_result(self._list(directory))
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+    
+    @staticmethod
+    def _list(directory: Path) -> DirectoryListing:
+        resolved = directory.resolve()
+        names = set()
+        symlinks = set()
+        try:
+            with os.scandir(resolved) as it:
+                for entry in it:
+                    key = _name_key(entry.name)
+                    names.add(key)
+                    if entry.is_symlink():
+                        symlinks.add(key)
+        except OSError:
+            return DirectoryListing(resolved, None, frozenset())
+        return DirectoryListing(resolved, frozenset(names), frozenset(symlinks))
+
+
+def stat_path(path: str, directories: DirectoryCache) -> Tuple[Path, bool, int]:
+    """Normalize a path and look up whether it exists and its size.
+    
+    Same result as normalize_path followed by exists() and stat(), but the
+    parent directory is resolved and listed only once per DirectoryCache,
+    and files missing from that listing are not stat'ed at all.
+    
+    Args:
+        path: Input path string
+        directories: Shared cache of directory listings
+        
+    Returns:
+        (normalized path, exists, size in bytes or 0)
+    """
+    path_obj = Path(path).expanduser()
+    name = path_obj.name
+    
+    listing = None
+    if name not in ('', '.', '..'):
+        listing = directories.get(path_obj.parent)
+    
+    if listing is None or _name_key(name) in listing.symlinks:
+        # Symlinks (and odd names) need the full resolve
+        normalized = normalize_path(path)
+    else:
+        normalized = Path(unicodedata.normalize('NFC', str(listing.resolved_path / name)))
+        if listing.names is not None and _name_key(name) not in listing.names:
+            return normalized, False, 0
+    
+    try:
+        return normalized, True, os.stat(normalized).st_size
+    except OSError:
+        return normalized, False, 0
+
+
 def sanitize_filename(name: str) -> str:
     """Remove invalid filename characters.
     
@@ -0,0 +1,111 @@
+"""Text normalization shared by the track matchers.
+
+Artist/title strings and filenames are cleaned with precompiled patterns and
+memoized, so each distinct string is cleaned and split into words once per
+run no matter how many comparisons it takes part in.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet
+
+# Upper bound on memoized strings per cache (roughly a large library)
+NORMALIZE_CACHE_SIZE = 1 << 17
+
+_PARENTHESES = re.compile(r'\([^)]*\)')
+_BRACKETS = re.compile(r'\[[^\]]*\]')
+_TRAILING_TRACK_NUMBER = re.compile(r'[-_]\d+$')
+_SPECIAL_CHARS = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class NormalizedText:
+    """Cleaned text together with its words."""
+    text: str
+    words: FrozenSet[str]
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_text(text: str) -> NormalizedText:
+    """Clean artist/title text for matching.
+
+    - Remove parentheses and brackets content
+    - Remove special characters
+    - Normalize whitespace
+    - Lowercase
+
+    Args:
+        text: Text to clean
+
+    Returns:
+        NormalizedText with the cleaned text and its word set
+    """
+    if not text:
+        return NormalizedText("", frozenset())
+
+    text = _PARENTHESES.sub('', text)
+    text = _BRACKETS.sub('', text)
+    text = _SPECIAL_CHARS.sub('', text)
+    text = _WHITESPACE.sub(' ', text).strip().lower()
+
+    return NormalizedText(text, frozenset(text.split()))
+
+
+def clean_text(text: str) -> str:
+    """Clean artist/title text for matching.
+
+    Args:
+        text: Text to clean
+
+    Returns:
+        Cleaned lowercase text
+    """
+    return normalize_text(text).text
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_filename(filename: str) -> NormalizedText:
+    """Clean a filename (without directory) for matching.
+
+    Like normalize_text, but parentheses, brackets and trailing track
+    numbers become spaces, and a leftover file extension is dropped.
+
+    Args:
+        filename: Filename or file stem
+
+    Returns:
+        NormalizedText with the cleaned filename and its word set
+    """
+    # Note: file extension should already be removed by Path.stem,
+    # but handle it just in case
+    # Only remove if it looks like a file extension (3-4 chars after final dot)
+    if '.' in filename:
+        parts = filename.rsplit('.', 1)
+        if len(parts) == 2 and len(parts[1]) <= 4 and parts[1].isalpha():
+            filename = parts[0]
+
+    # Remove common patterns that interfere with matching
+    for pattern in (_PARENTHESES, _BRACKETS, _TRAILING_TRACK_NUMBER):
+        filename = pattern.sub(' ', filename)
+
+    # Normalize spaces
+    filename = _WHITESPACE.sub(' ', filename).strip()
+
+    # Remove special characters (keep spaces for word matching)
+    filename = _SPECIAL_CHARS.sub('', filename).lower()
+
+    return NormalizedText(filename, frozenset(filename.split()))
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def split_words(text: str) -> FrozenSet[str]:
+    """Split already-cleaned text into its set of words.
+
+    Args:
+        text: Cleaned text
+
+    Returns:
+        Set of words
+    """
+    return frozenset(text.split())
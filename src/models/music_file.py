@@ -1,5 +1,6 @@
 """Music file model for file matching."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import FrozenSet
 
 
 @dataclass
@@ -8,3 +9,4 @@ class MusicFile:
     file_path: str
     filename: str
     filename_clean: str  # Cleaned for matching
+    filename_words: FrozenSet[str] = field(default_factory=frozenset)  # Words of filename_clean
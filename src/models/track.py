@@ -1,14 +1,45 @@
 """Track model representing a music track in Rekordbox."""
+import re
 from dataclasses import dataclass, field
 from typing import Optional, List
 
 
-@dataclass
+# Substrings in FolderPath that identify streaming service tracks
+STREAMING_SERVICES = ('tidal', 'beatport', 'spotify', 'soundcloud',
+                      'beatsource', 'apple music', 'youtube')
+
+# One alternation over all services instead of a substring test per service
+_STREAMING_SERVICE_PATTERN = re.compile(
+    '|'.join(re.escape(service) for service in STREAMING_SERVICES),
+    re.IGNORECASE
+)
+
+
+def is_streaming_path(folder_path: Optional[str]) -> bool:
+    """Check if a FolderPath belongs to a streaming track.
+    
+    Streaming tracks are identified by:
+    - Empty FolderPath
+    - FolderPath containing streaming service names
+    
+    Args:
+        folder_path: FolderPath value from the database
+        
+    Returns:
+        True if the path marks a streaming track
+    """
+    if not folder_path or folder_path.strip() == "":
+        return True
+    return _STREAMING_SERVICE_PATTERN.search(folder_path) is not None
+
+
+@dataclass(slots=True)
 class Track:
     """Represents a music track in the Rekordbox library.
     
     In Rekordbox 6, tracks are stored in the DjmdContent table.
     Streaming tracks are identified by empty FolderPath field.
+    Slotted so that whole-library snapshots stay compact.
     """
     
     id: int
@@ -18,6 +49,8 @@ class Track:
     file_path: Optional[str] = None
     file_size: int = 0
     my_tag_ids: List[str] = field(default_factory=list)  # Store as strings to match database
+    # Classified once on creation; None means derive it from folder_path
+    is_streaming: Optional[bool] = None
     
     def __post_init__(self) -> None:
         """Validate track after initialization."""
@@ -29,28 +62,10 @@ class Track:
         # Ensure file_size is non-negative
         if self.file_size < 0:
             raise ValueError("File size cannot be negative")
-    
-    @property
-    def is_streaming(self) -> bool:
-        """Check if track is a streaming track.
-        
-        Streaming tracks are identified by:
-        - Empty FolderPath
-        - FolderPath containing streaming service names
-        """
-        if not self.folder_path or self.folder_path.strip() == "":
-            return True
-        
-        # Check for streaming services in path
-        streaming_services = ['tidal', 'beatport', 'spotify', 'soundcloud', 
-                             'beatsource', 'apple music', 'youtube']
-        folder_lower = self.folder_path.lower()
-        
-        for service in streaming_services:
-            if service in folder_lower:
-                return True
         
-        return False
+        # Store the streaming classification so reads are a field access
+        if self.is_streaming is None:
+            self.is_streaming = is_streaming_path(self.folder_path)
     
     @property
     def display_name(self) -> str:
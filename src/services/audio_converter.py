@@ -4,12 +4,43 @@ Audio conversion service using ffmpeg.
 Supports converting audio files to different formats while preserving metadata.
 """
 
+import os
 import subprocess
 import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, Iterable, Iterator, List, Tuple
 from dataclasses import dataclass
 
+from services.audio_probe import AudioInfo, AudioProbe
+from services.conversion_cache import ConversionCache, conversion_params
+
+
+# Audio codecs a source container (by extension) may hold that a target
+# format can take over unchanged
+CONTAINER_CODECS = {
+    "m4a": ("aac", "alac"),
+    "mp4": ("aac", "alac"),
+    "aac": ("aac",),
+    "mp3": ("mp3",),
+    "flac": ("flac",),
+}
+
+# PCM codecs by target container and bit depth. A PCM source moving to the
+# other PCM container is rewritten at its own bit depth (only the byte
+# order changes) instead of at the target format's default.
+PCM_CODECS = {
+    "wav": {16: "pcm_s16le", 24: "pcm_s24le"},
+    "aiff": {16: "pcm_s16be", 24: "pcm_s24be"},
+}
+PCM_SOURCES = ("wav", "aif", "aiff")
+PCM_DEPTHS = {codec: depth for codecs in PCM_CODECS.values() for depth, codec in codecs.items()}
+
+# ffmpeg encoders whose streams ffprobe reports under another codec name
+ENCODER_CODECS = {"libmp3lame": "mp3"}
+
 
 @dataclass
 class ConversionResult:
@@ -19,6 +50,20 @@ class ConversionResult:
     output_path: Optional[Path]
     error_message: Optional[str] = None
     original_path: Optional[Path] = None
+    cached: bool = False  # Output reused from an earlier conversion
+    seconds: float = 0.0  # Time spent converting (set by convert_many)
+
+
+@dataclass
+class ConversionJob:
+    """One conversion for AudioConverter.convert_many (same arguments as convert)."""
+
+    source_path: Path
+    target_format: str
+    output_dir: Optional[Path] = None
+    preserve_original: bool = True
+    overwrite: bool = False
+    context: Any = None  # Caller data handed back with the result
 
 
 class AudioConverter:
@@ -61,17 +106,31 @@ class AudioConverter:
         },
     }
 
-    def __init__(self, ffmpeg_path: Optional[str] = None):
+    def __init__(
+        self, ffmpeg_path: Optional[str] = None, cache_path: Optional[Path] = None
+    ):
         """
         Initialize the audio converter.
 
         Args:
             ffmpeg_path: Optional path to ffmpeg binary. If None, searches PATH.
+            cache_path: Optional conversion cache index. When set, converting
+                audio already converted with the same settings reuses the
+                earlier output (see ConversionCache), and probe results are
+                kept in the same file (see AudioProbe).
 
         Raises:
             RuntimeError: If ffmpeg is not found or not executable.
         """
         self.ffmpeg_path = self._find_ffmpeg(ffmpeg_path)
+        self.cache = ConversionCache(cache_path) if cache_path else None
+        self.cache_path = cache_path
+        self._probe: Optional[AudioProbe] = None
+        self._probe_guard = threading.Lock()
+
+        # Serializes conversions writing the same output file
+        self._output_locks: Dict[Path, threading.Lock] = {}
+        self._output_locks_guard = threading.Lock()
 
     def _find_ffmpeg(self, custom_path: Optional[str]) -> str:
         """Find ffmpeg binary."""
@@ -109,6 +168,14 @@ class AudioConverter:
         source_ext = source_path.suffix.lstrip(".").lower()
         target_format = target_format.lower()
 
+        # An .m4a/.mp4 file holds either AAC or ALAC; only the codec tells
+        if source_ext in ("m4a", "mp4"):
+            info = self.probe_info(source_path)
+            if info and info.codec in ("aac", "alac"):
+                if target_format == "m4a":
+                    target_format = "aac"
+                return info.codec != target_format
+
         # Normalize m4a/aac
         if source_ext in ("m4a", "aac"):
             source_ext = "aac"
@@ -174,6 +241,69 @@ class AudioConverter:
         output_ext = config["container"]
         output_path = output_dir / f"{source_path.stem}.{output_ext}"
 
+        params = conversion_params(target_format, config)
+
+        # Jobs running concurrently may target the same output file
+        with self._output_lock(output_path):
+            if self.cache and not overwrite:
+                cached_output = self.cache.lookup(source_path, params)
+                if cached_output and cached_output.parent.resolve() != output_dir.resolve():
+                    # Converted into another directory before; put a copy
+                    # where this conversion was asked to write
+                    cached_output = self._copy_cached_output(
+                        cached_output, output_path, source_path, params
+                    )
+                if cached_output:
+                    if not preserve_original:
+                        source_path.unlink()
+                    return ConversionResult(
+                        success=True,
+                        output_path=cached_output,
+                        original_path=source_path,
+                        cached=True,
+                    )
+
+            return self._convert_to(
+                source_path, output_path, config, preserve_original, overwrite, params
+            )
+
+    def _copy_cached_output(
+        self, cached_output: Path, output_path: Path, source_path: Path, params: str
+    ) -> Optional[Path]:
+        """
+        Copy a cached conversion to the requested output path.
+
+        Returns:
+            The copy, or None if it cannot be made (output_path exists, or
+            copying failed) and the conversion has to run normally
+        """
+        if output_path.exists():
+            return None
+        partial = output_path.with_name(output_path.name + ".partial")
+        try:
+            shutil.copy2(cached_output, partial)
+            os.replace(partial, output_path)
+        except OSError:
+            partial.unlink(missing_ok=True)
+            return None
+        self.cache.store(source_path, params, output_path)
+        return output_path
+
+    def _output_lock(self, output_path: Path) -> threading.Lock:
+        """Get the lock guarding one output file."""
+        with self._output_locks_guard:
+            return self._output_locks.setdefault(output_path, threading.Lock())
+
+    def _convert_to(
+        self,
+        source_path: Path,
+        output_path: Path,
+        config: Dict[str, str],
+        preserve_original: bool,
+        overwrite: bool,
+        params: str,
+    ) -> ConversionResult:
+        """Run ffmpeg for a validated conversion (see convert)."""
         # Check if output already exists
         if output_path.exists() and not overwrite:
             return ConversionResult(
@@ -184,7 +314,8 @@ class AudioConverter:
             )
 
         # Build ffmpeg command
-        cmd = self._build_ffmpeg_command(source_path, output_path, config)
+        codec = self._stream_codec(source_path, config)
+        cmd = self._build_ffmpeg_command(source_path, output_path, config, codec)
 
         # Execute conversion
         try:
@@ -209,6 +340,9 @@ class AudioConverter:
                     original_path=source_path,
                 )
 
+            if self.cache:
+                self.cache.store(source_path, params, output_path)
+
             # Delete original if requested
             if not preserve_original:
                 source_path.unlink()
@@ -232,24 +366,133 @@ class AudioConverter:
                 original_path=source_path,
             )
 
+    def convert_many(
+        self, jobs: Iterable[ConversionJob], max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[ConversionJob, ConversionResult]]:
+        """
+        Run conversions concurrently, yielding results as they finish.
+
+        Each conversion is an ffmpeg subprocess, so a thread per running job
+        is enough to keep max_workers cores busy. Jobs are pulled from the
+        iterable lazily, at most two per worker ahead of the running ones,
+        so a generator can keep producing jobs while earlier ones convert.
+        Jobs writing the same output file run one after the other.
+
+        Args:
+            jobs: Conversions to run
+            max_workers: Concurrent ffmpeg processes (default: CPU count)
+
+        Yields:
+            (job, result) pairs in completion order
+        """
+        max_workers = max(1, max_workers or os.cpu_count() or 1)
+        max_pending = max_workers * 2
+        job_iter = iter(jobs)
+        pending: Dict[Future, ConversionJob] = {}
+
+        def run(job: ConversionJob) -> ConversionResult:
+            started = time.perf_counter()
+            result = self.convert(
+                source_path=job.source_path,
+                target_format=job.target_format,
+                output_dir=job.output_dir,
+                preserve_original=job.preserve_original,
+                overwrite=job.overwrite,
+            )
+            result.seconds = time.perf_counter() - started
+            return result
+
+        def submit_next() -> bool:
+            job = next(job_iter, None)
+            if job is None:
+                return False
+            future = executor.submit(run, job)
+            pending[future] = job
+            return True
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    exhausted = not submit_next()
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _stream_codec(self, source_path: Path, config: Dict[str, str]) -> Optional[str]:
+        """
+        Pick a codec that avoids a full re-encode, if the source allows one.
+
+        Returns:
+            "copy" to remux a source already holding the target codec, the
+            PCM codec at the source's bit depth for PCM to PCM, or None to
+            encode with the target format's codec
+        """
+        if self._can_stream_copy(source_path, config):
+            return "copy"
+        return self._pcm_codec(source_path, config)
+
+    def _pcm_codec(self, source_path: Path, config: Dict[str, str]) -> Optional[str]:
+        """Get the target PCM codec matching a PCM source's bit depth."""
+        codecs = PCM_CODECS.get(config["container"])
+        source_ext = source_path.suffix.lstrip(".").lower()
+        if codecs is None or source_ext not in PCM_SOURCES:
+            return None
+
+        info = self.probe_info(source_path)
+        if info is None:
+            return None
+        return codecs.get(PCM_DEPTHS.get(info.codec))
+
+    def _can_stream_copy(self, source_path: Path, config: Dict[str, str]) -> bool:
+        """
+        Check if the source audio stream already has the target codec.
+
+        Only sources whose container can hold the target codec are probed,
+        so conversions that must re-encode cost no ffprobe call.
+        """
+        codec = ENCODER_CODECS.get(config["codec"], config["codec"])
+        source_ext = source_path.suffix.lstrip(".").lower()
+        if codec not in CONTAINER_CODECS.get(source_ext, ()):
+            return False
+
+        info = self.probe_info(source_path)
+        return info is not None and info.codec == codec
+
     def _build_ffmpeg_command(
-        self, source_path: Path, output_path: Path, config: Dict[str, str]
+        self,
+        source_path: Path,
+        output_path: Path,
+        config: Dict[str, str],
+        codec: Optional[str] = None,
     ) -> List[str]:
-        """Build ffmpeg command with proper arguments."""
+        """
+        Build ffmpeg command with proper arguments.
+
+        A codec from _stream_codec replaces the target format's encoder:
+        "copy" remuxes the audio stream into the target container as is,
+        a PCM codec rewrites PCM samples without changing their bit depth.
+        """
         cmd = [
             self.ffmpeg_path,
             "-i",
             str(source_path),
             "-y",  # Overwrite output
             "-codec:a",
-            config["codec"],
+            codec or config["codec"],
         ]
 
-        # Add format-specific options
-        if "bitrate" in config:
+        # Add format-specific options (encoder settings, unused when copying)
+        if "bitrate" in config and not codec:
             cmd.extend(["-b:a", config["bitrate"]])
 
-        if "compression" in config:
+        if "compression" in config and not codec:
             cmd.extend(["-compression_level", config["compression"]])
 
         # Copy metadata
@@ -269,6 +512,29 @@ class AudioConverter:
         """
         return {fmt: cfg["description"] for fmt, cfg in self.FORMAT_CONFIGS.items()}
 
+    @property
+    def probe(self) -> AudioProbe:
+        """Get the metadata probe, locating ffprobe on first use."""
+        with self._probe_guard:
+            if self._probe is None:
+                self._probe = AudioProbe(cache_path=self.cache_path)
+            return self._probe
+
+    def probe_info(self, file_path: Path) -> Optional[AudioInfo]:
+        """
+        Probe codec, sample rate, bit depth, channels and duration.
+
+        Results are memoized per (path, mtime, size), so each file is
+        probed once while it stays unchanged.
+
+        Args:
+            file_path: Path to audio file
+
+        Returns:
+            AudioInfo or None if probing fails or ffprobe is not available
+        """
+        return self.probe.probe(file_path)
+
     def probe_format(self, file_path: Path) -> Optional[str]:
         """
         Probe audio file to detect actual format/codec.
@@ -279,41 +545,20 @@ class AudioConverter:
         Returns:
             Format string or None if detection fails
         """
-        try:
-            # Use ffprobe if available
-            ffprobe = shutil.which("ffprobe")
-            if not ffprobe:
-                # Fallback to extension
-                return file_path.suffix.lstrip(".").lower()
-
-            cmd = [
-                ffprobe,
-                "-v",
-                "error",
-                "-select_streams",
-                "a:0",
-                "-show_entries",
-                "stream=codec_name",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(file_path),
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-
-            if result.returncode == 0:
-                codec = result.stdout.strip()
-                # Map codecs to our format names
-                codec_map = {
-                    "pcm_s16le": "wav",
-                    "flac": "flac",
-                    "mp3": "mp3",
-                    "aac": "aac",
-                    "alac": "alac",
-                }
-                return codec_map.get(codec, codec)
-
+        info = self.probe_info(file_path)
+        if info is None:
+            # Fallback to extension
             return file_path.suffix.lstrip(".").lower()
 
-        except Exception:
-            return file_path.suffix.lstrip(".").lower()
+        # Map codecs to our format names
+        codec_map = {
+            "pcm_s16le": "wav",
+            "pcm_s24le": "wav",
+            "pcm_s16be": "aiff",
+            "pcm_s24be": "aiff",
+            "flac": "flac",
+            "mp3": "mp3",
+            "aac": "aac",
+            "alac": "alac",
+        }
+        return codec_map.get(info.codec, info.codec)
@@ -0,0 +1,261 @@
+"""
+Audio metadata probing with ffprobe.
+
+One JSON ffprobe call per file returns codec, sample rate, bit depth,
+channels and duration. Results are memoized per (path, mtime, size), in
+memory and optionally in a SQLite cache, so a file is probed once for as
+long as it stays unchanged.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS probes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    info TEXT
+);
+"""
+
+# (resolved path, mtime_ns, size)
+ProbeKey = Tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    """Properties of a file's first audio stream."""
+
+    codec: str
+    sample_rate: Optional[int] = None
+    bit_depth: Optional[int] = None
+    channels: Optional[int] = None
+    duration: Optional[float] = None
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number or None
+
+
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_ffprobe_json(output: str) -> Optional[AudioInfo]:
+    """
+    Build AudioInfo from ffprobe's JSON output.
+
+    Args:
+        output: stdout of ffprobe -of json
+
+    Returns:
+        AudioInfo, or None if there is no audio stream
+    """
+    try:
+        data = json.loads(output or "{}")
+    except (TypeError, ValueError):
+        return None
+
+    streams = data.get("streams") or []
+    if not streams or not streams[0].get("codec_name"):
+        return None
+
+    stream = streams[0]
+    # Lossless codecs report bits_per_raw_sample, PCM reports bits_per_sample
+    bit_depth = _int_or_none(stream.get("bits_per_raw_sample")) or _int_or_none(
+        stream.get("bits_per_sample")
+    )
+    duration = _float_or_none(stream.get("duration")) or _float_or_none(
+        (data.get("format") or {}).get("duration")
+    )
+
+    return AudioInfo(
+        codec=stream["codec_name"],
+        sample_rate=_int_or_none(stream.get("sample_rate")),
+        bit_depth=bit_depth,
+        channels=_int_or_none(stream.get("channels")),
+        duration=duration,
+    )
+
+
+class AudioProbe:
+    """Memoizing ffprobe wrapper."""
+
+    def __init__(
+        self, ffprobe_path: Optional[str] = None, cache_path: Optional[Path] = None
+    ):
+        """
+        Initialize the probe.
+
+        Args:
+            ffprobe_path: Optional path to ffprobe. If None, searches PATH once.
+            cache_path: Optional SQLite file keeping results between runs
+        """
+        self.ffprobe_path = ffprobe_path or shutil.which("ffprobe")
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._memo: Dict[ProbeKey, Optional[AudioInfo]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def available(self) -> bool:
+        """Whether ffprobe was found."""
+        return bool(self.ffprobe_path)
+
+    def probe(self, file_path: Path) -> Optional[AudioInfo]:
+        """
+        Get the audio properties of a file.
+
+        Args:
+            file_path: Audio file
+
+        Returns:
+            AudioInfo, or None if the file is missing, ffprobe is not
+            available or the file has no readable audio stream
+        """
+        if not self.available:
+            return None
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = (str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+            found, info = self._load(key)
+        if found:
+            with self._lock:
+                self._memo[key] = info
+            return info
+
+        info, conclusive = self._run_ffprobe(file_path)
+
+        with self._lock:
+            self._memo[key] = info
+            # Failures that may not happen again (timeouts, I/O errors) are
+            # only remembered for this run
+            if conclusive:
+                self._save(key, info)
+        return info
+
+    def probe_many(
+        self, file_paths: Iterable[Path], max_workers: Optional[int] = None
+    ) -> Dict[Path, Optional[AudioInfo]]:
+        """
+        Probe several files concurrently (ffprobe takes one input per run).
+
+        Args:
+            file_paths: Audio files
+            max_workers: Concurrent ffprobe processes (default: CPU count)
+
+        Returns:
+            Dict mapping each path to its AudioInfo (or None)
+        """
+        paths = list(dict.fromkeys(file_paths))
+        max_workers = max(1, max_workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(paths, executor.map(self.probe, paths), strict=True))
+
+    def _run_ffprobe(self, file_path: Path) -> Tuple[Optional[AudioInfo], bool]:
+        """
+        Run ffprobe on a file.
+
+        Returns:
+            (AudioInfo or None, whether the result is worth storing: False
+            if ffprobe failed to run, timed out or exited with an error)
+        """
+        cmd = [
+            self.ffprobe_path,
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=codec_name,sample_rate,channels,bits_per_sample,"
+            "bits_per_raw_sample,duration:format=duration",
+            "-of",
+            "json",
+            str(file_path),
+        ]
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, check=False, timeout=60
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None, False
+
+        if result.returncode != 0:
+            return None, False
+        return parse_ffprobe_json(result.stdout), True
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the persistent cache (caller holds the lock)."""
+        if self.cache_path is None:
+            return None
+        if self._conn is None:
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+                self._conn.executescript(SCHEMA_SQL)
+            except (OSError, sqlite3.Error):
+                self.cache_path = None
+                return None
+        return self._conn
+
+    def _load(self, key: ProbeKey) -> Tuple[bool, Optional[AudioInfo]]:
+        """Look up a stored result (caller holds the lock)."""
+        conn = self._connection()
+        if conn is None:
+            return False, None
+        path, mtime_ns, size = key
+        try:
+            row = conn.execute(
+                "SELECT info FROM probes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, mtime_ns, size),
+            ).fetchone()
+        except sqlite3.Error:
+            return False, None
+        if row is None:
+            return False, None
+        return True, AudioInfo(**json.loads(row[0])) if row[0] else None
+
+    def _save(self, key: ProbeKey, info: Optional[AudioInfo]) -> None:
+        """Store a result (caller holds the lock)."""
+        conn = self._connection()
+        if conn is None:
+            return
+        path, mtime_ns, size = key
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO probes (path, size, mtime_ns, info) VALUES (?, ?, ?, ?)",
+                (path, size, mtime_ns, json.dumps(asdict(info)) if info else None),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Close the persistent cache."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
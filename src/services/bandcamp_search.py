@@ -0,0 +1,390 @@
+"""Bandcamp search over plain HTTP.
+
+Resolves tracks to Bandcamp track URLs by fetching the search results page
+and parsing it with html.parser, without a browser. Searches run
+concurrently on an asyncio event loop (each HTTP request in a worker
+thread), bounded by a semaphore and spaced by a rate limiter so bandcamp.com
+sees a steady, polite request rate.
+"""
+
+import asyncio
+import re
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+from lib.text_utils import normalize_text
+
+SEARCH_URL = "https://bandcamp.com/search"
+
+# Browsers' user agent; bandcamp.com rejects urllib's default one
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# HTTP statuses worth retrying after a pause
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Results need at least this title similarity to be considered
+MIN_TITLE_SIMILARITY = 0.3
+
+_ALBUM_SUMMARY = re.compile(r"\d+\s+tracks?,\s*\d+\s+minutes?")
+
+
+@dataclass
+class BandcampSearchResult:
+    """Represents a search result from Bandcamp."""
+    artist: str
+    title: str
+    url: str
+    confidence: float = 0.0
+
+
+@dataclass
+class SearchOutcome:
+    """Search results and best match for one track."""
+    track_id: str
+    artist: str
+    title: str
+    results: List[BandcampSearchResult] = field(default_factory=list)
+    total_results: int = 0  # Results on the page, including non-tracks
+    best_match: Optional[BandcampSearchResult] = None
+    error: Optional[str] = None
+
+
+def text_similarity(text1: str, text2: str) -> float:
+    """Calculate similarity between two text strings.
+
+    Uses same approach as file_path_matcher:
+    70% sequential similarity + 30% word overlap similarity.
+
+    Args:
+        text1: First text to compare
+        text2: Second text to compare
+
+    Returns:
+        Similarity score (0.0-1.0)
+    """
+    normalized1 = normalize_text(text1)
+    normalized2 = normalize_text(text2)
+    clean1 = normalized1.text
+    clean2 = normalized2.text
+
+    if not clean1 or not clean2:
+        return 0.0
+
+    # Sequential similarity (70% weight)
+    sequence_sim = SequenceMatcher(None, clean1, clean2).ratio()
+
+    # Word overlap similarity (30% weight)
+    words1 = normalized1.words
+    words2 = normalized2.words
+
+    if words1 and words2:
+        intersection = len(words1.intersection(words2))
+        union = len(words1.union(words2))
+        word_sim = intersection / union if union > 0 else 0.0
+    else:
+        word_sim = 0.0
+
+    return (sequence_sim * 0.7) + (word_sim * 0.3)
+
+
+def track_similarity(
+    target_artist: str, target_title: str, result_artist: str, result_title: str
+) -> float:
+    """Calculate overall similarity between target track and search result.
+
+    Requires minimum title similarity (like file_path_matcher) and
+    weights artist/title matching separately.
+
+    Args:
+        target_artist: Artist we're looking for
+        target_title: Title we're looking for
+        result_artist: Artist from search result
+        result_title: Title from search result
+
+    Returns:
+        Similarity score (0.0-1.0)
+    """
+    title_sim = text_similarity(target_title, result_title)
+    if title_sim < MIN_TITLE_SIMILARITY:
+        return 0.0
+
+    artist_sim = text_similarity(target_artist, result_artist)
+
+    # Combined score: 60% title + 40% artist (title is more distinctive)
+    return (title_sim * 0.6) + (artist_sim * 0.4)
+
+
+def _collapse(text: str) -> str:
+    return " ".join(text.split())
+
+
+class _SearchResultsParser(HTMLParser):
+    """Collects the fields of each li.searchresult on a search page."""
+
+    FIELDS = ("itemtype", "heading", "subhead")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items: List[Dict[str, str]] = []
+        self._item: Optional[Dict[str, str]] = None
+        self._div_depth = 0
+        self._field: Optional[str] = None
+        self._field_depth = 0
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        classes = (attributes.get("class") or "").split()
+
+        if tag == "li" and "searchresult" in classes:
+            self._item = {"data-search": attributes.get("data-search") or ""}
+            self.items.append(self._item)
+            self._div_depth = 0
+            return
+        if self._item is None:
+            return
+
+        if tag == "a" and attributes.get("href"):
+            if "artcont" in classes:
+                self._item["url"] = attributes["href"]
+            elif self._field == "heading":
+                self._item.setdefault("heading_url", attributes["href"])
+        elif tag == "div":
+            self._div_depth += 1
+            if self._field is None:
+                for name in self.FIELDS:
+                    if name in classes:
+                        self._field = name
+                        self._field_depth = self._div_depth
+                        self._text = []
+                        break
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._item is None:
+            return
+        if tag == "li":
+            self._item = None
+            self._field = None
+        elif tag == "div":
+            if self._field is not None and self._div_depth == self._field_depth:
+                self._item[self._field] = _collapse(" ".join(self._text))
+                self._field = None
+            self._div_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._item is None:
+            return
+        if self._field is not None:
+            self._text.append(data)
+        self._item["text"] = self._item.get("text", "") + data
+
+
+def _is_track(item: Dict[str, str], url: str) -> bool:
+    """Decide whether a search result is a track (not an album or artist)."""
+    item_type = item.get("itemtype", "").upper()
+    if item_type == "ALBUM":
+        return False
+    if item_type == "TRACK":
+        return True
+
+    if "/track/" in url:
+        return True
+    if "/album/" in url:
+        return False
+
+    if _ALBUM_SUMMARY.search(item.get("text", "").lower()):
+        return False
+
+    # If we can't determine, err on the side of including it
+    return True
+
+
+def _strip_query(url: str) -> str:
+    """Drop the ?from=search tracking parameters from a result URL."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def parse_search_results(html: str) -> Tuple[List[BandcampSearchResult], int]:
+    """Extract track-only search results from a Bandcamp search page.
+
+    Args:
+        html: Search results page
+
+    Returns:
+        (track results in page order, number of results on the page)
+    """
+    parser = _SearchResultsParser()
+    parser.feed(html)
+    parser.close()
+
+    results = []
+    for item in parser.items:
+        url = item.get("url") or item.get("heading_url") or ""
+        if not url or not _is_track(item, url):
+            continue
+
+        title = item.get("heading", "")
+        artist = item.get("subhead", "")
+        # Track subheads read "from <album> by <artist>" or "by <artist>"
+        if artist.lower().startswith("by "):
+            artist = artist[3:].strip()
+        elif " by " in artist:
+            artist = artist.rsplit(" by ", 1)[1].strip()
+
+        # Fallback: "Artist - Title" headings
+        if not artist and " - " in title:
+            artist, title = (part.strip() for part in title.split(" - ", 1))
+
+        if title:
+            results.append(BandcampSearchResult(artist=artist, title=title, url=_strip_query(url)))
+
+    return results, len(parser.items)
+
+
+class _RateLimiter:
+    """Spaces request starts at least 1 / rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+                now = self._next_start
+            self._next_start = now + self.interval
+
+
+class BandcampSearcher:
+    """Resolves tracks to Bandcamp search results over HTTP."""
+
+    def __init__(
+        self,
+        search_url: str = SEARCH_URL,
+        concurrency: int = 4,
+        requests_per_second: float = 2.0,
+        match_threshold: float = 0.6,
+        timeout: float = 15.0,
+        max_retries: int = 2,
+    ):
+        """Initialize the searcher.
+
+        Args:
+            search_url: Search endpoint (a local server in tests)
+            concurrency: Maximum searches in flight at once
+            requests_per_second: Maximum request rate (0 disables the limit)
+            match_threshold: Minimum similarity for a best match
+            timeout: Seconds before a request is abandoned
+            max_retries: Retries after throttling or server errors
+        """
+        self.search_url = search_url
+        self.concurrency = max(1, concurrency)
+        self.requests_per_second = requests_per_second
+        self.match_threshold = match_threshold
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    def build_search_url(self, artist: str, title: str) -> str:
+        """Get the tracks-only search URL for a track."""
+        return f"{self.search_url}?{urlencode({'q': f'{artist} {title}', 'item_type': 't'})}"
+
+    def _fetch(self, url: str) -> Tuple[int, str, Optional[str]]:
+        """GET a page (blocking). Returns (status, body, Retry-After)."""
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                charset = response.headers.get_content_charset() or "utf-8"
+                return response.status, response.read().decode(charset, errors="replace"), None
+        except urllib.error.HTTPError as e:
+            return e.code, "", e.headers.get("Retry-After") if e.headers else None
+
+    async def _get(self, url: str, limiter: _RateLimiter) -> str:
+        """GET a page, retrying throttled and failed requests with backoff."""
+        for attempt in range(self.max_retries + 1):
+            await limiter.wait()
+            status, body, retry_after = await asyncio.to_thread(self._fetch, url)
+            if status == 200:
+                return body
+            if status not in RETRY_STATUSES or attempt == self.max_retries:
+                raise RuntimeError(f"HTTP {status} for {url}")
+
+            try:
+                delay = float(retry_after) if retry_after else 2.0 ** attempt
+            except ValueError:
+                delay = 2.0 ** attempt
+            await asyncio.sleep(min(delay, 30.0))
+        raise RuntimeError(f"Giving up on {url}")
+
+    def _outcome(
+        self, track_id: str, artist: str, title: str, html: str
+    ) -> SearchOutcome:
+        """Score parsed results against the track and pick the best match."""
+        results, total = parse_search_results(html)
+        outcome = SearchOutcome(
+            track_id=track_id, artist=artist, title=title, results=results, total_results=total
+        )
+
+        best_similarity = 0.0
+        for result in results:
+            result.confidence = track_similarity(artist, title, result.artist, result.title)
+            if result.confidence > best_similarity and result.confidence >= self.match_threshold:
+                best_similarity = result.confidence
+                outcome.best_match = result
+        return outcome
+
+    async def _resolve(
+        self, track: Dict[str, str], semaphore: asyncio.Semaphore, limiter: _RateLimiter
+    ) -> SearchOutcome:
+        artist, title = track["artist"], track["title"]
+        async with semaphore:
+            try:
+                html = await self._get(self.build_search_url(artist, title), limiter)
+            except (OSError, RuntimeError) as e:
+                return SearchOutcome(track_id=track["id"], artist=artist, title=title, error=str(e))
+        return self._outcome(track["id"], artist, title, html)
+
+    async def resolve_all(
+        self,
+        tracks: Iterable[Dict[str, str]],
+        on_result: Optional[Callable[[SearchOutcome], None]] = None,
+    ) -> List[SearchOutcome]:
+        """Search for tracks concurrently.
+
+        Args:
+            tracks: Dicts with id, artist and title keys
+            on_result: Called with each outcome as soon as it is ready
+
+        Returns:
+            Outcomes in the order of tracks
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = _RateLimiter(self.requests_per_second)
+
+        async def resolve_one(track: Dict[str, str]) -> SearchOutcome:
+            outcome = await self._resolve(track, semaphore, limiter)
+            if on_result:
+                on_result(outcome)
+            return outcome
+
+        return list(await asyncio.gather(*(resolve_one(track) for track in tracks)))
+
+    def resolve_many(
+        self,
+        tracks: Iterable[Dict[str, str]],
+        on_result: Optional[Callable[[SearchOutcome], None]] = None,
+    ) -> List[SearchOutcome]:
+        """Blocking wrapper around resolve_all."""
+        return asyncio.run(self.resolve_all(tracks, on_result))
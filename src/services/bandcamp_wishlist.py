@@ -1,17 +1,15 @@
 """Bandcamp Wishlist Automator Service.
 
-Automatically adds tracks from a CSV to your Bandcamp wishlist.
+Automatically adds tracks from a CSV to your Bandcamp wishlist. Tracks are
+resolved to Bandcamp URLs over plain HTTP (see bandcamp_search); the browser
+is only used to log in and click the wishlist button.
 """
 
 import csv
 import os
-import re
 import time
-from dataclasses import dataclass
 from datetime import datetime
-from difflib import SequenceMatcher
-from typing import List, Optional
-from urllib.parse import quote_plus
+from typing import Optional
 
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
@@ -21,13 +19,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
-@dataclass
-class BandcampSearchResult:
-    """Represents a search result from Bandcamp."""
-    artist: str
-    title: str
-    url: str
-    confidence: float = 0.0
+from services.bandcamp_search import BandcampSearcher, BandcampSearchResult, SearchOutcome
 
 
 LOGIN_URL = "https://bandcamp.com/login"
@@ -37,15 +29,23 @@ class BandcampWishlistAutomator:
     """Automates adding tracks to Bandcamp wishlist."""
 
     def __init__(
-        self, username: str, password: str, delay_between_tracks: float = 2.0, progress_csv: str = "bandcamp_wishlist_progress.csv"
+        self,
+        username: str,
+        password: str,
+        delay_between_tracks: float = 2.0,
+        progress_csv: str = "bandcamp_wishlist_progress.csv",
+        search_concurrency: int = 4,
+        search_rate: float = 2.0,
     ):
         """Initialize the automator.
 
         Args:
             username: Bandcamp username or email
             password: Bandcamp password
-            delay_between_tracks: Seconds to wait between track processing
+            delay_between_tracks: Seconds to wait between track pages opened in the browser
             progress_csv: Path to progress tracking CSV file
+            search_concurrency: Maximum Bandcamp searches in flight at once
+            search_rate: Maximum Bandcamp search requests per second
         """
         self.username = username
         self.password = password
@@ -56,6 +56,11 @@ class BandcampWishlistAutomator:
         self.processed_ids = set()
         # Matching threshold for search results
         self.match_threshold = 0.6
+        self.searcher = BandcampSearcher(
+            concurrency=search_concurrency,
+            requests_per_second=search_rate,
+            match_threshold=self.match_threshold,
+        )
 
     def is_owned(self) -> bool:
         """Return True if the visible page shows that the user owns the track."""
@@ -170,299 +175,6 @@ class BandcampWishlistAutomator:
         except:
             pass  # No cookie banner found, continue
     
-    def _clean_text(self, text: str) -> str:
-        """Clean text for matching (same logic as file_path_matcher).
-        
-        Args:
-            text: Text to clean
-            
-        Returns:
-            Cleaned lowercase text
-        """
-        if not text:
-            return ""
-        
-        # Remove content in parentheses and brackets
-        text = re.sub(r'\([^)]*\)', '', text)
-        text = re.sub(r'\[[^\]]*\]', '', text)
-        
-        # Remove special characters (keep spaces for word matching)
-        text = re.sub(r'[^\w\s]', '', text)
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text.lower()
-    
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two text strings.
-        
-        Uses same approach as file_path_matcher:
-        70% sequential similarity + 30% word overlap similarity.
-        
-        Args:
-            text1: First text to compare
-            text2: Second text to compare
-            
-        Returns:
-            Similarity score (0.0-1.0)
-        """
-        clean1 = self._clean_text(text1)
-        clean2 = self._clean_text(text2)
-        
-        if not clean1 or not clean2:
-            return 0.0
-        
-        # Sequential similarity (70% weight)
-        sequence_sim = SequenceMatcher(None, clean1, clean2).ratio()
-        
-        # Word overlap similarity (30% weight)
-        words1 = set(clean1.split())
-        words2 = set(clean2.split())
-        
-        if words1 and words2:
-            intersection = len(words1.intersection(words2))
-            union = len(words1.union(words2))
-            word_sim = intersection / union if union > 0 else 0.0
-        else:
-            word_sim = 0.0
-        
-        # Combined score
-        return (sequence_sim * 0.7) + (word_sim * 0.3)
-    
-    def _calculate_track_similarity(
-        self, 
-        target_artist: str, 
-        target_title: str,
-        result_artist: str, 
-        result_title: str
-    ) -> float:
-        """Calculate overall similarity between target track and search result.
-        
-        Requires minimum title similarity (like file_path_matcher) and 
-        weights artist/title matching separately.
-        
-        Args:
-            target_artist: Artist we're looking for
-            target_title: Title we're looking for  
-            result_artist: Artist from search result
-            result_title: Title from search result
-            
-        Returns:
-            Similarity score (0.0-1.0)
-        """
-        # Title similarity (required minimum like file_path_matcher)
-        title_sim = self._calculate_text_similarity(target_title, result_title)
-        if title_sim < 0.3:  # Minimum title similarity threshold
-            return 0.0  # No match if title doesn't have partial similarity
-        
-        # Artist similarity
-        artist_sim = self._calculate_text_similarity(target_artist, result_artist)
-        
-        # Combined score: 60% title + 40% artist (title is more distinctive)
-        return (title_sim * 0.6) + (artist_sim * 0.4)
-    
-    def _extract_search_results(self) -> List[BandcampSearchResult]:
-        """Extract track-only search results from the current Bandcamp search page.
-        
-        Filters to only include individual tracks, excluding albums.
-        
-        Returns:
-            List of BandcampSearchResult objects (tracks only)
-        """
-        results = []
-        total_results = 0
-        filtered_results = 0
-        
-        try:
-            # Find all search result elements
-            search_results = self.driver.find_elements(By.CSS_SELECTOR, ".searchresult")
-            total_results = len(search_results)
-            
-            for i, result_elem in enumerate(search_results):
-                try:
-                    # Check if this is a track result (not album/artist)
-                    is_track = self._is_track_result(result_elem)
-                    
-                    if not is_track:
-                        filtered_results += 1
-                        continue
-                    
-                    # Get the track link
-                    track_link = result_elem.find_element(By.CSS_SELECTOR, "a.artcont")
-                    track_url = track_link.get_attribute("href")
-                    
-                    if not track_url:
-                        continue
-                    
-                    # Extract artist and title from the search result
-                    # Bandcamp typically shows: "Artist Name - Song Title"
-                    artist = ""
-                    title = ""
-                    
-                    try:
-                        # Try to get artist from dedicated element
-                        artist_elem = result_elem.find_element(By.CSS_SELECTOR, ".subhead")
-                        artist = artist_elem.text.strip()
-                        
-                        # Remove "by " prefix if present
-                        if artist.lower().startswith("by "):
-                            artist = artist[3:].strip()
-                    except NoSuchElementException:
-                        pass
-                    
-                    try:
-                        # Try to get title from main heading
-                        title_elem = result_elem.find_element(By.CSS_SELECTOR, ".heading")
-                        title = title_elem.text.strip()
-                    except NoSuchElementException:
-                        pass
-                    
-                    # Fallback: parse from combined text if we didn't get both
-                    if not artist or not title:
-                        try:
-                            # Get combined text and try to split
-                            combined_text = result_elem.find_element(By.CSS_SELECTOR, ".heading").text.strip()
-                            if " - " in combined_text:
-                                parts = combined_text.split(" - ", 1)
-                                if len(parts) == 2:
-                                    if not artist:
-                                        artist = parts[0].strip()
-                                    if not title:
-                                        title = parts[1].strip()
-                            elif not title:
-                                title = combined_text
-                        except NoSuchElementException:
-                            pass
-                    
-                    # Only add if we have at least a title
-                    if title:
-                        results.append(BandcampSearchResult(
-                            artist=artist,
-                            title=title,
-                            url=track_url
-                        ))
-                        
-                except Exception as e:
-                    # Skip problematic results
-                    continue
-            
-            # Debug info about filtering
-            if filtered_results > 0:
-                print(f"  • Filtered out {filtered_results} non-track results ({len(results)} tracks remaining)")
-                    
-        except Exception as e:
-            print(f"  ⚠ Error extracting search results: {e}")
-            
-        return results
-    
-    def _is_track_result(self, result_elem) -> bool:
-        """Determine if a search result represents a track (not album/artist).
-        
-        Based on actual Bandcamp HTML structure observed via browser inspection.
-        
-        Args:
-            result_elem: Selenium WebElement for the search result
-            
-        Returns:
-            True if this appears to be a track result
-        """
-        try:
-            # Method 1: Look for explicit TRACK/ALBUM label elements (most reliable)
-            # Bandcamp has separate StaticText elements with "TRACK" or "ALBUM" labels
-            try:
-                # Look for child elements containing exactly "TRACK" or "ALBUM"
-                label_elements = result_elem.find_elements(By.XPATH, ".//*[text()='TRACK' or text()='ALBUM']")
-                
-                for elem in label_elements:
-                    label_text = elem.text.strip().upper()
-                    if label_text == "ALBUM":
-                        return False
-                    elif label_text == "TRACK":
-                        return True
-                        
-            except Exception:
-                pass
-            
-            # Method 2: Check the full text for TRACK/ALBUM patterns
-            try:
-                result_text = result_elem.text.strip()
-                lines = result_text.split('\n')
-                
-                for line in lines:
-                    line = line.strip().upper()
-                    if line == "ALBUM":
-                        return False
-                    elif line == "TRACK":
-                        return True
-                        
-                # Also check if text starts with these labels
-                result_upper = result_text.upper()
-                if result_upper.startswith("ALBUM"):
-                    return False
-                elif result_upper.startswith("TRACK"):
-                    return True
-                        
-            except Exception:
-                pass
-            
-            # Method 3: Look for URL patterns
-            try:
-                # Find any link in the result and check its URL
-                links = result_elem.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    track_url = link.get_attribute("href")
-                    if track_url:
-                        # Track URLs typically contain "/track/" while album URLs contain "/album/"
-                        if "/track/" in track_url:
-                            return True
-                        elif "/album/" in track_url:
-                            return False
-                            
-            except Exception:
-                pass
-            
-            # Method 4: Check for album-specific text indicators (exclude these)
-            try:
-                result_text = result_elem.text.lower()
-                
-                # Look for patterns like "X tracks, Y minutes" which indicate albums
-                import re
-                if re.search(r'\d+\s+tracks?,\s*\d+\s+minutes?', result_text):
-                    return False
-                    
-                # Common album indicators
-                album_indicators = [
-                    "full album",
-                    "lp",
-                    "ep", 
-                    "compilation",
-                    "discography"
-                ]
-                
-                for indicator in album_indicators:
-                    if indicator in result_text:
-                        return False
-                        
-            except Exception:
-                pass
-            
-            # Method 5: Check data attributes as fallback
-            try:
-                data_search = result_elem.get_attribute("data-search")
-                if data_search:
-                    # Track results might have "t" in data-search attribute
-                    return "t" in data_search.lower()
-            except Exception:
-                pass
-            
-            # Default: assume it's a track (be inclusive)
-            return True
-            
-        except Exception:
-            # If we can't determine, err on the side of including it
-            return True
-
     def login(self) -> bool:
         """Login to Bandcamp."""
         print(f"Logging in as {self.username}...")
@@ -558,8 +270,17 @@ class BandcampWishlistAutomator:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             writer.writerow([track_id, artist, title, status, url, notes, timestamp])
 
-    def search_and_wishlist_track(self, track_id: str, artist: str, title: str):
-        """Search for a track and add it to wishlist using intelligent matching."""
+    def search_and_wishlist_track(
+        self, track_id: str, artist: str, title: str, outcome: Optional[SearchOutcome] = None
+    ):
+        """Search for a track and add it to wishlist using intelligent matching.
+
+        Args:
+            track_id: Track ID from the CSV
+            artist: Track artist
+            title: Track title
+            outcome: Search outcome resolved ahead of time (searches now if None)
+        """
         # Skip if already processed
         if track_id in self.processed_ids:
             print(f"⊘ Skipping {artist} - {title} (already processed)")
@@ -567,133 +288,108 @@ class BandcampWishlistAutomator:
 
         print(f"→ Processing: {artist} - {title}")
 
-        # Construct search URL
-        query = f"{artist} {title}"
-        search_url = f"https://bandcamp.com/search?q={quote_plus(query)}"
+        if outcome is None:
+            outcome = self.searcher.resolve_many([{"id": track_id, "artist": artist, "title": title}])[0]
 
-        try:
-            # Navigate to search
-            self.driver.get(search_url)
-            time.sleep(1)
+        if outcome.error:
+            print(f"  ✗ Error: {outcome.error}")
+            self.save_progress(track_id, artist, title, "error", "", outcome.error)
+            return
 
-            # Dismiss cookie banner if it appears
-            self.dismiss_cookies()
+        search_results = outcome.results
+        if not search_results:
+            print("  ✗ No search results found")
+            self.save_progress(track_id, artist, title, "not_found", "", "No search results")
+            return
 
-            # Extract all search results
-            try:
-                # Wait for search results to load
-                self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".searchresult"))
-                )
-                time.sleep(0.5)  # Let results fully load
-                
-                # Get all search results
-                search_results = self._extract_search_results()
-                
-                if not search_results:
-                    print("  ✗ No search results found")
-                    self.save_progress(track_id, artist, title, "not_found", "", "No search results")
-                    return
-                
-                # Show filtering information
-                total_found = len(self.driver.find_elements(By.CSS_SELECTOR, ".searchresult"))
-                tracks_found = len(search_results)
-                if total_found > tracks_found:
-                    print(f"  • Found {tracks_found} track(s) from {total_found} total results")
-                else:
-                    print(f"  • Found {tracks_found} track(s)")
-                
-                # Calculate similarity scores and find best match
-                best_match = None
-                best_similarity = 0.0
-                
-                for result in search_results:
-                    similarity = self._calculate_track_similarity(
-                        artist, title,
-                        result.artist, result.title
-                    )
-                    result.confidence = similarity
-                    
-                    if similarity > best_similarity and similarity >= self.match_threshold:
-                        best_similarity = similarity
-                        best_match = result
-                
-                if not best_match:
-                    print(f"  ⊘ No good matches found (threshold: {self.match_threshold})")
-                    # Show some results for debugging
-                    for i, result in enumerate(search_results[:3]):
-                        print(f"    [{i+1}] {result.artist} - {result.title} (confidence: {result.confidence:.3f})")
-                    self.save_progress(track_id, artist, title, "no_match", "", f"No matches above threshold {self.match_threshold}")
-                    return
-                
-                # Show match info
-                print(f"  ✓ Best match: {best_match.artist} - {best_match.title} (confidence: {best_similarity:.3f})")
-                
-                # Navigate to the best match
-                self.driver.get(best_match.url)
-                time.sleep(1.5)
+        # Show filtering information
+        tracks_found = len(search_results)
+        if outcome.total_results > tracks_found:
+            print(f"  • Found {tracks_found} track(s) from {outcome.total_results} total results")
+        else:
+            print(f"  • Found {tracks_found} track(s)")
+
+        best_match = outcome.best_match
+        if not best_match:
+            print(f"  ⊘ No good matches found (threshold: {self.match_threshold})")
+            # Show some results for debugging
+            for i, result in enumerate(search_results[:3]):
+                print(f"    [{i+1}] {result.artist} - {result.title} (confidence: {result.confidence:.3f})")
+            self.save_progress(track_id, artist, title, "no_match", "", f"No matches above threshold {self.match_threshold}")
+            return
 
-                # Ensure the wishlist control is present if available (non-fatal)
-                try:
-                    self.wait.until(EC.presence_of_element_located((By.ID, "wishlist-msg")))
-                except TimeoutException:
-                    pass
+        print(f"  ✓ Best match: {best_match.artist} - {best_match.title} (confidence: {best_match.confidence:.3f})")
 
-                # 1) Check if owned (visible UI only)
-                if self.is_owned():
-                    print("  • Status: OWNED")
-                    self.save_progress(track_id, artist, title, "owned", best_match.url, 
-                                     f"Already purchased (confidence: {best_similarity:.3f})")
-                    self.processed_ids.add(track_id)
-                    return
+        try:
+            self._wishlist_match(track_id, artist, title, best_match)
+        except Exception as e:
+            print(f"  ✗ Error: {str(e)}")
+            self.save_progress(track_id, artist, title, "error", best_match.url, str(e))
 
-                # 2) Check if already in wishlist
-                if self.is_in_wishlist():
-                    print("  • Status: Already in wishlist")
-                    self.save_progress(track_id, artist, title, "already_wishlisted", best_match.url,
-                                     f"Already in wishlist (confidence: {best_similarity:.3f})")
-                    self.processed_ids.add(track_id)
-                    return
+        # Delay between track pages
+        time.sleep(self.delay_between_tracks)
 
-                # 3) Add to wishlist
-                try:
-                    wishlist_button = self.driver.find_element(By.ID, "wishlist-msg")
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", wishlist_button)
-                    time.sleep(0.3)
-                    self.driver.execute_script("arguments[0].click();", wishlist_button)
-                    time.sleep(1)
+    def _wishlist_match(self, track_id: str, artist: str, title: str, best_match: BandcampSearchResult):
+        """Open the matched track page in the browser and add it to the wishlist."""
+        best_similarity = best_match.confidence
 
-                    # Verify it was added by waiting for 'In Wishlist' to appear in the share panel
-                    try:
-                        self.wait.until(
-                            EC.visibility_of_element_located(
-                                (By.XPATH, "//div[contains(@class,'share-panel-wrapper-desktop')]//*[normalize-space(text())='In Wishlist']")
-                            )
-                        )
-                        print("  • Status: Added to wishlist")
-                        self.save_progress(track_id, artist, title, "added", best_match.url,
-                                         f"Added to wishlist (confidence: {best_similarity:.3f})")
-                        self.processed_ids.add(track_id)
-                    except TimeoutException:
-                        print("  ? Could not verify wishlist addition")
-                        self.save_progress(track_id, artist, title, "uncertain", best_match.url, 
-                                         f"Click registered but not verified (confidence: {best_similarity:.3f})")
+        # Navigate to the best match
+        self.driver.get(best_match.url)
+        time.sleep(1.5)
 
-                except NoSuchElementException:
-                    print("  ✗ Could not find wishlist button")
-                    self.save_progress(track_id, artist, title, "no_wishlist_button", best_match.url, 
-                                     f"Wishlist button not found (confidence: {best_similarity:.3f})")
+        # Dismiss cookie banner if it appears
+        self.dismiss_cookies()
 
-            except TimeoutException:
-                print("  ✗ No search results found")
-                self.save_progress(track_id, artist, title, "not_found", "", "No search results")
+        # Ensure the wishlist control is present if available (non-fatal)
+        try:
+            self.wait.until(EC.presence_of_element_located((By.ID, "wishlist-msg")))
+        except TimeoutException:
+            pass
+
+        # 1) Check if owned (visible UI only)
+        if self.is_owned():
+            print("  • Status: OWNED")
+            self.save_progress(track_id, artist, title, "owned", best_match.url,
+                             f"Already purchased (confidence: {best_similarity:.3f})")
+            self.processed_ids.add(track_id)
+            return
 
-        except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
-            self.save_progress(track_id, artist, title, "error", "", str(e))
+        # 2) Check if already in wishlist
+        if self.is_in_wishlist():
+            print("  • Status: Already in wishlist")
+            self.save_progress(track_id, artist, title, "already_wishlisted", best_match.url,
+                             f"Already in wishlist (confidence: {best_similarity:.3f})")
+            self.processed_ids.add(track_id)
+            return
 
-        # Delay between tracks
-        time.sleep(self.delay_between_tracks)
+        # 3) Add to wishlist
+        try:
+            wishlist_button = self.driver.find_element(By.ID, "wishlist-msg")
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", wishlist_button)
+            time.sleep(0.3)
+            self.driver.execute_script("arguments[0].click();", wishlist_button)
+            time.sleep(1)
+
+            # Verify it was added by waiting for 'In Wishlist' to appear in the share panel
+            try:
+                self.wait.until(
+                    EC.visibility_of_element_located(
+                        (By.XPATH, "//div[contains(@class,'share-panel-wrapper-desktop')]//*[normalize-space(text())='In Wishlist']")
+                    )
+                )
+                print("  • Status: Added to wishlist")
+                self.save_progress(track_id, artist, title, "added", best_match.url,
+                                 f"Added to wishlist (confidence: {best_similarity:.3f})")
+                self.processed_ids.add(track_id)
+            except TimeoutException:
+                print("  ? Could not verify wishlist addition")
+                self.save_progress(track_id, artist, title, "uncertain", best_match.url,
+                                 f"Click registered but not verified (confidence: {best_similarity:.3f})")
+
+        except NoSuchElementException:
+            print("  ✗ Could not find wishlist button")
+            self.save_progress(track_id, artist, title, "no_wishlist_button", best_match.url,
+                             f"Wishlist button not found (confidence: {best_similarity:.3f})")
 
     def process_csv(self, input_csv: str):
         """Process all tracks from CSV.
@@ -736,6 +432,22 @@ class BandcampWishlistAutomator:
             print("All tracks already processed!")
             return
 
+        # Resolve all remaining tracks to Bandcamp URLs before opening any page
+        pending = [track for track in tracks if track["id"] not in self.processed_ids]
+        print(f"Searching Bandcamp for {len(pending)} tracks...")
+        searched = 0
+
+        def report(outcome: SearchOutcome):
+            nonlocal searched
+            searched += 1
+            if searched % 25 == 0 or searched == len(pending):
+                print(f"  Searched {searched}/{len(pending)}")
+
+        outcomes = {
+            outcome.track_id: outcome
+            for outcome in self.searcher.resolve_many(pending, on_result=report)
+        }
+
         print("=" * 60)
 
         for i, track in enumerate(tracks, 1):
@@ -743,7 +455,9 @@ class BandcampWishlistAutomator:
                 continue
 
             print(f"\n[{i}/{len(tracks)}] ", end="")
-            self.search_and_wishlist_track(track["id"], track["artist"], track["title"])
+            self.search_and_wishlist_track(
+                track["id"], track["artist"], track["title"], outcomes.get(track["id"])
+            )
 
         print("\n" + "=" * 60)
         print("✓ Processing complete!")
@@ -0,0 +1,175 @@
+"""
+Conversion cache for AudioConverter.
+
+Remembers which output file a conversion produced, keyed by the source
+file's content identity (size plus a hash of its first and last blocks)
+and the target codec settings. A later conversion of the same audio with
+the same settings reuses that output instead of failing on the existing
+file or transcoding again, as long as the output is unchanged on disk.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Bump when conversion settings change in ways FORMAT_CONFIGS does not show
+CONVERSION_CACHE_VERSION = 2
+
+# Bytes hashed from each end of the source file
+PARTIAL_HASH_BLOCK = 64 * 1024
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversions (
+    source_hash TEXT NOT NULL,
+    source_size INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    output_size INTEGER NOT NULL,
+    output_mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (source_hash, source_size, params)
+);
+"""
+
+
+def default_cache_path() -> Path:
+    """Get the default conversion cache location (~/.cache/dj-tool)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "dj-tool" / "conversions.db"
+
+
+def conversion_params(target_format: str, config: Dict[str, Any]) -> str:
+    """Build the cache key part describing the target codec settings."""
+    return json.dumps(
+        {"version": CONVERSION_CACHE_VERSION, "format": target_format, **config},
+        sort_keys=True,
+    )
+
+
+def partial_hash(path: Path, size: int) -> str:
+    """Hash the first and last PARTIAL_HASH_BLOCK bytes of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(PARTIAL_HASH_BLOCK))
+        if size > 2 * PARTIAL_HASH_BLOCK:
+            f.seek(-PARTIAL_HASH_BLOCK, os.SEEK_END)
+        digest.update(f.read(PARTIAL_HASH_BLOCK))
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """SQLite index of finished conversions."""
+
+    def __init__(self, cache_path: Path):
+        """
+        Initialize the conversion cache.
+
+        Args:
+            cache_path: SQLite file holding the index (created if missing)
+        """
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            self._conn.executescript(SCHEMA_SQL)
+        return self._conn
+
+    def _source_identity(self, conn: sqlite3.Connection, source_path: Path) -> Tuple[str, int]:
+        """Get (partial hash, size) of a source, rehashing only if it changed."""
+        stat = source_path.stat()
+        path = str(source_path.resolve())
+        row = conn.execute(
+            "SELECT size, mtime_ns, partial_hash FROM sources WHERE path = ?", (path,)
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2], stat.st_size
+
+        source_hash = partial_hash(source_path, stat.st_size)
+        conn.execute(
+            "INSERT OR REPLACE INTO sources (path, size, mtime_ns, partial_hash) VALUES (?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, source_hash),
+        )
+        conn.commit()
+        return source_hash, stat.st_size
+
+    def lookup(self, source_path: Path, params: str) -> Optional[Path]:
+        """
+        Find a previous output for the same source audio and settings.
+
+        Args:
+            source_path: Source audio file
+            params: Target settings from conversion_params
+
+        Returns:
+            Path of the cached output, or None if there is none or it has
+            changed since it was written
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                source_hash, source_size = self._source_identity(conn, source_path)
+                row = conn.execute(
+                    "SELECT output_path, output_size, output_mtime_ns FROM conversions "
+                    "WHERE source_hash = ? AND source_size = ? AND params = ?",
+                    (source_hash, source_size, params),
+                ).fetchone()
+            except (OSError, sqlite3.Error):
+                return None
+
+        if not row:
+            return None
+
+        output_path = Path(row[0])
+        try:
+            stat = output_path.stat()
+        except OSError:
+            return None
+        if stat.st_size != row[1] or stat.st_mtime_ns != row[2]:
+            return None
+        return output_path
+
+    def store(self, source_path: Path, params: str, output_path: Path) -> None:
+        """
+        Record a finished conversion.
+
+        Args:
+            source_path: Source audio file (must still exist)
+            params: Target settings from conversion_params
+            output_path: File the conversion produced
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                source_hash, source_size = self._source_identity(conn, source_path)
+                stat = output_path.stat()
+                conn.execute(
+                    "INSERT OR REPLACE INTO conversions (source_hash, source_size, params, "
+                    "output_path, output_size, output_mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                    (source_hash, source_size, params, str(output_path.resolve()),
+                     stat.st_size, stat.st_mtime_ns),
+                )
+                conn.commit()
+            except (OSError, sqlite3.Error):
+                # The cache is an optimization; a failed write only costs a re-run
+                pass
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
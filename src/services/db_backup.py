@@ -0,0 +1,197 @@
+"""Deduplicated, copy-on-write backups of the Rekordbox database.
+
+Backups are timestamped copies next to the database
+(``master.backup.20240101_120000.db``). A small JSON manifest beside them
+remembers the size, mtime and hash of the database each backup was taken
+from, so a run against an unchanged database reuses the newest backup
+instead of copying hundreds of MB again. New copies are reflinked
+(copy-on-write, near-instant and sharing disk blocks) where the filesystem
+supports it, and only the newest ``keep`` backups are retained.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Backups kept by default (older ones are deleted)
+BACKUP_RETENTION = 10
+
+# Bytes read at a time when hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Linux ioctl cloning a whole file (btrfs, XFS, bcachefs, overlayfs on those)
+FICLONE = 0x40049409
+
+
+@dataclass
+class BackupResult:
+    """Outcome of one backup request."""
+    path: Path
+    reused: bool = False  # Database unchanged since this existing backup
+    method: str = "copy"  # 'reused', 'reflink' or 'copy'
+
+
+def file_hash(path: Path) -> str:
+    """Hash a file's contents."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """Clone source to target with copy-on-write. Returns False if unsupported."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            target.unlink(missing_ok=True)
+            return False
+
+    if sys.platform == "darwin":
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            return False
+        clonefile = getattr(ctypes.CDLL(libc_name, use_errno=True), "clonefile", None)
+        if clonefile is None:
+            return False
+        return clonefile(os.fsencode(source), os.fsencode(target), 0) == 0
+
+    return False
+
+
+def copy_file(source: Path, target: Path) -> str:
+    """Copy a file, preferring a reflink, preserving timestamps.
+
+    The copy is written to a temporary name and renamed into place, so an
+    interrupted copy never looks like a finished backup.
+
+    Args:
+        source: File to copy
+        target: Destination path
+
+    Returns:
+        'reflink' or 'copy', depending on how the data was copied
+    """
+    partial = target.with_name(target.name + ".partial")
+    partial.unlink(missing_ok=True)
+    try:
+        if _reflink(source, partial):
+            method = "reflink"
+        else:
+            # copyfile uses the kernel's zero-copy paths (sendfile, fcopyfile)
+            shutil.copyfile(source, partial)
+            method = "copy"
+        shutil.copystat(source, partial)
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+    return method
+
+
+class DatabaseBackups:
+    """Timestamped backups of one database file."""
+
+    def __init__(self, db_path: Path, keep: int = BACKUP_RETENTION):
+        """Initialize backups for a database.
+
+        Args:
+            db_path: Database file to back up
+            keep: Newest backups to retain (0 keeps all)
+        """
+        self.db_path = Path(db_path)
+        self.keep = keep
+        self.manifest_path = self.db_path.parent / f"{self.db_path.stem}.backups.json"
+
+    def list_backups(self) -> List[Path]:
+        """Get existing backups, oldest first."""
+        pattern = f"{self.db_path.stem}.backup.*{self.db_path.suffix}"
+        # Timestamps sort chronologically as text
+        return sorted(self.db_path.parent.glob(pattern))
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        partial = self.manifest_path.with_name(self.manifest_path.name + ".partial")
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(partial, self.manifest_path)
+
+    def backup(self) -> BackupResult:
+        """Back up the database unless the newest backup already matches it.
+
+        Returns:
+            BackupResult for the new or reused backup
+
+        Raises:
+            OSError: If the database cannot be read or the copy fails
+        """
+        stat = self.db_path.stat()
+        manifest = self._load_manifest()
+        backups = self.list_backups()
+        db_hash: Optional[str] = None
+
+        latest = backups[-1] if backups else None
+        entry = manifest.get(latest.name) if latest else None
+        if latest and entry and latest.stat().st_size == entry.get("size") == stat.st_size:
+            if entry.get("source_mtime_ns") == stat.st_mtime_ns:
+                # Same size and mtime as when the backup was taken
+                return BackupResult(path=latest, reused=True, method="reused")
+
+            # Touched since (Rekordbox rewrites the file on open); compare contents
+            db_hash = file_hash(self.db_path)
+            if db_hash == entry.get("hash"):
+                entry["source_mtime_ns"] = stat.st_mtime_ns
+                self._save_manifest(manifest)
+                return BackupResult(path=latest, reused=True, method="reused")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = self.db_path.parent / f"{self.db_path.stem}.backup.{timestamp}{self.db_path.suffix}"
+        if target.exists():
+            # Two backups within the same second
+            target = target.with_name(
+                f"{self.db_path.stem}.backup.{timestamp}_{len(backups)}{self.db_path.suffix}"
+            )
+
+        method = copy_file(self.db_path, target)
+        manifest[target.name] = {
+            "size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "hash": db_hash or file_hash(target),
+        }
+
+        self._prune(manifest)
+        self._save_manifest(manifest)
+        return BackupResult(path=target, method=method)
+
+    def _prune(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        """Delete backups beyond the retention limit and stale manifest entries."""
+        backups = self.list_backups()
+        if self.keep > 0:
+            for old in backups[:-self.keep]:
+                old.unlink(missing_ok=True)
+            backups = backups[-self.keep:]
+
+        names = {backup.name for backup in backups}
+        for name in list(manifest):
+            if name not in names:
+                del manifest[name]
@@ -9,33 +9,283 @@ to prevent false positives based solely on artist name matches.
 """
 
 import csv
+import heapq
 import os
-import re
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from difflib import SequenceMatcher
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
 
+from lib.assignment import assign_candidates, greedy_assignment
+from lib.text_utils import NORMALIZE_CACHE_SIZE, normalize_filename, normalize_text
 from models.music_file import MusicFile
 from models.track_record import TrackRecord
+from services.scan_cache import SCAN_THREADS, ScanCache
 
 # Common music file extensions
 MUSIC_EXTENSIONS = {'.mp3', '.wav', '.flac', '.aac', '.m4a', '.ogg', '.wma', '.aiff', '.alac'}
 
+# Candidate files kept per track for the one-to-one assignment
+TOP_CANDIDATES = 5
+
+# A file's title similarity must reach this for the file to be considered
+MIN_TITLE_SIMILARITY = 0.3
+
+
+def music_file_stem(filename: str) -> Optional[str]:
+    """Get the stem of a music filename without building a Path.
+
+    Args:
+        filename: Filename without directory
+
+    Returns:
+        Filename without extension, or None if it is not a music file
+    """
+    dot = filename.rfind('.')
+    # dot == 0 is a hidden file without extension (Path(".mp3").suffix == "")
+    if dot <= 0 or filename[dot:].lower() not in MUSIC_EXTENSIONS:
+        return None
+    return filename[:dot]
+
+
+def _list_music_dir(directory: str) -> Tuple[List[Tuple[str, str, str]], List[str]]:
+    """List one directory (runs in a scan thread).
+
+    Returns:
+        ((path, filename, stem) of music files, subdirectory paths),
+        in listing order
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Like os.walk, do not descend into symlinked directories
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+
+                stem = music_file_stem(entry.name)
+                if stem is not None:
+                    files.append((entry.path, entry.name, stem))
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def iter_music_files(scan_dir: str, threads: int = SCAN_THREADS) -> Iterator[MusicFile]:
+    """Recursively yield music files while directories are listed concurrently.
+
+    Subdirectories are submitted to a thread pool as soon as their parent is
+    listed, so listings overlap network round trips, but files are yielded
+    in the same order as an os.walk scan.
+
+    Args:
+        scan_dir: Directory to scan
+        threads: Number of listing threads
+
+    Yields:
+        MusicFile for every music file found
+    """
+    executor = ThreadPoolExecutor(max_workers=threads)
+    try:
+        pending: List[Future] = [executor.submit(_list_music_dir, str(Path(scan_dir)))]
+        while pending:
+            files, subdirs = pending.pop().result()
+            directory_futures = [executor.submit(_list_music_dir, d) for d in subdirs]
+            # Depth-first, first subdirectory next (same as os.walk)
+            pending.extend(reversed(directory_futures))
+
+            for file_path, filename, stem in files:
+                normalized = normalize_filename(stem)
+                yield MusicFile(
+                    file_path=file_path,
+                    filename=filename,
+                    filename_clean=normalized.text,
+                    filename_words=normalized.words
+                )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FileIndex:
+    """Pre-filter for the title similarity gate.
+
+    The title similarity is the better of the title/filename sequence ratio
+    and the share of title words found in the filename. A file sharing no
+    word with the title can only pass the gate on its sequence ratio, which
+    is bounded by 2 * (characters in common) / (total length). The index
+    keeps filename word postings, filenames sorted by length and per-file
+    character counts, so files that cannot pass the gate are dropped without
+    running SequenceMatcher on them.
+    """
+
+    def __init__(self, music_files: List[MusicFile]):
+        """Initialize index.
+
+        Args:
+            music_files: Scanned files; positions refer to this list
+        """
+        self.music_files = music_files
+        self.postings: Dict[str, List[int]] = {}
+        self.char_counts: List[Counter] = []
+        self._positions_by_length: List[int] = []
+        self._lengths: List[int] = []
+        for music_file in music_files:
+            self._index_file(music_file)
+
+    def add(self, music_file: MusicFile) -> None:
+        """Append a file to the indexed list.
+
+        Args:
+            music_file: Newly scanned file
+        """
+        self.music_files.append(music_file)
+        self._index_file(music_file)
+
+    def _index_file(self, music_file: MusicFile) -> None:
+        position = len(self.char_counts)
+        words = music_file.filename_words or frozenset(music_file.filename_clean.split())
+        for word in words:
+            self.postings.setdefault(word, []).append(position)
+        self.char_counts.append(Counter(music_file.filename_clean))
+
+    def _length_order(self) -> Tuple[List[int], List[int]]:
+        """Get file positions sorted by cleaned length, and those lengths."""
+        if len(self._positions_by_length) != len(self.music_files):
+            music_files = self.music_files
+            self._positions_by_length = sorted(
+                range(len(music_files)), key=lambda i: len(music_files[i].filename_clean)
+            )
+            self._lengths = [len(music_files[i].filename_clean) for i in self._positions_by_length]
+        return self._positions_by_length, self._lengths
+
+    def title_candidates(self, title_clean: str, title_words: FrozenSet[str]) -> List[int]:
+        """Get positions of files that may pass the title similarity gate.
+
+        Args:
+            title_clean: Cleaned (non-empty) track title
+            title_words: Words of title_clean
+
+        Returns:
+            Sorted file positions; every file left out has a title
+            similarity below MIN_TITLE_SIMILARITY
+        """
+        candidates = set()
+        for word in title_words:
+            candidates.update(self.postings.get(word, ()))
+
+        # ratio <= 2 * min(a, b) / (a + b) limits the filename length range
+        # (widened by a character so float rounding never drops a file)
+        positions_by_length, lengths = self._length_order()
+        title_len = len(title_clean)
+        min_len = title_len * MIN_TITLE_SIMILARITY / (2 - MIN_TITLE_SIMILARITY) - 1
+        max_len = title_len * (2 - MIN_TITLE_SIMILARITY) / MIN_TITLE_SIMILARITY + 1
+        start = bisect_left(lengths, min_len)
+        end = bisect_right(lengths, max_len)
+
+        title_chars = Counter(title_clean).items()
+        for position in positions_by_length[start:end]:
+            if position in candidates:
+                continue
+            file_chars = self.char_counts[position]
+            common = sum(min(count, file_chars[char]) for char, count in title_chars)
+            total = title_len + len(self.music_files[position].filename_clean)
+            if 2.0 * common / total >= MIN_TITLE_SIMILARITY:
+                candidates.add(position)
+
+        return sorted(candidates)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _search_patterns(
+    track_artist_clean: str, track_title_clean: str
+) -> Tuple[Tuple[str, FrozenSet[str]], ...]:
+    """Build the search strings (and their words) tried against filenames."""
+    search_patterns = []
+
+    # Artist - Title
+    if track_artist_clean and track_title_clean:
+        search_patterns.append(f"{track_artist_clean} {track_title_clean}")
+        search_patterns.append(f"{track_title_clean} {track_artist_clean}")
+
+    # Just title if artist is empty or very different
+    if track_title_clean:
+        search_patterns.append(track_title_clean)
+
+    # Just artist if title is empty (but this is now less likely to match due to title requirement)
+    if track_artist_clean:
+        search_patterns.append(track_artist_clean)
+
+    return tuple(
+        (pattern, frozenset(pattern.split()))
+        for pattern in search_patterns
+        if pattern.strip()
+    )
+
+
+# Matcher used inside worker processes, set up once per worker
+_worker_matcher: Optional["FilePathMatcher"] = None
+
+
+def _init_match_worker(
+    similarity_threshold: float, candidates_per_track: int, music_files: List[MusicFile]
+) -> None:
+    """Receive the scanned file list once when a worker process starts."""
+    global _worker_matcher
+    _worker_matcher = FilePathMatcher(
+        similarity_threshold=similarity_threshold, candidates_per_track=candidates_per_track
+    )
+    _worker_matcher.music_files = music_files
+
+
+def _match_track_chunk(
+    chunk: List[Tuple[int, TrackRecord]]
+) -> List[Tuple[int, List[Tuple[int, float]]]]:
+    """Find the candidate files for each (track index, track) in a worker process."""
+    return [(i, _worker_matcher._find_top_files(track)) for i, track in chunk]
+
 
 class FilePathMatcher:
     """Main class for matching CSV tracks with music files."""
 
-    def __init__(self, similarity_threshold: float = 0.6):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.6,
+        workers: int = 1,
+        scan_cache_path: Optional[str] = None,
+        candidates_per_track: int = TOP_CANDIDATES,
+    ):
         """Initialize the matcher.
 
         Args:
             similarity_threshold: Minimum similarity score (0.0-1.0) for matching
+            workers: Number of processes used to score tracks against files
+            scan_cache_path: Optional SQLite file caching directory listings
+                between runs (see ScanCache)
+            candidates_per_track: Best files kept per track for the
+                one-to-one track/file assignment
         """
         self.similarity_threshold = similarity_threshold
+        self.workers = max(1, workers)
+        self.scan_cache_path = scan_cache_path
         self.music_files: List[MusicFile] = []
         self.tracks: List[TrackRecord] = []
+        self.candidates_per_track = max(1, candidates_per_track)
         self.duplicate_files_resolved = 0
+        self.tracks_recovered = 0
+        self._file_index: Optional[FileIndex] = None
 
     def load_csv_tracks(self, csv_path: str) -> List[TrackRecord]:
         """Load tracks from the input CSV file."""
@@ -81,66 +331,60 @@ class FilePathMatcher:
 
         print(f"Scanning for music files in: {scan_dir}")
 
-        for root, dirs, files in os.walk(scan_path):
-            for file in files:
-                file_path = Path(root) / file
+        if self.scan_cache_path:
+            music_files = self._scan_with_cache(scan_dir)
+            if music_files is not None:
+                self._file_index = FileIndex(music_files)
+                print(f"Found {len(music_files)} music files")
+                return music_files
+            music_files = []
 
-                # Check if it's a music file
-                if file_path.suffix.lower() in MUSIC_EXTENSIONS:
-                    music_file = MusicFile(
-                        file_path=str(file_path),
-                        filename=file_path.name,
-                        filename_clean=self._clean_filename(file_path.stem)
-                    )
-                    music_files.append(music_file)
+        # Files are cleaned and indexed while the scan threads keep listing
+        file_index = FileIndex(music_files)
+        for music_file in iter_music_files(scan_dir):
+            file_index.add(music_file)
+        self._file_index = file_index
 
         print(f"Found {len(music_files)} music files")
         return music_files
 
+    def _scan_with_cache(self, scan_dir: str) -> Optional[List[MusicFile]]:
+        """Scan through the scan cache.
+
+        Returns:
+            Music files, or None if the cache could not be used
+        """
+        cache = ScanCache(self.scan_cache_path)
+        try:
+            music_files = cache.scan(scan_dir, _list_music_dir, threads=SCAN_THREADS)
+        except sqlite3.Error as e:
+            print(f"Warning: Scan cache unavailable ({e}), scanning without it")
+            return None
+
+        print(f"Scan cache: {cache.cached_dirs} directories unchanged, {cache.listed_dirs} listed")
+        return music_files
+
+    def _get_file_index(self) -> FileIndex:
+        """Get the index for the current file list, rebuilding it if replaced."""
+        if self._file_index is None or self._file_index.music_files is not self.music_files:
+            self._file_index = FileIndex(self.music_files)
+        return self._file_index
+
     def _clean_filename(self, filename: str) -> str:
         """Clean filename for better matching."""
-        # Note: file extension should already be removed by Path.stem,
-        # but handle it just in case
-        # Only remove if it looks like a file extension (3-4 chars after final dot)
-        if '.' in filename:
-            parts = filename.rsplit('.', 1)
-            if len(parts) == 2 and len(parts[1]) <= 4 and parts[1].isalpha():
-                filename = parts[0]
-
-        # Remove common patterns that interfere with matching
-        patterns_to_remove = [
-            r'\([^)]*\)',  # Remove content in parentheses
-            r'\[[^\]]*\]',  # Remove content in brackets
-            r'[-_]\d+$',    # Remove trailing track numbers
-            r'\s+',         # Multiple spaces to single space
-            r'[^\w\s]',     # Remove special characters except spaces
-        ]
-
-        for pattern in patterns_to_remove[:-2]:  # Don't remove spaces and special chars yet
-            filename = re.sub(pattern, ' ', filename, flags=re.IGNORECASE)
-
-        # Normalize spaces
-        filename = re.sub(r'\s+', ' ', filename).strip()
-
-        # Remove special characters (keep spaces for word matching)
-        filename = re.sub(r'[^\w\s]', '', filename)
-
-        return filename.lower()
+        return normalize_filename(filename).text
 
     def _clean_track_info(self, text: str) -> str:
         """Clean track artist/title for matching."""
-        if not text:
-            return ""
-
-        # Similar cleaning as filename but preserve some structure
-        text = re.sub(r'\([^)]*\)', '', text)  # Remove parentheses content
-        text = re.sub(r'\[[^\]]*\]', '', text)  # Remove brackets content
-        text = re.sub(r'[^\w\s]', '', text)     # Remove special chars
-        text = re.sub(r'\s+', ' ', text).strip()  # Normalize spaces
-
-        return text.lower()
-
-    def _calculate_title_similarity(self, track_title_clean: str, filename_clean: str) -> float:
+        return normalize_text(text).text
+
+    def _calculate_title_similarity(
+        self,
+        track_title_clean: str,
+        filename_clean: str,
+        title_words: Optional[FrozenSet[str]] = None,
+        filename_words: Optional[FrozenSet[str]] = None,
+    ) -> float:
         """Calculate similarity specifically for the title portion."""
         if not track_title_clean:
             return 0.0
@@ -149,8 +393,10 @@ class FilePathMatcher:
         sequence_sim = SequenceMatcher(None, track_title_clean, filename_clean).ratio()
 
         # Word-based similarity (check if title words appear in filename)
-        title_words = set(track_title_clean.split())
-        filename_words = set(filename_clean.split())
+        if title_words is None:
+            title_words = frozenset(track_title_clean.split())
+        if filename_words is None:
+            filename_words = frozenset(filename_clean.split())
 
         if title_words and filename_words:
             # Calculate what percentage of title words are found in filename
@@ -164,44 +410,26 @@ class FilePathMatcher:
 
     def _calculate_similarity(self, track: TrackRecord, music_file: MusicFile) -> float:
         """Calculate similarity score between track and music file."""
-        # Create search strings
-        track_artist_clean = self._clean_track_info(track.artist)
-        track_title_clean = self._clean_track_info(track.title)
+        # Create search strings (cleaned once per distinct string)
+        track_artist = normalize_text(track.artist)
+        track_title = normalize_text(track.title)
+        filename_words = music_file.filename_words or frozenset(music_file.filename_clean.split())
 
         # REQUIREMENT: Must have at least partial title match
-        if track_title_clean:
-            title_similarity = self._calculate_title_similarity(track_title_clean, music_file.filename_clean)
-            if title_similarity < 0.3:  # Minimum title similarity threshold
+        if track_title.text:
+            title_similarity = self._calculate_title_similarity(
+                track_title.text, music_file.filename_clean, track_title.words, filename_words
+            )
+            if title_similarity < MIN_TITLE_SIMILARITY:  # Minimum title similarity threshold
                 return 0.0  # No match if title doesn't have partial similarity
 
         # Try different combinations for matching
-        search_patterns = []
-
-        # Artist - Title
-        if track_artist_clean and track_title_clean:
-            search_patterns.append(f"{track_artist_clean} {track_title_clean}")
-            search_patterns.append(f"{track_title_clean} {track_artist_clean}")
-
-        # Just title if artist is empty or very different
-        if track_title_clean:
-            search_patterns.append(track_title_clean)
-
-        # Just artist if title is empty (but this is now less likely to match due to title requirement)
-        if track_artist_clean:
-            search_patterns.append(track_artist_clean)
-
         max_similarity = 0.0
 
-        for pattern in search_patterns:
-            if not pattern.strip():
-                continue
-
+        for pattern, pattern_words in _search_patterns(track_artist.text, track_title.text):
             similarity = SequenceMatcher(None, pattern, music_file.filename_clean).ratio()
 
             # Bonus for word matches (even if order is different)
-            pattern_words = set(pattern.split())
-            filename_words = set(music_file.filename_clean.split())
-
             if pattern_words and filename_words:
                 word_match_ratio = len(pattern_words.intersection(filename_words)) / len(pattern_words.union(filename_words))
                 # Combine sequential similarity with word match
@@ -212,59 +440,122 @@ class FilePathMatcher:
 
         return max_similarity
 
-    def match_tracks_to_files(self) -> int:
-        """Match tracks to music files based on similarity with duplicate resolution."""
-        print("Matching tracks to files...")
+    def _find_top_files(self, track: TrackRecord) -> List[Tuple[int, float]]:
+        """Find the most similar music files for a track.
+
+        Only files returned by the FileIndex pre-filter are scored; the rest
+        would fail the title gate and score 0.0 anyway.
 
-        # Step 1: Collect all potential matches
-        potential_matches = {}  # file_path -> [(track_index, confidence_score)]
+        Args:
+            track: Track to match
 
-        for i, track in enumerate(self.tracks):
-            if (i + 1) % 50 == 0:
-                print(f"Processed {i + 1}/{len(self.tracks)} tracks...")
+        Returns:
+            Up to candidates_per_track (index into self.music_files,
+            similarity) pairs reaching the similarity threshold, best first
+            (ties in file order)
+        """
+        track_title = normalize_text(track.title)
+        if track_title.text:
+            positions = self._get_file_index().title_candidates(track_title.text, track_title.words)
+        else:
+            positions = range(len(self.music_files))
 
-            best_match = None
-            best_similarity = 0.0
+        scored = []
+        for file_index in positions:
+            similarity = self._calculate_similarity(track, self.music_files[file_index])
 
-            for music_file in self.music_files:
-                similarity = self._calculate_similarity(track, music_file)
+            if similarity > 0.0 and similarity >= self.similarity_threshold:
+                scored.append((file_index, similarity))
 
-                if similarity > best_similarity and similarity >= self.similarity_threshold:
-                    best_similarity = similarity
-                    best_match = music_file
+        return heapq.nsmallest(self.candidates_per_track, scored, key=lambda c: (-c[1], c[0]))
 
-            if best_match:
-                file_path = best_match.file_path
-                if file_path not in potential_matches:
-                    potential_matches[file_path] = []
-                potential_matches[file_path].append((i, best_similarity))
+    def _find_best_file(self, track: TrackRecord) -> Optional[Tuple[int, float]]:
+        """Find the most similar music file for a track.
 
-        # Step 2: Resolve duplicates - keep only the highest confidence match for each file
-        matched_count = 0
-        self.duplicate_files_resolved = 0
+        Args:
+            track: Track to match
+
+        Returns:
+            (index into self.music_files, similarity) or None if nothing
+            reaches the similarity threshold
+        """
+        top_files = self._find_top_files(track)
+        return top_files[0] if top_files else None
+
+    def _find_candidate_files(self) -> List[List[Tuple[int, float]]]:
+        """Find candidate files for every track, serially or in worker processes.
+
+        Returns:
+            One _find_top_files result per track, in track order
+        """
+        total = len(self.tracks)
+
+        if self.workers <= 1 or total < 2:
+            candidate_files = []
+            for i, track in enumerate(self.tracks):
+                if (i + 1) % 50 == 0:
+                    print(f"Processed {i + 1}/{total} tracks...")
+                candidate_files.append(self._find_top_files(track))
+            return candidate_files
+
+        # Several chunks per worker keeps them busy when chunk costs differ
+        chunk_size = max(1, total // (self.workers * 4))
+        indexed_tracks = list(enumerate(self.tracks))
+        chunks = [indexed_tracks[i:i + chunk_size] for i in range(0, total, chunk_size)]
+
+        print(f"Using {self.workers} worker processes")
+        candidate_files: List[List[Tuple[int, float]]] = [[] for _ in range(total)]
+        processed = 0
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_match_worker,
+            initargs=(self.similarity_threshold, self.candidates_per_track, self.music_files),
+        ) as executor:
+            # map() yields chunk results in submission order, so the merge
+            # (and everything after it) matches the serial path exactly
+            for chunk_results in executor.map(_match_track_chunk, chunks):
+                for i, top_files in chunk_results:
+                    candidate_files[i] = top_files
+                processed += len(chunk_results)
+                print(f"Processed {processed}/{total} tracks...")
+
+        return candidate_files
+
+    def match_tracks_to_files(self) -> int:
+        """Match tracks to music files one-to-one.
+
+        Each track keeps its best candidate files. When several tracks want
+        the same file, the assignment matches as many tracks as possible
+        (falling back to lower-ranked candidates) and then maximizes the
+        total confidence, instead of dropping every track but the best one.
+        """
+        print("Matching tracks to files...")
+
+        # Step 1: Collect candidate files per track
+        candidates = {
+            i: top_files
+            for i, top_files in enumerate(self._find_candidate_files())
+            if top_files
+        }
+
+        # Step 2: Resolve duplicates with a global one-to-one assignment
+        greedy = greedy_assignment(candidates)
+        assignment = assign_candidates(candidates)
+        self.duplicate_files_resolved = len(candidates) - len(greedy)
+        self.tracks_recovered = sum(1 for i in assignment if i not in greedy)
 
-        for file_path, matches in potential_matches.items():
-            if len(matches) > 1:
-                # Multiple tracks matched to the same file - keep only the best one
-                matches.sort(key=lambda x: x[1], reverse=True)  # Sort by confidence, highest first
-                best_match = matches[0]
-                self.duplicate_files_resolved += len(matches) - 1
-
-                # Set the match for the best track only
-                track_index, confidence = best_match
-                self.tracks[track_index].matched_file_path = file_path
-                self.tracks[track_index].confidence_score = confidence
-                matched_count += 1
-            else:
-                # Single match - no conflict
-                track_index, confidence = matches[0]
-                self.tracks[track_index].matched_file_path = file_path
-                self.tracks[track_index].confidence_score = confidence
-                matched_count += 1
+        for track_index, (file_index, confidence) in assignment.items():
+            self.tracks[track_index].matched_file_path = self.music_files[file_index].file_path
+            self.tracks[track_index].confidence_score = confidence
+        matched_count = len(assignment)
 
         duplicate_msg = ""
         if self.duplicate_files_resolved > 0:
-            duplicate_msg = f" ({self.duplicate_files_resolved} duplicate file matches resolved)"
+            duplicate_msg = (
+                f" ({self.duplicate_files_resolved} duplicate file matches resolved, "
+                f"{self.tracks_recovered} tracks recovered with another candidate file)"
+            )
 
         print(f"Successfully matched {matched_count}/{len(self.tracks)} tracks{duplicate_msg}")
         return matched_count
@@ -308,6 +599,7 @@ class FilePathMatcher:
 
         if self.duplicate_files_resolved > 0:
             print(f"  Duplicate file matches resolved: {self.duplicate_files_resolved}")
+            print(f"  Tracks recovered with another candidate file: {self.tracks_recovered}")
 
         if unmatched_tracks > 0:
             print(f"\nAll unmatched tracks:")
@@ -348,6 +640,7 @@ class FilePathMatcher:
 
             if self.duplicate_files_resolved > 0:
                 file.write(f"- **Duplicate File Matches Resolved**: {self.duplicate_files_resolved}\n")
+                file.write(f"- **Recovered With Another Candidate File**: {self.tracks_recovered}\n")
 
             file.write("\n")
 
@@ -387,7 +680,7 @@ class FilePathMatcher:
             file.write("## Recommendations\n\n")
 
             if self.duplicate_files_resolved > 0:
-                file.write(f"- **{self.duplicate_files_resolved} duplicate file conflicts resolved**: When multiple tracks matched the same file, only the track with the highest confidence score was kept\n")
+                file.write(f"- **{self.duplicate_files_resolved} duplicate file conflicts resolved**: When multiple tracks matched the same file, tracks were reassigned to their other candidate files where possible ({self.tracks_recovered} recovered); the rest were left unmatched\n")
 
             if unmatched_count > 0:
                 if unmatched_count / total_tracks > 0.3:
@@ -0,0 +1,148 @@
+"""Checkpoint file for resumable link-local runs.
+
+Records each CSV row's progress as it happens: the output of a finished
+conversion, and the database write once its transaction has committed.
+Lines are appended and flushed to disk immediately, so after a crash or
+Ctrl-C a ``--resume`` run skips rows that were already written and reuses
+conversions that had finished, like the Bandcamp progress CSV does for
+wishlist runs.
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lib.csv_parser import TrackMapping
+
+# Row states
+CONVERTED = "converted"  # Conversion output ready, database not written yet
+COMMITTED = "committed"  # Database update committed
+
+CHECKPOINT_FIELDS = [
+    "row_num", "file_path", "track_id", "status",
+    "output_path", "output_size", "conversion_format", "timestamp",
+]
+
+
+@dataclass
+class CheckpointEntry:
+    """Progress of one CSV row."""
+    row_num: int
+    file_path: str  # File path as given in the CSV
+    track_id: Optional[int]
+    status: str  # CONVERTED or COMMITTED
+    output_path: str = ""  # Converted file, if any
+    output_size: int = 0
+    conversion_format: str = ""
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        return self.row_num, self.file_path
+
+
+def default_checkpoint_path(csv_path: Path) -> Path:
+    """Get the checkpoint location for a CSV (next to it)."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}.checkpoint.csv")
+
+
+def mapping_key(mapping: TrackMapping) -> Tuple[int, str]:
+    """Identify a CSV row by its number and file path.
+
+    Including the path keeps an edited CSV from inheriting progress
+    recorded for a different row at the same position.
+    """
+    return mapping.row_num, str(mapping.file_path)
+
+
+class LinkCheckpoint:
+    """Append-only CSV of per-row progress."""
+
+    def __init__(self, path: Path):
+        """Initialize the checkpoint.
+
+        Args:
+            path: Checkpoint CSV (created on the first record)
+        """
+        self.path = Path(path)
+        self.entries: Dict[Tuple[int, str], CheckpointEntry] = {}
+
+    def load(self) -> int:
+        """Load progress from an earlier run (later lines win).
+
+        Returns:
+            Number of rows with recorded progress
+        """
+        self.entries = {}
+        if not self.path.exists():
+            return 0
+
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    entry = CheckpointEntry(
+                        row_num=int(row["row_num"]),
+                        file_path=row["file_path"],
+                        track_id=int(row["track_id"]) if row["track_id"] else None,
+                        status=row["status"],
+                        output_path=row["output_path"] or "",
+                        output_size=int(row["output_size"] or 0),
+                        conversion_format=row["conversion_format"] or "",
+                    )
+                except (KeyError, TypeError, ValueError):
+                    # A line cut short by a crash
+                    continue
+                if entry.status not in (CONVERTED, COMMITTED):
+                    continue
+                self.entries[entry.key] = entry
+
+        return len(self.entries)
+
+    def reset(self) -> None:
+        """Discard all recorded progress."""
+        self.entries = {}
+        self.path.unlink(missing_ok=True)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def get(self, mapping: TrackMapping) -> Optional[CheckpointEntry]:
+        """Get the recorded progress of a row."""
+        return self.entries.get(mapping_key(mapping))
+
+    def record(self, entries: List[CheckpointEntry]) -> None:
+        """Append progress and flush it to disk.
+
+        Args:
+            entries: Progress to record
+        """
+        if not entries:
+            return
+
+        file_exists = self.path.exists()
+        if file_exists and not self._ends_with_newline():
+            # Finish a line cut short by a crash so new lines stay readable
+            with open(self.path, "a", encoding="utf-8", newline="") as f:
+                f.write("\r\n")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if not file_exists:
+                writer.writerow(CHECKPOINT_FIELDS)
+            for entry in entries:
+                writer.writerow([
+                    entry.row_num, entry.file_path,
+                    entry.track_id if entry.track_id is not None else "",
+                    entry.status, entry.output_path, entry.output_size,
+                    entry.conversion_format, timestamp,
+                ])
+                self.entries[entry.key] = entry
+            f.flush()
+            os.fsync(f.fileno())
@@ -1,11 +1,36 @@
 """LinkLocalService - main orchestration for linking local files."""
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
-from lib.csv_parser import CSVParser, TrackMapping
-from lib.fuzzy_matcher import FuzzyMatcher
-from services.rekordbox import RekordboxAdapter
-from services.audio_converter import AudioConverter, ConversionResult
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from lib.csv_parser import CSVParser, CSVRowError, TrackMapping
+from lib.fuzzy_matcher import FuzzyMatcher, TrackIndex
+from models.track import Track
+from services.db_backup import BACKUP_RETENTION
+from services.link_checkpoint import COMMITTED, CONVERTED, CheckpointEntry, LinkCheckpoint, mapping_key
+from services.link_pipeline import (
+    DONE, PIPELINE_QUEUE_SIZE, RowOutput, StageStats, StageThread, receive, receive_batch, send,
+)
+from services.link_plan import PLAN_SETTINGS, LinkPlan, PlanEntry
+from services.rekordbox import LocalLinkUpdate, RekordboxAdapter
+from services.undo_journal import UndoJournal
+from services.audio_converter import AudioConverter, ConversionJob, ConversionResult
+
+# CSV rows read (and their database tracks prefetched) per batch
+PROCESS_BATCH_SIZE = 256
+
+# With a checkpoint, queued database updates are committed this many at a time
+CHECKPOINT_COMMIT_SIZE = 256
+
+# Stages of the pipelined executor, in row order
+PIPELINE_STAGES = ("read", "match", "validate", "convert", "write")
 
 
 @dataclass
@@ -19,6 +44,30 @@ class LinkResult:
     confidence: Optional[float] = None  # For fuzzy matching
     converted: bool = False  # Was audio conversion performed
     conversion_format: Optional[str] = None  # Target format if converted
+    file_path: Optional[str] = None  # File linked (or to link in a dry run)
+    file_size: int = 0
+
+
+@dataclass
+class LinkJob:
+    """A track moving through the match, validate, convert and write stages."""
+    mapping: TrackMapping
+    track_id: Optional[int] = None  # Database track ID (set by matching)
+    file_path: Optional[Union[str, Path]] = None  # File to link (set by conversion)
+    file_size: int = 0
+    converted: bool = False
+    conversion_format: Optional[str] = None
+    output: Optional[io.StringIO] = None  # Buffered output (pipeline only)
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of up to size items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
 
 
 class LinkLocalService:
@@ -38,7 +87,15 @@ class LinkLocalService:
         convert_format: Optional[str] = None,
         convert_from_formats: Optional[List[str]] = None,
         conversion_output_dir: Optional[Path] = None,
-        force_reanalyze: bool = True
+        force_reanalyze: bool = True,
+        conversion_workers: Optional[int] = None,
+        conversion_cache_path: Optional[Path] = None,
+        keep_backups: int = BACKUP_RETENTION,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = False,
+        plan_path: Optional[Path] = None,
+        plan: Optional[LinkPlan] = None,
+        pipeline: bool = False
     ):
         """Initialize service.
         
@@ -56,6 +113,20 @@ class LinkLocalService:
             convert_from_formats: Optional list of source formats to convert (filters conversion)
             conversion_output_dir: Directory for converted files (defaults to source dir)
             force_reanalyze: Force Rekordbox to re-analyze linked tracks (default: True)
+            conversion_workers: Concurrent ffmpeg conversions with --apply (default: CPU count)
+            conversion_cache_path: Optional conversion cache index, so files
+                converted by earlier runs are reused instead of converted again
+            keep_backups: Database backups to retain with --apply (0 keeps all)
+            checkpoint_path: Optional checkpoint file recording each row's
+                progress with --apply; updates are then committed in batches
+                of CHECKPOINT_COMMIT_SIZE instead of all at the end
+            resume: Continue from the checkpoint of an interrupted run
+                instead of starting over
+            plan_path: Optional file to save a dry run's results to as a plan
+            plan: Optional plan from an earlier dry run; its planned updates
+                are validated and written instead of reading csv_path
+            pipeline: Read, match, validate, convert and write rows in
+                concurrent stages connected by bounded queues
         """
         self.csv_path = csv_path
         self.adapter = rekordbox_adapter
@@ -70,6 +141,18 @@ class LinkLocalService:
         self.convert_from_formats = convert_from_formats
         self.conversion_output_dir = conversion_output_dir
         self.force_reanalyze = force_reanalyze
+        self.conversion_workers = conversion_workers
+        self.keep_backups = keep_backups
+        self.resume = resume
+        self.plan_path = plan_path
+        self.plan = plan
+        self.plan_entries: Dict[int, PlanEntry] = {}  # Planned updates by CSV row
+        self.pipeline = pipeline
+        self.stage_stats: Dict[str, StageStats] = {}  # Filled by the pipeline
+        self.pipeline_seconds = 0.0
+        self.checkpoint: Optional[LinkCheckpoint] = (
+            LinkCheckpoint(checkpoint_path) if checkpoint_path else None
+        )
         
         # Statistics
         self.total_tracks = 0
@@ -78,16 +161,30 @@ class LinkLocalService:
         self.error_count = 0
         self.converted_count = 0
         self.reanalyzed_count = 0
+        self.resumed_count = 0  # Rows committed by an earlier run
+        self._stopped = False  # Set on the first error in strict mode
         
         # For fuzzy matching
         self.fuzzy_matcher: Optional[FuzzyMatcher] = None
         self.streaming_tracks_cache: Optional[List] = None
+        self.streaming_track_index: Optional[TrackIndex] = None
+        
+        # For ID matching: tracks prefetched in one batched query
+        self.db_tracks_cache: Dict[int, Track] = {}
+        
+        # Track ID -> CSV row that will link it (writes are deferred, so the
+        # database and the cache still show the track as streaming)
+        self.linked_rows: Dict[int, int] = {}
+        
+        # Database writes queued during --apply, committed in one transaction
+        # (or in batches when checkpointing)
+        self.pending_updates: List[Tuple[LinkResult, LocalLinkUpdate]] = []
         
         # Audio converter (lazy init)
         self.audio_converter: Optional[AudioConverter] = None
         if convert_format:
             try:
-                self.audio_converter = AudioConverter()
+                self.audio_converter = AudioConverter(cache_path=conversion_cache_path)
             except RuntimeError as e:
                 raise RuntimeError(f"Cannot initialize audio converter: {e}")
     
@@ -99,37 +196,54 @@ class LinkLocalService:
         """
         results = []
         
-        # Parse CSV
-        print(f"Reading tracks from {self.csv_path}...")
-        parser = CSVParser(require_id=not self.use_fuzzy_match)
-        try:
-            mappings = parser.parse(str(self.csv_path))
-        except Exception as e:
-            print(f"✗ Error parsing CSV: {e}")
-            return results
-        
-        self.total_tracks = len(mappings)
-        
-        # Apply limit if specified
-        if self.limit and self.limit < len(mappings):
-            mappings = mappings[:self.limit]
-            print(f"Limiting to first {self.limit} tracks")
+        if self.plan is not None:
+            # Matching and path resolution were done by the dry run
+            writes = self.plan.writes
+            print(f"Applying plan for {self.plan.csv_path} (made {self.plan.created})")
+            print(f"{len(writes)} planned update(s), {len(self.plan.entries) - len(writes)} row(s) skipped at review\n")
+            self.plan_entries = {entry.row_num: entry for entry in writes}
+            rows = (entry.to_mapping() for entry in writes)
+        else:
+            # Open the CSV; rows are parsed lazily while tracks are processed
+            print(f"Reading tracks from {self.csv_path}...")
+            parser = CSVParser(require_id=not self.use_fuzzy_match)
+            try:
+                rows = parser.iter_parse(str(self.csv_path))
+            except Exception as e:
+                print(f"✗ Error parsing CSV: {e}")
+                return results
+            
+            # Apply limit if specified
+            if self.limit:
+                rows = islice(rows, self.limit)
+                print(f"Limiting to first {self.limit} tracks")
         
-        print(f"Found {len(mappings)} tracks to process\n")
+        # Pick up where an interrupted run stopped, or start a new checkpoint
+        if self.checkpoint:
+            if self.resume:
+                recorded = self.checkpoint.load()
+                print(f"Resuming from {self.checkpoint.path.name}: {recorded} row(s) recorded")
+            elif not self.dry_run:
+                self.checkpoint.reset()
         
         # Initialize fuzzy matcher if needed
-        if self.use_fuzzy_match:
+        if self.use_fuzzy_match and self.plan is None:
             self.fuzzy_matcher = FuzzyMatcher(self.match_threshold)
             print("Loading streaming tracks from database...")
             self.streaming_tracks_cache = self.adapter.get_streaming_tracks()
+            self.streaming_track_index = self.fuzzy_matcher.build_index(self.streaming_tracks_cache)
             print(f"Loaded {len(self.streaming_tracks_cache)} streaming tracks\n")
         
         # Backup database if not dry-run
         if not self.dry_run:
             print("Creating database backup...")
-            backup_path = self.adapter.backup_database()
+            backup_path = self.adapter.backup_database(keep=self.keep_backups)
             if backup_path:
-                print(f"✓ Backup created: {backup_path.name}\n")
+                backup = self.adapter.last_backup
+                if backup is not None and backup.reused:
+                    print(f"✓ Database unchanged since backup: {backup_path.name}\n")
+                else:
+                    print(f"✓ Backup created: {backup_path.name}\n")
             else:
                 print(f"✗ Failed to backup database: {self.adapter.error_message}")
                 if self.strict:
@@ -139,47 +253,409 @@ class LinkLocalService:
         print("=" * 60)
         
         # Process each track
-        for i, mapping in enumerate(mappings, 1):
-            print(f"\n[{i}/{len(mappings)}] ", end="")
-            result = self._process_track(mapping)
-            results.append(result)
-            
-            # Update statistics
-            if result.success:
-                self.updated_count += 1
-            elif result.action == 'skipped':
-                self.skipped_count += 1
-            else:  # error
-                self.error_count += 1
-                
-                # Fail fast if strict mode
-                if self.strict:
-                    print(f"\n\n✗ Stopping due to error (strict mode)")
+        self._stopped = False
+        if self.pipeline:
+            self._execute_pipeline(rows, results)
+        elif self.audio_converter and self.convert_format and not self.dry_run:
+            # Conversions run in the background while later rows are matched
+            conversions = self.audio_converter.convert_many(
+                self._iter_conversion_jobs(rows, results),
+                max_workers=self.conversion_workers
+            )
+            for conversion_job, conv_result in conversions:
+                job = conversion_job.context
+                self._apply_conversion(job, conv_result, background=True)
+                self._record_result(results, self._write_stage(job))
+        else:
+            for result in self._iter_results(rows):
+                self._record_result(results, result)
+                if self._stopped:
                     break
         
+        # Keep results in CSV order (conversions finish out of order)
+        results.sort(key=lambda r: r.track_mapping.row_num)
+        
+        # Commit queued database updates (tracks processed before a strict
+        # stop are still written, as they would have been one by one)
+        self._commit_pending_updates()
+        
         print("\n" + "=" * 60)
         self._print_summary(results)
         
+        if self.dry_run and self.plan_path:
+            self._save_plan(results)
+        
         return results
     
+    def _iter_rows(
+        self,
+        rows: Iterable[Union[TrackMapping, CSVRowError]]
+    ) -> Iterator[Union[TrackMapping, CSVRowError]]:
+        """Number and yield CSV rows, prefetching database tracks per batch.
+        
+        Stops early once a strict-mode error has been recorded.
+        """
+        for batch in _batched(rows, PROCESS_BATCH_SIZE):
+            if self.resume and self.checkpoint:
+                batch = [item for item in batch if not self._is_committed(item)]
+            if not self.use_fuzzy_match or self.plan is not None:
+                self._prefetch_tracks(batch)
+            
+            for item in batch:
+                if self._stopped:
+                    return
+                self.total_tracks += 1
+                print(f"\n[{self.total_tracks}] ", end="")
+                yield item
+    
+    def _is_committed(self, item: Union[TrackMapping, CSVRowError]) -> bool:
+        """Check whether an earlier run already wrote a row (counting it if so)."""
+        if not isinstance(item, TrackMapping):
+            return False
+        entry = self.checkpoint.get(item)
+        if entry is None or entry.status != COMMITTED:
+            return False
+        self.resumed_count += 1
+        return True
+    
+    def _iter_results(
+        self,
+        rows: Iterable[Union[TrackMapping, CSVRowError]]
+    ) -> Iterator[LinkResult]:
+        """Process rows one after the other, converting inline."""
+        for item in self._iter_rows(rows):
+            if isinstance(item, CSVRowError):
+                yield self._row_error_result(item)
+            else:
+                yield self._process_track(item)
+    
+    def _iter_conversion_jobs(
+        self,
+        rows: Iterable[Union[TrackMapping, CSVRowError]],
+        results: List[LinkResult]
+    ) -> Iterator[ConversionJob]:
+        """Process rows up to conversion, yielding the conversions to run.
+        
+        Rows that end before conversion (or need none) are finished and
+        recorded right away; the caller writes the rest once their
+        conversion completes.
+        """
+        for item in self._iter_rows(rows):
+            if isinstance(item, CSVRowError):
+                self._record_result(results, self._row_error_result(item))
+                continue
+            
+            job = LinkJob(mapping=item)
+            result = self._match_stage(job)
+            if result is None:
+                result = self._validate_stage(job)
+            if result is None:
+                conversion = self._convert_stage(job)
+                if conversion is not None:
+                    yield conversion
+                    continue
+                result = self._write_stage(job)
+            self._record_result(results, result)
+    
+    def _execute_pipeline(
+        self,
+        rows: Iterable[Union[TrackMapping, CSVRowError]],
+        results: List[LinkResult]
+    ) -> None:
+        """Process rows in concurrent stages connected by bounded queues.
+        
+        Reading the CSV (with its file checks) and matching each run in a
+        thread of their own. Validation needs database lookups and writes
+        need the one connection, so both stay on this thread, which is also
+        the single writer. Conversions run on convert_many's workers, so a
+        slow conversion only holds up its own row. Each row's output is
+        buffered and printed in one piece when the row finishes.
+        
+        Args:
+            rows: Parsed CSV rows (already limited)
+            results: List the finished rows' results are added to
+        """
+        converting = bool(self.audio_converter and self.convert_format and not self.dry_run)
+        self.stage_stats = {name: StageStats(name) for name in PIPELINE_STAGES}
+        if converting:
+            # Same default as convert_many
+            self.stage_stats["convert"].workers = max(1, self.conversion_workers or os.cpu_count() or 1)
+        
+        stop = threading.Event()
+        parsed: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        matched: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        output = RowOutput(sys.stdout)
+        threads = [
+            StageThread("read", lambda: self._pipeline_read(rows, parsed, stop)),
+            StageThread("match", lambda: self._pipeline_match(parsed, matched, stop, output)),
+        ]
+        
+        started = time.perf_counter()
+        try:
+            with redirect_stdout(output):
+                for thread in threads:
+                    thread.start()
+                try:
+                    conversions = self._pipeline_validate(matched, stop, results, output)
+                    if converting:
+                        for conversion_job, conv_result in self.audio_converter.convert_many(
+                            conversions, max_workers=self.conversion_workers
+                        ):
+                            job = conversion_job.context
+                            self.stage_stats["convert"].items += 1
+                            self.stage_stats["convert"].busy += conv_result.seconds
+                            with output.capture(job.output):
+                                self._apply_conversion(job, conv_result)
+                            self._pipeline_write(results, job, output)
+                    else:
+                        # Nothing is yielded without conversions; rows are written as validated
+                        for _ in conversions:
+                            pass
+                finally:
+                    stop.set()
+                    for thread in threads:
+                        thread.join()
+            
+            for thread in threads:
+                if thread.error is not None:
+                    raise thread.error
+        except BaseException:
+            # Rows validated (and converted) before the failure are still
+            # written, as execute() would have done had the run finished
+            print("\n✗ Pipeline stage failed")
+            self._commit_pending_updates()
+            raise
+        finally:
+            self.pipeline_seconds = time.perf_counter() - started
+    
+    def _pipeline_read(
+        self,
+        rows: Iterable[Union[TrackMapping, CSVRowError]],
+        parsed: queue.Queue,
+        stop: threading.Event
+    ) -> None:
+        """Pipeline stage: parse CSV rows (resolving their files) onto a queue."""
+        stats = self.stage_stats["read"]
+        try:
+            iterator = iter(rows)
+            while not stop.is_set():
+                started = time.perf_counter()
+                item = next(iterator, DONE)
+                if item is DONE:
+                    break
+                stats.add(started)
+                if self.resume and self.checkpoint and self._is_committed(item):
+                    continue
+                if not send(parsed, item, stop):
+                    break
+        finally:
+            send(parsed, DONE, stop)
+    
+    def _pipeline_match(
+        self,
+        parsed: queue.Queue,
+        matched: queue.Queue,
+        stop: threading.Event,
+        output: RowOutput
+    ) -> None:
+        """Pipeline stage: match parsed rows to database tracks.
+        
+        Queues (job, result, output buffer) tuples; result is the row's
+        final result if it ended here, job is None for unparseable rows.
+        """
+        stats = self.stage_stats["match"]
+        try:
+            while True:
+                item = receive(parsed, stop)
+                if item is DONE:
+                    break
+                
+                started = time.perf_counter()
+                buffer = io.StringIO()
+                self.total_tracks += 1
+                with output.capture(buffer):
+                    print(f"\n[{self.total_tracks}] ", end="")
+                    if isinstance(item, CSVRowError):
+                        job, result = None, self._row_error_result(item)
+                    else:
+                        job = LinkJob(mapping=item, output=buffer)
+                        result = self._match_stage(job)
+                stats.add(started)
+                
+                if not send(matched, (job, result, buffer), stop):
+                    break
+        finally:
+            send(matched, DONE, stop)
+    
+    def _pipeline_validate(
+        self,
+        matched: queue.Queue,
+        stop: threading.Event,
+        results: List[LinkResult],
+        output: RowOutput
+    ) -> Iterator[ConversionJob]:
+        """Pipeline stage: validate matched rows against the database and files.
+        
+        Tracks are prefetched for all rows waiting in the queue at once.
+        Rows ending here are recorded, rows needing no conversion are
+        written right away, and the conversions of the rest are yielded.
+        Stops after the first error in strict mode.
+        """
+        stats = self.stage_stats["validate"]
+        while not self._stopped:
+            batch = receive_batch(matched, PROCESS_BATCH_SIZE, stop)
+            finished = batch[-1] is DONE
+            if finished:
+                batch.pop()
+            
+            started = time.perf_counter()
+            if not self.use_fuzzy_match or self.plan is not None:
+                self._prefetch_tracks([job.mapping for job, _, _ in batch if job is not None])
+            
+            for job, result, buffer in batch:
+                if self._stopped:
+                    return
+                
+                conversion = None
+                if result is None:
+                    with output.capture(buffer):
+                        result = self._validate_stage(job)
+                        if result is None:
+                            conversion = self._convert_stage(job)
+                stats.add(started)
+                
+                if conversion is not None:
+                    yield conversion
+                elif result is None:
+                    self._pipeline_write(results, job, output)
+                else:
+                    with output.capture(buffer):
+                        self._record_result(results, result)
+                    output.emit(buffer)
+                started = time.perf_counter()
+            
+            if finished:
+                return
+    
+    def _pipeline_write(self, results: List[LinkResult], job: LinkJob, output: RowOutput) -> None:
+        """Pipeline stage: queue a row's database update and print the row."""
+        started = time.perf_counter()
+        with output.capture(job.output):
+            self._record_result(results, self._write_stage(job))
+        self.stage_stats["write"].add(started)
+        output.emit(job.output)
+    
+    def _record_result(self, results: List[LinkResult], result: LinkResult) -> None:
+        """Add a result and update statistics (stopping on errors in strict mode)."""
+        results.append(result)
+        
+        if result.success:
+            self.updated_count += 1
+        elif result.action == 'skipped':
+            self.skipped_count += 1
+        else:  # error
+            self.error_count += 1
+            
+            # Fail fast if strict mode
+            if self.strict and not self._stopped:
+                print("\n\n✗ Stopping due to error (strict mode)")
+                self._stopped = True
+        
+        # Commit in batches so the checkpoint never runs far ahead of the database
+        if self.checkpoint and len(self.pending_updates) >= CHECKPOINT_COMMIT_SIZE:
+            self._flush_pending_updates()
+    
+    def _prefetch_tracks(self, batch: List[Union[TrackMapping, CSVRowError]]) -> None:
+        """Fetch the database tracks referenced by a batch in one lookup.
+        
+        Args:
+            batch: Parsed CSV rows
+        """
+        track_ids = [
+            item.rekordbox_id for item in batch
+            if isinstance(item, TrackMapping) and item.rekordbox_id
+            and item.rekordbox_id not in self.db_tracks_cache
+        ]
+        if track_ids:
+            self.db_tracks_cache.update(self.adapter.get_tracks_by_ids(track_ids))
+    
+    def _row_error_result(self, error: CSVRowError) -> LinkResult:
+        """Turn an unparseable CSV row into an error result.
+        
+        Args:
+            error: Row error from the CSV parser
+            
+        Returns:
+            LinkResult with action 'error'
+        """
+        print(f"✗ Row {error.row_num}: {error.artist} - {error.title}")
+        print(f"   Error: {error.message}")
+        return LinkResult(
+            track_mapping=TrackMapping(
+                artist=error.artist,
+                title=error.title,
+                file_path=Path(error.file_path),
+                row_num=error.row_num
+            ),
+            success=False,
+            action='error',
+            reason=error.message
+        )
+    
     def _process_track(self, mapping: TrackMapping) -> LinkResult:
         """Process a single track mapping.
         
+        Runs the match, validate, convert and write stages; the first stage
+        producing a result (skip or error) ends processing.
+        
         Args:
             mapping: TrackMapping object
             
         Returns:
             LinkResult object
         """
+        job = LinkJob(mapping=mapping)
+        
+        result = self._match_stage(job)
+        if result is None:
+            result = self._validate_stage(job)
+        if result is None:
+            conversion = self._convert_stage(job)
+            if conversion is not None:
+                self._apply_conversion(job, self.audio_converter.convert(
+                    source_path=conversion.source_path,
+                    target_format=conversion.target_format,
+                    output_dir=conversion.output_dir,
+                    preserve_original=conversion.preserve_original,
+                    overwrite=conversion.overwrite
+                ))
+            result = self._write_stage(job)
+        return result
+    
+    def _match_stage(self, job: LinkJob) -> Optional[LinkResult]:
+        """Step 1: Find the track in the database.
+        
+        Args:
+            job: Track being processed; track_id is set on success
+            
+        Returns:
+            Skip/error result, or None to continue
+        """
+        mapping = job.mapping
         artist_title = f"{mapping.artist} - {mapping.title}"
         
-        # Step 1: Find track in database
+        if self.plan is not None:
+            # Matched by the dry run
+            print(f"→ {artist_title}")
+            job.track_id = mapping.rekordbox_id
+            return None
+        
         if self.use_fuzzy_match:
             # Fuzzy matching
             match_candidate = self.fuzzy_matcher.find_best_match(
                 mapping.artist,
                 mapping.title,
-                self.streaming_tracks_cache
+                self.streaming_track_index
             )
             
             if not match_candidate:
@@ -221,8 +697,25 @@ class LinkLocalService:
             track_id = mapping.rekordbox_id
             print(f"→ {artist_title}")
         
+        job.track_id = track_id
+        return None
+    
+    def _validate_stage(self, job: LinkJob) -> Optional[LinkResult]:
+        """Steps 2-5: Check the database track and the local file.
+        
+        Args:
+            job: Track being processed (matched)
+            
+        Returns:
+            Skip/error result, or None to continue
+        """
+        mapping = job.mapping
+        track_id = job.track_id
+        
         # Step 2: Validate track exists
-        db_track = self.adapter.get_track_by_id(track_id)
+        db_track = self.db_tracks_cache.get(int(track_id))
+        if db_track is None:
+            db_track = self.adapter.get_track_by_id(track_id)
         if not db_track:
             print(f"   ✗ Error: Track ID {track_id} not found in database")
             return LinkResult(
@@ -233,6 +726,18 @@ class LinkLocalService:
                 db_track_id=track_id
             )
         
+        # Step 2b: Another row of this run already links the track
+        linked_row = self.linked_rows.get(int(track_id))
+        if linked_row is not None:
+            print(f"   ⊘ Skipped: Already linked by row {linked_row}")
+            return LinkResult(
+                track_mapping=mapping,
+                success=False,
+                action='skipped',
+                reason='Already linked in this run',
+                db_track_id=track_id
+            )
+        
         # Step 3: Check if already local
         if not db_track.is_streaming and not self.force:
             print(f"   ⊘ Skipped: Already local")
@@ -269,118 +774,262 @@ class LinkLocalService:
                 db_track_id=track_id
             )
         
-        # Step 5.5: Audio conversion (if needed)
-        file_path_to_use = mapping.normalized_path
-        file_size_to_use = mapping.file_size
-        converted = False
-        conversion_format = None
+        # Step 5b: With a plan, the file must be the one that was reviewed
+        planned = self.plan_entries.get(mapping.row_num)
+        if planned is not None and planned.source_changed():
+            print(f"   ✗ Error: File changed since the plan was made: {mapping.normalized_path}")
+            return LinkResult(
+                track_mapping=mapping,
+                success=False,
+                action='error',
+                reason='File changed since plan',
+                db_track_id=track_id
+            )
+        
+        self.linked_rows[int(track_id)] = mapping.row_num
+        return None
+    
+    def _convert_stage(self, job: LinkJob) -> Optional[ConversionJob]:
+        """Step 5.5: Audio conversion (if needed).
+        
+        Sets the file to link on the job to the original file; a conversion
+        that has to run is returned instead of being run here, and
+        _apply_conversion switches the job to the converted file.
         
-        if self.audio_converter and self.convert_format:
-            source_path = Path(mapping.file_path)
+        Args:
+            job: Track being processed (validated)
             
-            # Check if source format matches convert_from filter (if specified)
-            should_convert = True
-            if self.convert_from_formats:
-                source_ext = source_path.suffix.lstrip(".").lower()
-                # Normalize aiff/aif
-                if source_ext in ("aif", "aiff"):
-                    source_ext = "aiff"
-                # Normalize m4a/aac
-                if source_ext in ("m4a", "aac"):
-                    source_ext = "aac"
-                
-                should_convert = source_ext in self.convert_from_formats
-                
-                if not should_convert:
-                    print(f"   ℹ Skipping conversion (source format {source_ext.upper()} not in filter)")
+        Returns:
+            ConversionJob to run (with the LinkJob as context), or None
+        """
+        mapping = job.mapping
+        job.file_path = mapping.normalized_path
+        job.file_size = mapping.file_size
+        
+        if not (self.audio_converter and self.convert_format):
+            return None
+        
+        if self._resume_conversion(job):
+            return None
+        
+        source_path = Path(mapping.file_path)
+        
+        if self.plan is not None:
+            # The dry run decided which files need converting
+            planned = self.plan_entries.get(mapping.row_num)
+            if planned is None or planned.convert_format != self.convert_format:
+                print("   ℹ No conversion planned")
+                return None
+            print(f"   🔄 Converting to {self.convert_format.upper()}...")
+            return self._conversion_job(job, source_path)
+        
+        # Check if source format matches convert_from filter (if specified)
+        should_convert = True
+        if self.convert_from_formats:
+            source_ext = source_path.suffix.lstrip(".").lower()
+            # Normalize aiff/aif
+            if source_ext in ("aif", "aiff"):
+                source_ext = "aiff"
+            # Normalize m4a/aac
+            if source_ext in ("m4a", "aac"):
+                source_ext = "aac"
             
-            if should_convert and self.audio_converter.is_conversion_needed(source_path, self.convert_format):
-                print(f"   🔄 Converting to {self.convert_format.upper()}...")
-                
-                if self.dry_run:
-                    print(f"      Would convert: {source_path.name} → {source_path.stem}.{self.convert_format}")
-                    converted = True
-                    conversion_format = self.convert_format
-                else:
-                    # Perform conversion
-                    conv_result = self.audio_converter.convert(
-                        source_path=source_path,
-                        target_format=self.convert_format,
-                        output_dir=self.conversion_output_dir,
-                        preserve_original=True,
-                        overwrite=False
-                    )
-                    
-                    if conv_result.success:
-                        # Use converted file
-                        file_path_to_use = str(conv_result.output_path)
-                        file_size_to_use = conv_result.output_path.stat().st_size
-                        converted = True
-                        conversion_format = self.convert_format
-                        print(f"      ✓ Converted: {conv_result.output_path.name}")
-                    else:
-                        # Conversion failed - decide whether to proceed with original
-                        print(f"      ⚠ Conversion failed: {conv_result.error_message}")
-                        print(f"      → Using original file instead")
+            should_convert = source_ext in self.convert_from_formats
+            
+            if not should_convert:
+                print(f"   ℹ Skipping conversion (source format {source_ext.upper()} not in filter)")
+        
+        if should_convert and self.audio_converter.is_conversion_needed(source_path, self.convert_format):
+            print(f"   🔄 Converting to {self.convert_format.upper()}...")
+            
+            if self.dry_run:
+                print(f"      Would convert: {source_path.name} → {source_path.stem}.{self.convert_format}")
+                job.converted = True
+                job.conversion_format = self.convert_format
             else:
-                print(f"   ℹ No conversion needed (already {self.convert_format.upper()})")
+                return self._conversion_job(job, source_path)
+        else:
+            print(f"   ℹ No conversion needed (already {self.convert_format.upper()})")
+        
+        return None
+    
+    def _conversion_job(self, job: LinkJob, source_path: Path) -> ConversionJob:
+        """Build the conversion of a job's source file."""
+        return ConversionJob(
+            source_path=source_path,
+            target_format=self.convert_format,
+            output_dir=self.conversion_output_dir,
+            preserve_original=True,
+            overwrite=False,
+            context=job
+        )
+    
+    def _resume_conversion(self, job: LinkJob) -> bool:
+        """Reuse a conversion an interrupted run finished but did not write.
+        
+        Args:
+            job: Track being processed (validated)
+            
+        Returns:
+            True if the job now links the checkpointed output
+        """
+        if not (self.resume and self.checkpoint):
+            return False
+        
+        entry = self.checkpoint.get(job.mapping)
+        if (
+            entry is None or entry.status != CONVERTED or not entry.output_path
+            or entry.conversion_format != self.convert_format
+        ):
+            return False
+        
+        output_path = Path(entry.output_path)
+        try:
+            if output_path.stat().st_size != entry.output_size:
+                return False
+        except OSError:
+            return False
+        
+        job.file_path = entry.output_path
+        job.file_size = entry.output_size
+        job.converted = True
+        job.conversion_format = self.convert_format
+        print(f"   ✓ Reusing conversion from checkpoint: {output_path.name}")
+        return True
+    
+    def _apply_conversion(
+        self,
+        job: LinkJob,
+        conv_result: ConversionResult,
+        background: bool = False
+    ) -> None:
+        """Use the converted file for a job, or keep the original on failure.
+        
+        Args:
+            job: Track whose conversion finished
+            conv_result: Result of the conversion
+            background: Conversion ran alongside other rows (name the track again)
+        """
+        if background:
+            print(f"\n   [{job.mapping.artist} - {job.mapping.title}]")
+        
+        if conv_result.success:
+            # Use converted file
+            job.file_path = str(conv_result.output_path)
+            job.file_size = conv_result.output_path.stat().st_size
+            job.converted = True
+            job.conversion_format = self.convert_format
+            if self.checkpoint and not self.dry_run:
+                self.checkpoint.record([self._checkpoint_entry(job.mapping, job.track_id, CONVERTED, job)])
+            if conv_result.cached:
+                print(f"      ✓ Reused earlier conversion: {conv_result.output_path.name}")
+            else:
+                print(f"      ✓ Converted: {conv_result.output_path.name}")
+        else:
+            # Conversion failed - decide whether to proceed with original
+            print(f"      ⚠ Conversion failed: {conv_result.error_message}")
+            print("      → Using original file instead")
+    
+    def _write_stage(self, job: LinkJob) -> LinkResult:
+        """Step 6: Update database (if not dry-run).
+        
+        Args:
+            job: Track being processed (converted)
+            
+        Returns:
+            Success result ('updated' or 'converted')
+        """
+        result = LinkResult(
+            track_mapping=job.mapping,
+            success=True,
+            action='converted' if job.converted else 'updated',
+            db_track_id=job.track_id,
+            confidence=job.mapping.match_confidence,
+            converted=job.converted,
+            conversion_format=job.conversion_format,
+            file_path=str(job.file_path),
+            file_size=job.file_size
+        )
         
-        # Step 6: Update database (if not dry-run)
         if self.dry_run:
-            print(f"   → Would update: {file_path_to_use}")
+            print(f"   → Would update: {job.file_path}")
             if self.force_reanalyze:
                 print(f"   → Would mark for re-analysis")
-            action = 'converted' if converted else 'updated'
-            return LinkResult(
-                track_mapping=mapping,
-                success=True,
-                action=action,
-                db_track_id=track_id,
-                confidence=mapping.match_confidence,
-                converted=converted,
-                conversion_format=conversion_format
-            )
-        else:
-            success = self.adapter.update_track_to_local(
-                track_id,
-                file_path_to_use,
-                file_size_to_use
-            )
-            
-            if success:
-                print(f"   ✓ Updated: {file_path_to_use}")
-                action = 'converted' if converted else 'updated'
-                if converted:
+            return result
+        
+        # Queue the write; updates are committed together after the loop
+        # (or every CHECKPOINT_COMMIT_SIZE rows when checkpointing)
+        self.pending_updates.append((result, LocalLinkUpdate(
+            track_id=job.track_id,
+            file_path=job.file_path,
+            file_size=job.file_size,
+            reanalyze=self.force_reanalyze
+        )))
+        print(f"   ✓ Queued update: {job.file_path}")
+        if self.force_reanalyze:
+            print("   ✓ Will be re-analyzed when Rekordbox opens")
+        return result
+    
+    def _checkpoint_entry(
+        self,
+        mapping: TrackMapping,
+        track_id: Optional[int],
+        status: str,
+        job: Optional[LinkJob] = None
+    ) -> CheckpointEntry:
+        """Build the checkpoint line for a row (with its conversion output, if any)."""
+        row_num, file_path = mapping_key(mapping)
+        entry = CheckpointEntry(row_num=row_num, file_path=file_path, track_id=track_id, status=status)
+        if job is not None and job.converted:
+            entry.output_path = str(job.file_path)
+            entry.output_size = job.file_size
+            entry.conversion_format = job.conversion_format or ""
+        return entry
+    
+    def _commit_pending_updates(self) -> None:
+        """Flush queued updates, counting the time as the write stage's."""
+        if not self.pending_updates:
+            return
+        started = time.perf_counter()
+        self._flush_pending_updates()
+        if self.stage_stats:
+            self.stage_stats["write"].busy += time.perf_counter() - started
+    
+    def _flush_pending_updates(self) -> None:
+        """Write all queued updates to the database in one transaction.
+        
+        On failure nothing is written, and every queued result is turned
+        into an error. Committed rows are recorded in the checkpoint.
+        """
+        count = len(self.pending_updates)
+        print(f"\n\nWriting {count} track update(s) to database...")
+        
+        if self.adapter.apply_link_batch([update for _, update in self.pending_updates]):
+            print(f"✓ Committed {count} update(s) in one transaction")
+            for result, update in self.pending_updates:
+                if result.converted:
                     self.converted_count += 1
-                
-                # Step 7: Force re-analysis (if enabled)
-                if self.force_reanalyze:
-                    print(f"   🔄 Marking for re-analysis...")
-                    reanalyze_success = self.adapter.force_reanalyze(track_id)
-                    if reanalyze_success:
-                        print(f"   ✓ Will be re-analyzed when Rekordbox opens")
-                        self.reanalyzed_count += 1
-                    else:
-                        print(f"   ⚠ Could not mark for re-analysis: {self.adapter.error_message}")
-                
-                return LinkResult(
-                    track_mapping=mapping,
-                    success=True,
-                    action=action,
-                    db_track_id=track_id,
-                    confidence=mapping.match_confidence,
-                    converted=converted,
-                    conversion_format=conversion_format
-                )
-            else:
-                print(f"   ✗ Error: {self.adapter.error_message}")
-                return LinkResult(
-                    track_mapping=mapping,
-                    success=False,
-                    action='error',
-                    reason=self.adapter.error_message,
-                    db_track_id=track_id
-                )
+                if update.reanalyze:
+                    self.reanalyzed_count += 1
+            if self.checkpoint:
+                self.checkpoint.record([
+                    self._checkpoint_entry(result.track_mapping, update.track_id, COMMITTED)
+                    for result, update in self.pending_updates
+                ])
+        else:
+            print(f"✗ Error: {self.adapter.error_message}")
+            print("  No changes were written")
+            for result, _ in self.pending_updates:
+                result.success = False
+                result.action = 'error'
+                result.reason = self.adapter.error_message
+            self.updated_count -= count
+            self.error_count += count
+            if self.strict and not self._stopped:
+                print("\n✗ Stopping due to error (strict mode)")
+                self._stopped = True
+        
+        self.pending_updates = []
     
     def _print_summary(self, results: List[LinkResult]):
         """Print summary of results.
@@ -395,12 +1044,23 @@ class LinkLocalService:
         print(f"Skipped: {self.skipped_count}")
         print(f"Errors: {self.error_count}")
         
+        if self.resumed_count > 0:
+            print(f"Already written by the interrupted run: {self.resumed_count}")
+        
         if self.converted_count > 0:
             print(f"Converted: {self.converted_count}")
         
         if self.reanalyzed_count > 0:
             print(f"Marked for re-analysis: {self.reanalyzed_count}")
         
+        if self.stage_stats:
+            print(f"\nPipeline stages ({self.pipeline_seconds:.1f}s total):")
+            for stats in self.stage_stats.values():
+                if stats.items:
+                    workers = f" ({stats.workers} workers)" if stats.workers > 1 else ""
+                    print(f"  - {stats.name:<8} {stats.items:>6} row(s) in {stats.busy:7.2f}s busy, "
+                          f"{stats.rate:8.1f} rows/s{workers}")
+        
         if self.use_fuzzy_match and self.updated_count > 0:
             high_conf = sum(1 for r in results if r.confidence and r.confidence >= 0.9)
             med_conf = sum(1 for r in results if r.confidence and 0.75 <= r.confidence < 0.9)
@@ -410,6 +1070,60 @@ class LinkLocalService:
         
         if self.dry_run:
             print(f"\nDatabase updates: NOT APPLIED (dry-run)")
-            print(f"Use --apply to execute changes.")
+            if self.plan_path:
+                print(f"Use --apply-plan {self.plan_path} to execute these changes.")
+            else:
+                print("Use --apply to execute changes.")
         else:
             print(f"\nDatabase updates: APPLIED")
+            journal = self.adapter.journal
+            if isinstance(journal, UndoJournal) and self.updated_count > 0:
+                print(f"To revert: dj-tool rekordbox-undo --run {journal.run_id}")
+    
+    def _save_plan(self, results: List[LinkResult]) -> None:
+        """Save a dry run's results as a plan for --apply-plan.
+        
+        Args:
+            results: Results of the dry run
+        """
+        entries = []
+        for result in results:
+            mapping = result.track_mapping
+            entry = PlanEntry(
+                row_num=mapping.row_num,
+                artist=mapping.artist,
+                title=mapping.title,
+                source_path=str(mapping.file_path),
+                action=result.action,
+                reason=result.reason,
+                track_id=result.db_track_id,
+                confidence=result.confidence
+            )
+            if result.success:
+                entry.file_path = result.file_path
+                entry.convert_format = result.conversion_format if result.converted else None
+                try:
+                    stat = Path(result.file_path).stat()
+                    entry.file_size = stat.st_size
+                    entry.source_mtime_ns = stat.st_mtime_ns
+                except OSError:
+                    # Gone since validation; --apply-plan will report it
+                    pass
+            entries.append(entry)
+        
+        database = getattr(self.adapter, "db_path", None)
+        plan = LinkPlan(
+            csv_path=str(self.csv_path),
+            settings={key: getattr(self, key) for key in PLAN_SETTINGS},
+            entries=entries,
+            database=str(database) if database else None
+        )
+        if plan.settings["conversion_output_dir"] is not None:
+            plan.settings["conversion_output_dir"] = str(plan.settings["conversion_output_dir"])
+        
+        try:
+            plan.save(self.plan_path)
+        except OSError as e:
+            print(f"\n✗ Failed to save plan: {e}")
+            return
+        print(f"\n✓ Plan saved: {self.plan_path} ({len(plan.writes)} update(s))")
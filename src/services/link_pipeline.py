@@ -0,0 +1,144 @@
+"""Building blocks for the staged link-local pipeline.
+
+LinkLocalService's pipeline runs its stages (reading, matching, validation,
+conversion, database writes) at the same time, handing rows from one stage
+to the next through bounded queues. This module holds the pieces that do
+not depend on the service: queue hand-off that gives up once the run is
+stopped, stage threads that report their errors, per-stage throughput, and
+per-row buffering of printed output so rows processed concurrently are
+still printed as whole blocks.
+"""
+
+import io
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, TextIO
+
+# Rows waiting between two stages
+PIPELINE_QUEUE_SIZE = 64
+
+# Seconds between checks of the stop flag while a queue is full or empty
+_POLL_INTERVAL = 0.1
+
+# End-of-stream marker passed down the queues
+DONE = object()
+
+
+def send(q: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Put an item on a queue, waiting for room unless the run is stopped.
+
+    Returns:
+        False if the run was stopped before the item could be queued
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def receive(q: "queue.Queue[Any]", stop: threading.Event) -> Any:
+    """Take an item from a queue, or DONE once the run is stopped."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return DONE
+
+
+def receive_batch(q: "queue.Queue[Any]", size: int, stop: threading.Event) -> List[Any]:
+    """Wait for one item, then take whatever else is ready (up to size).
+
+    A DONE marker, if taken, is always the last item of the batch.
+    """
+    batch = [receive(q, stop)]
+    while batch[-1] is not DONE and len(batch) < size:
+        try:
+            batch.append(q.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+@dataclass
+class StageStats:
+    """Rows handled by one stage and the time spent on them."""
+    name: str
+    items: int = 0
+    busy: float = 0.0  # Seconds of work, summed over the stage's workers
+    workers: int = 1
+
+    def add(self, started: float) -> None:
+        """Count a row whose work started at started (perf_counter) and just ended."""
+        self.items += 1
+        self.busy += time.perf_counter() - started
+
+    @property
+    def rate(self) -> float:
+        """Rows per second of work, across all workers."""
+        return self.items * self.workers / self.busy if self.busy > 0 else 0.0
+
+
+class StageThread(threading.Thread):
+    """Runs one pipeline stage, keeping any exception for the caller."""
+
+    def __init__(self, name: str, target: Callable[[], None]):
+        super().__init__(name=f"link-local-{name}", daemon=True)
+        self._stage = target
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self._stage()
+        except BaseException as e:  # Re-raised by the consuming thread
+            self.error = e
+
+
+class RowOutput:
+    """Stand-in for sys.stdout that buffers output per row.
+
+    While a thread works on a row inside capture(), its prints go to that
+    row's buffer; emit() writes the finished row in one piece. Output from
+    threads not capturing goes straight to the real stream.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        with self._lock:
+            return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+    @contextmanager
+    def capture(self, buffer: io.StringIO) -> Iterator[None]:
+        """Send the current thread's output to a row's buffer."""
+        previous = getattr(self._local, "buffer", None)
+        self._local.buffer = buffer
+        try:
+            yield
+        finally:
+            self._local.buffer = previous
+
+    def emit(self, buffer: io.StringIO) -> None:
+        """Print a finished row's buffered output."""
+        with self._lock:
+            self.stream.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
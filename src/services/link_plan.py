@@ -0,0 +1,134 @@
+"""Link plans: the outcome of a link-local dry run, saved for --apply-plan.
+
+A dry run does the expensive work (CSV parsing, path resolution, fuzzy
+matching against every streaming track). Saving its results as a plan lets
+``--apply-plan`` write exactly the reviewed links without recomputing them.
+Each planned link records the source file's size and mtime, so files
+changed since the review are refused instead of silently linked.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lib.csv_parser import TrackMapping
+
+PLAN_VERSION = 1
+
+# Planned actions that write to the database
+WRITE_ACTIONS = ("updated", "converted")
+
+# LinkLocalService settings stored in a plan and reused by --apply-plan
+PLAN_SETTINGS = (
+    "use_fuzzy_match",
+    "match_threshold",
+    "allow_mismatch",
+    "force",
+    "convert_format",
+    "convert_from_formats",
+    "conversion_output_dir",
+    "force_reanalyze",
+)
+
+
+@dataclass
+class PlanEntry:
+    """One reviewed CSV row."""
+    row_num: int
+    artist: str
+    title: str
+    source_path: str  # File path as given in the CSV
+    action: str  # 'updated', 'converted', 'skipped' or 'error'
+    reason: Optional[str] = None
+    track_id: Optional[int] = None
+    file_path: Optional[str] = None  # Resolved file to link (before conversion)
+    file_size: int = 0
+    source_mtime_ns: int = 0
+    convert_format: Optional[str] = None  # Conversion to run before linking
+    confidence: Optional[float] = None
+
+    @property
+    def writes(self) -> bool:
+        return self.action in WRITE_ACTIONS
+
+    def to_mapping(self) -> TrackMapping:
+        """Rebuild the row's mapping from the planned values.
+
+        The file is stat'ed again, so a file removed since the dry run shows
+        up as missing.
+        """
+        mapping = TrackMapping(
+            artist=self.artist,
+            title=self.title,
+            file_path=Path(self.source_path),
+            rekordbox_id=self.track_id,
+            normalized_path=Path(self.file_path) if self.file_path else None,
+            match_confidence=self.confidence,
+            row_num=self.row_num,
+        )
+        if mapping.normalized_path is not None:
+            try:
+                mapping.file_size = os.stat(mapping.normalized_path).st_size
+                mapping.file_exists = True
+            except OSError:
+                pass
+        return mapping
+
+    def source_changed(self) -> bool:
+        """Check whether the file to link differs from the reviewed one."""
+        try:
+            stat = os.stat(self.file_path)
+        except (OSError, TypeError):
+            return True
+        return stat.st_size != self.file_size or stat.st_mtime_ns != self.source_mtime_ns
+
+
+@dataclass
+class LinkPlan:
+    """Reviewed link-local run."""
+    csv_path: str
+    settings: Dict[str, Any]
+    entries: List[PlanEntry] = field(default_factory=list)
+    database: Optional[str] = None  # Database the plan was made against
+    created: str = field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    @property
+    def writes(self) -> List[PlanEntry]:
+        """Entries that update the database, in CSV order."""
+        return [entry for entry in self.entries if entry.writes]
+
+    def save(self, path: Path) -> None:
+        """Write the plan (atomically, so a partial plan is never applied)."""
+        path = Path(path)
+        data = {"version": PLAN_VERSION, **asdict(self)}
+        partial = path.with_name(path.name + ".partial")
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "LinkPlan":
+        """Read a plan written by save.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a plan of a supported version
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if not isinstance(data, dict) or data.get("version") != PLAN_VERSION:
+            raise ValueError(f"{path} is not a link plan (version {PLAN_VERSION})")
+        try:
+            return cls(
+                csv_path=data["csv_path"],
+                settings={key: data["settings"].get(key) for key in PLAN_SETTINGS},
+                entries=[PlanEntry(**entry) for entry in data["entries"]],
+                database=data.get("database"),
+                created=data.get("created", ""),
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Malformed link plan {path}: {e}") from e
@@ -1,9 +1,13 @@
 """RekordboxAdapter service for database interaction."""
 import os
+import unicodedata
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from models.tag import MyTag
-from models.track import Track
+from models.track import Track, is_streaming_path
+from services.db_backup import BACKUP_RETENTION, BackupResult, DatabaseBackups, copy_file
+from services.undo_journal import JOURNAL_COLUMNS, JournalEntry, UndoJournal, default_journal_path
 
 try:
     from pyrekordbox import Rekordbox6Database
@@ -12,6 +16,76 @@ except ImportError:
     PYREKORDBOX_AVAILABLE = False
     Rekordbox6Database = None
 
+# Keep IN (...) lists below SQLite's default host parameter limit
+ID_LOOKUP_CHUNK_SIZE = 500
+
+# Rows pulled from the cursor at a time when reading tracks
+TRACK_FETCH_SIZE = 1000
+
+# Projection of the columns a Track is built from. The artist name is
+# joined from djmdArtist and the MyTag IDs are aggregated from
+# djmdSongMyTag, so reading tracks never goes through pyrekordbox's lazy
+# ORM relationships (one extra SELECT per row). Extra conditions are
+# appended with AND.
+TRACK_SELECT_SQL = """
+    SELECT c.ID, c.Title, a.Name, c.FolderPath, c.FileSize, c.ServiceID,
+        (SELECT GROUP_CONCAT(s.MyTagID) FROM djmdSongMyTag s
+         WHERE s.ContentID = c.ID) AS MyTagIDs
+    FROM djmdContent c
+    LEFT JOIN djmdArtist a ON a.ID = c.ArtistID
+    WHERE c.ID IS NOT NULL
+"""
+
+# One TRACK_SELECT_SQL row: ID, Title, artist name, FolderPath, FileSize,
+# ServiceID and comma-separated MyTag IDs
+TrackRow = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[int],
+                 Optional[int], Optional[str]]
+
+
+# Point a track at a local file and clear its streaming flag
+LINK_LOCAL_SQL = """
+    UPDATE djmdContent 
+    SET FolderPath = ?,
+        FileSize = ?,
+        ServiceID = 0
+    WHERE ID = ?
+"""
+
+# Clear analysis data so Rekordbox re-analyzes the track.
+# Fields that exist in Rekordbox 6 database:
+# - AnalysisDataPath: Path to .DAT/.EXT files
+# - Analysed: Flag indicating if track has been analyzed (0 = not analyzed)
+# - SearchStr: Cached search string
+# - AnalysisUpdated: Timestamp of last analysis update
+REANALYZE_SQL = """
+    UPDATE djmdContent 
+    SET AnalysisDataPath = '',
+        Analysed = 0,
+        SearchStr = '',
+        AnalysisUpdated = ''
+    WHERE ID = ?
+"""
+
+# Read the undo journal's columns of some rows ({} takes the placeholders)
+JOURNAL_SELECT_SQL = (
+    "SELECT ID, " + ", ".join(JOURNAL_COLUMNS) + " FROM djmdContent WHERE ID IN ({})"
+)
+
+# Put a row's journaled columns back to earlier values
+RESTORE_SQL = (
+    "UPDATE djmdContent SET " + ", ".join(f"{column} = ?" for column in JOURNAL_COLUMNS)
+    + " WHERE ID = ?"
+)
+
+
+@dataclass
+class LocalLinkUpdate:
+    """A pending update pointing one streaming track at a local file."""
+    track_id: int
+    file_path: Union[str, Path]
+    file_size: int
+    reanalyze: bool = False  # Also clear analysis data
+
 
 class RekordboxAdapter:
     """Adapter for interacting with Rekordbox database via pyrekordbox.
@@ -26,6 +100,13 @@ class RekordboxAdapter:
         self.error_message: str = ""
         self.connected: bool = False
         self.db_path: Optional[str] = None  # Store the database path
+        self.last_backup: Optional[BackupResult] = None
+        
+        # Undo journal for writes (next to the database once connected)
+        self.journal: Optional[UndoJournal] = None
+        
+        # Content snapshot: every DjmdContent row loaded once per connection
+        self._content_snapshot: Optional[Dict[int, Track]] = None
     
     def connect(self, db_path: Optional[str] = None) -> bool:
         """Connect to Rekordbox database.
@@ -41,7 +122,7 @@ class RekordboxAdapter:
             return False
         
         if db_path is None:
-            db_path = self._find_database()
+            db_path = self.find_database()
             if db_path is None:
                 self.error_message = "Database not found - please specify path"
                 return False
@@ -65,7 +146,9 @@ class RekordboxAdapter:
         try:
             self.db = Rekordbox6Database(db_path)
             self.db_path = db_path  # Store the path for later use
+            self.journal = UndoJournal(default_journal_path(Path(db_path)))
             self.connected = True
+            self.invalidate_content_cache()
             return True
         except Exception as e:
             # Check for common warning about Rekordbox running
@@ -76,7 +159,7 @@ class RekordboxAdapter:
                 self.error_message = f"Failed to connect: {str(e)}"
             return False
     
-    def _find_database(self) -> Optional[str]:
+    def find_database(self) -> Optional[str]:
         """Auto-detect Rekordbox database location.
         
         Returns:
@@ -143,46 +226,26 @@ class RekordboxAdapter:
             return []
         
         try:
-            # Convert query to list to properly iterate
-            all_content = list(self.db.get_content())
-            streaming_tracks = []
-            
-            # Common streaming service indicators
-            streaming_services = ['tidal', 'beatport', 'spotify', 'soundcloud', 
-                                 'beatsource', 'apple music', 'youtube']
-            
-            for content in all_content:
-                is_streaming = False
-                
-                # Check if FolderPath is empty or None
-                if not content.FolderPath or content.FolderPath.strip() == "":
-                    is_streaming = True
-                # Check if path contains streaming service names
-                elif content.FolderPath:
-                    folder_lower = content.FolderPath.lower()
-                    for service in streaming_services:
-                        if service in folder_lower:
-                            is_streaming = True
-                            break
-                
-                # Check ServiceID if available (non-zero means streaming)
-                if hasattr(content, 'ServiceID') and content.ServiceID and content.ServiceID != 0:
-                    is_streaming = True
-                
-                if is_streaming:
-                    track = self._content_to_track(content)
-                    streaming_tracks.append(track)
-            
-            return streaming_tracks
+            snapshot = self._get_content_snapshot()
+            return [track for track in snapshot.values() if track.is_streaming]
         except Exception as e:
             self.error_message = f"Failed to load tracks: {str(e)}"
             return []
     
-    def get_tracks_by_mytags(self, tag_ids: List[str]) -> List[Track]:
+    def get_tracks_by_mytags(
+        self,
+        tag_ids: List[str],
+        streaming_only: bool = False
+    ) -> List[Track]:
         """Get tracks that have any of the specified MyTags.
         
+        The tag filter runs in SQLite as a single query over djmdSongMyTag
+        and djmdContent, projecting only the columns the streaming check
+        needs; only the matching rows are turned into Track objects.
+        
         Args:
             tag_ids: List of MyTag IDs (strings) to filter by
+            streaming_only: Only return streaming tracks
             
         Returns:
             List of Track objects with at least one of the tags
@@ -190,27 +253,30 @@ class RekordboxAdapter:
         if not self.connected or self.db is None:
             return []
         
+        wanted = list(dict.fromkeys(str(tid) for tid in tag_ids))  # Ensure all are strings
+        if not wanted:
+            return []
+        
         try:
-            # Use get_my_tag_songs() to get content-tag relationships
-            my_tag_songs = self.db.get_my_tag_songs()
-            
-            # Find content IDs with matching tags (compare as strings)
-            content_ids = set()
-            tag_ids_str = [str(tid) for tid in tag_ids]  # Ensure all are strings
-            for mts in my_tag_songs:
-                if str(mts.MyTagID) in tag_ids_str:
-                    content_ids.add(mts.ContentID)
-            
-            # Get the actual content
-            tracks = []
-            all_content = list(self.db.get_content())  # Get all content once
-            
-            for content in all_content:
-                if content.ID in content_ids:
-                    track = self._content_to_track(content)
-                    tracks.append(track)
-            
-            return tracks
+            placeholders = ", ".join("?" for _ in wanted)
+            query = f"""
+                SELECT c.ID, c.FolderPath, c.ServiceID
+                FROM djmdContent c
+                WHERE c.ID IN (
+                    SELECT s.ContentID FROM djmdSongMyTag s
+                    WHERE s.MyTagID IN ({placeholders})
+                )
+            """
+            # The streaming check runs on the projected columns rather than
+            # in SQL, so it is the same check Track objects get
+            content_ids = [
+                int(content_id)
+                for content_id, folder_path, service_id in self._fetch_rows(query, wanted)
+                if not streaming_only or self._is_streaming_content(folder_path, service_id)
+            ]
+            tracks = self.get_tracks_by_ids(content_ids)
+            
+            return [tracks[cid] for cid in content_ids if cid in tracks]
         except Exception as e:
             self.error_message = f"Failed to filter tracks: {str(e)}"
             return []
@@ -224,51 +290,138 @@ class RekordboxAdapter:
         Returns:
             List of streaming Track objects with at least one of the tags
         """
-        tracks = self.get_tracks_by_mytags(tag_ids)
-        return [track for track in tracks if track.is_streaming]
+        return self.get_tracks_by_mytags(tag_ids, streaming_only=True)
+    
+    def _fetch_rows(self, query: str, params) -> List[tuple]:
+        """Run a read-only SQL query on the underlying SQLite connection.
+        
+        Args:
+            query: SQL query with ``?`` placeholders
+            params: Values bound to the placeholders
+            
+        Returns:
+            All result rows
+        """
+        conn = self.db.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, tuple(params))
+            return cursor.fetchall()
+        finally:
+            # Hands the connection back to SQLAlchemy's pool
+            conn.close()
+    
+    def _get_content_snapshot(self) -> Dict[int, Track]:
+        """Return the content snapshot, loading it on first use.
+        
+        Reads every track with one projection query per connection and
+        keeps the result as Track records keyed by ID. Later queries are served
+        from memory; writes through this adapter patch the affected entries.
+        
+        Returns:
+            Dict mapping track ID to Track
+        """
+        if self._content_snapshot is not None:
+            return self._content_snapshot
+        
+        snapshot: Dict[int, Track] = {}
+        for row in self._iter_track_rows():
+            track = self._row_to_track(row)
+            snapshot[track.id] = track
+        
+        self._content_snapshot = snapshot
+        return snapshot
+    
+    def invalidate_content_cache(self) -> None:
+        """Drop the content snapshot so the next query reloads it."""
+        self._content_snapshot = None
+    
+    def _patch_snapshot_local(self, track_id: int, path_str: str, file_size: int) -> None:
+        """Apply a successful local-file update to the content snapshot.
+        
+        Args:
+            track_id: Rekordbox track ID that was updated
+            path_str: New FolderPath value
+            file_size: New FileSize value
+        """
+        if self._content_snapshot is None:
+            return
+        
+        track = self._content_snapshot.get(int(track_id))
+        if track is None:
+            # Row we have never seen - reload rather than guess
+            self.invalidate_content_cache()
+            return
+        
+        track.folder_path = path_str
+        track.file_path = path_str
+        track.file_size = file_size
+        # ServiceID is now 0, so only the path decides
+        track.is_streaming = is_streaming_path(path_str)
+    
+    def _iter_track_rows(self, condition: str = "", params=()) -> Iterator[TrackRow]:
+        """Stream TRACK_SELECT_SQL rows from the underlying SQLite connection.
+        
+        Args:
+            condition: Optional extra SQL condition on djmdContent (alias "c")
+            params: Values bound to the condition's placeholders
+            
+        Yields:
+            TrackRow tuples
+        """
+        query = TRACK_SELECT_SQL
+        if condition:
+            query += f" AND {condition}"
+        
+        conn = self.db.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, tuple(params))
+            while True:
+                rows = cursor.fetchmany(TRACK_FETCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # Hands the connection back to SQLAlchemy's pool
+            conn.close()
     
-    def _content_to_track(self, content) -> Track:
-        """Convert pyrekordbox content object to Track model.
+    @staticmethod
+    def _row_to_track(row: TrackRow) -> Track:
+        """Convert a TRACK_SELECT_SQL row to Track model.
         
         Args:
-            content: pyrekordbox DjmdContent object
+            row: TrackRow tuple
             
         Returns:
             Track model instance
         """
-        # Get tag IDs for this track (as strings)
-        tag_ids = []
-        if hasattr(content, 'MyTagIDs') and content.MyTagIDs:
-            tag_ids = [str(tid) for tid in content.MyTagIDs]
-        elif hasattr(content, 'MyTags') and content.MyTags:
-            tag_ids = [str(tag.ID) for tag in content.MyTags]
-        
-        # Handle potential None values
-        folder_path = content.FolderPath if content.FolderPath else ""
-        # Note: Rekordbox 6 doesn't have separate FilePath, FolderPath contains the full path
-        file_path = folder_path  # Use FolderPath as file_path
+        content_id, title, artist_name, folder_path, file_size, service_id, tag_ids = row
         
-        # Extract artist name (might be an object with Name attribute)
-        artist_name = ""
-        if content.Artist:
-            if hasattr(content.Artist, 'Name'):
-                artist_name = content.Artist.Name
-            else:
-                artist_name = str(content.Artist)
+        # Note: Rekordbox 6 doesn't have separate FilePath, FolderPath contains the full path
+        folder_path = folder_path or ""
         
         return Track(
-            id=content.ID,
-            artist=artist_name,
-            title=content.Title or "",
+            id=int(content_id),
+            artist=artist_name or "",
+            title=title or "",
             folder_path=folder_path,
-            file_path=file_path,
-            file_size=content.FileSize or 0,
-            my_tag_ids=tag_ids
+            file_path=folder_path,
+            file_size=file_size or 0,
+            my_tag_ids=tag_ids.split(",") if tag_ids else [],
+            is_streaming=RekordboxAdapter._is_streaming_content(folder_path, service_id)
         )
     
+    @staticmethod
+    def _is_streaming_content(folder_path: Optional[str], service_id: Optional[int]) -> bool:
+        """Empty FolderPath, a streaming service in it, or a non-zero ServiceID."""
+        return is_streaming_path(folder_path) or bool(service_id)
+    
     def get_track_by_id(self, track_id: int) -> Optional[Track]:
         """Fetch a single track by Rekordbox ID.
         
+        Uses a primary-key lookup instead of scanning the content table.
+        
         Args:
             track_id: Rekordbox track ID
             
@@ -278,31 +431,76 @@ class RekordboxAdapter:
         if not self.connected or self.db is None:
             return None
         
+        if self._content_snapshot is not None:
+            track = self._content_snapshot.get(int(track_id))
+            if track is None:
+                self.error_message = f"Track ID {track_id} not found in database"
+            return track
+        
         try:
-            # Get all content from database
-            all_content = list(self.db.get_content())
+            # DjmdContent.ID is a VARCHAR column, so look it up as a string
+            rows = list(self._iter_track_rows("c.ID = ?", [str(int(track_id))]))
             
-            # Convert track_id to int to ensure type match
-            search_id = int(track_id)
-            
-            for content in all_content:
-                # Ensure both IDs are integers for comparison
-                content_id = int(content.ID) if content.ID is not None else None
-                if content_id == search_id:
-                    return self._content_to_track(content)
+            if not rows:
+                self.error_message = f"Track ID {track_id} not found in database"
+                return None
             
-            # If not found, set error message for debugging
-            self.error_message = f"Track ID {track_id} not found in database (searched {len(all_content)} tracks)"
-            return None
+            return self._row_to_track(rows[0])
         except Exception as e:
             self.error_message = f"Failed to get track by ID: {str(e)}"
             return None
     
-    def backup_database(self, backup_path: Optional[Path] = None) -> Optional[Path]:
+    def get_tracks_by_ids(self, track_ids: Iterable[int]) -> Dict[int, Track]:
+        """Fetch several tracks by Rekordbox ID in batched queries.
+        
+        Issues one ``WHERE ID IN (...)`` query per chunk of IDs instead of
+        one lookup (or table scan) per track.
+        
+        Args:
+            track_ids: Rekordbox track IDs to fetch
+            
+        Returns:
+            Dict mapping track ID to Track for every ID found
+        """
+        if not self.connected or self.db is None:
+            return {}
+        
+        # Deduplicate while keeping the caller's order
+        unique_ids = list(dict.fromkeys(int(tid) for tid in track_ids))
+        if not unique_ids:
+            return {}
+        
+        if self._content_snapshot is not None:
+            return {tid: self._content_snapshot[tid] for tid in unique_ids
+                    if tid in self._content_snapshot}
+        
+        try:
+            tracks: Dict[int, Track] = {}
+            for start in range(0, len(unique_ids), ID_LOOKUP_CHUNK_SIZE):
+                chunk = [str(tid) for tid in unique_ids[start:start + ID_LOOKUP_CHUNK_SIZE]]
+                placeholders = ", ".join("?" for _ in chunk)
+                for row in self._iter_track_rows(f"c.ID IN ({placeholders})", chunk):
+                    track = self._row_to_track(row)
+                    tracks[track.id] = track
+            
+            return tracks
+        except Exception as e:
+            self.error_message = f"Failed to get tracks by ID: {str(e)}"
+            return {}
+    
+    def backup_database(
+        self, backup_path: Optional[Path] = None, keep: int = BACKUP_RETENTION
+    ) -> Optional[Path]:
         """Create timestamped backup of database file.
         
+        Skips the copy when the database is unchanged since the newest
+        backup, reflinks where the filesystem supports it and keeps only
+        the newest backups (see DatabaseBackups). Details of the last
+        backup are left in last_backup.
+        
         Args:
             backup_path: Optional custom backup path. If None, creates in same dir as DB.
+            keep: Backups to retain in the database directory (0 keeps all)
             
         Returns:
             Path to backup file if successful, None otherwise
@@ -312,23 +510,14 @@ class RekordboxAdapter:
             return None
         
         try:
-            from datetime import datetime
-            import shutil
-            
-            # Use stored database path
-            db_path = Path(self.db_path)
-            
-            # Generate backup filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             if backup_path:
                 backup_file = Path(backup_path)
+                method = copy_file(Path(self.db_path), backup_file)
+                self.last_backup = BackupResult(path=backup_file, method=method)
             else:
-                backup_file = db_path.parent / f"{db_path.stem}.backup.{timestamp}{db_path.suffix}"
+                self.last_backup = DatabaseBackups(Path(self.db_path), keep=keep).backup()
             
-            # Copy database file
-            shutil.copy2(db_path, backup_file)
-            
-            return backup_file
+            return self.last_backup.path
         except Exception as e:
             self.error_message = f"Failed to backup database: {str(e)}"
             return None
@@ -360,7 +549,6 @@ class RekordboxAdapter:
         
         try:
             # Convert path to string (NFC normalized)
-            import unicodedata
             path_str = unicodedata.normalize('NFC', str(file_path))
             
             # Access underlying SQLite connection through SQLAlchemy engine
@@ -374,23 +562,21 @@ class RekordboxAdapter:
             # Execute UPDATE query
             cursor = conn.cursor()
             
-            # Update DjmdContent table
-            update_query = """
-                UPDATE djmdContent 
-                SET FolderPath = ?,
-                    FileSize = ?,
-                    ServiceID = 0
-                WHERE ID = ?
-            """
+            before = self._journal_before(cursor, [track_id])
             
-            cursor.execute(update_query, (path_str, file_size, track_id))
-            conn.commit()
+            # Update DjmdContent table
+            cursor.execute(LINK_LOCAL_SQL, (path_str, file_size, track_id))
             
             # Verify update worked
             if cursor.rowcount != 1:
+                conn.rollback()
                 self.error_message = f"Update affected {cursor.rowcount} rows, expected 1"
                 return False
             
+            self._journal_after(cursor, "link", before)
+            conn.commit()
+            
+            self._patch_snapshot_local(track_id, path_str, file_size)
             return True
             
         except Exception as e:
@@ -399,10 +585,183 @@ class RekordboxAdapter:
             try:
                 if conn:
                     conn.rollback()
-            except:
+            except Exception:
                 pass
             return False
     
+    def apply_link_batch(self, updates: List[LocalLinkUpdate]) -> bool:
+        """Apply many local-file updates in a single transaction.
+        
+        Runs the FolderPath/FileSize/ServiceID updates and the analysis
+        resets with ``executemany`` on one connection and commits once.
+        Either every update is written or none is.
+        
+        Args:
+            updates: Updates to apply
+            
+        Returns:
+            True if all updates were committed, False otherwise
+        """
+        if not self.connected or self.db is None:
+            self.error_message = "No database connection"
+            return False
+        
+        if not updates:
+            return True
+        
+        if not hasattr(self.db, 'engine'):
+            self.error_message = "Could not access database engine for writes"
+            return False
+        
+        link_rows = [
+            (unicodedata.normalize('NFC', str(update.file_path)), update.file_size, update.track_id)
+            for update in updates
+        ]
+        reanalyze_rows = [(update.track_id,) for update in updates if update.reanalyze]
+        
+        conn = None
+        try:
+            conn = self.db.engine.raw_connection()
+            cursor = conn.cursor()
+            before = self._journal_before(cursor, [update.track_id for update in updates])
+            
+            cursor.executemany(LINK_LOCAL_SQL, link_rows)
+            if cursor.rowcount != len(link_rows):
+                conn.rollback()
+                self.error_message = (
+                    f"Batch update affected {cursor.rowcount} rows, expected {len(link_rows)}"
+                )
+                return False
+            
+            if reanalyze_rows:
+                cursor.executemany(REANALYZE_SQL, reanalyze_rows)
+                if cursor.rowcount != len(reanalyze_rows):
+                    conn.rollback()
+                    self.error_message = (
+                        f"Re-analysis update affected {cursor.rowcount} rows, "
+                        f"expected {len(reanalyze_rows)}"
+                    )
+                    return False
+            
+            self._journal_after(cursor, "link", before)
+            conn.commit()
+        except Exception as e:
+            self.error_message = f"Failed to apply batch update: {str(e)}"
+            try:
+                if conn:
+                    conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            if conn:
+                conn.close()
+        
+        for path_str, file_size, track_id in link_rows:
+            self._patch_snapshot_local(track_id, path_str, file_size)
+        
+        return True
+    
+    @staticmethod
+    def _read_journal_columns(cursor, track_ids: Iterable) -> Dict[str, tuple]:
+        """Read the undo journal's columns of rows, keyed by ID.
+        
+        Args:
+            cursor: Cursor of the write's transaction
+            track_ids: Row IDs to read
+            
+        Returns:
+            Dict mapping row ID (string) to JOURNAL_COLUMNS values
+        """
+        ids = list(dict.fromkeys(str(tid) for tid in track_ids))
+        values: Dict[str, tuple] = {}
+        for start in range(0, len(ids), ID_LOOKUP_CHUNK_SIZE):
+            chunk = ids[start:start + ID_LOOKUP_CHUNK_SIZE]
+            cursor.execute(JOURNAL_SELECT_SQL.format(", ".join("?" for _ in chunk)), chunk)
+            for row in cursor.fetchall():
+                values[str(row[0])] = tuple(row[1:])
+        return values
+    
+    def _journal_before(self, cursor, track_ids: Iterable) -> Optional[Dict[str, tuple]]:
+        """Capture rows' journaled columns ahead of a write (if journaling)."""
+        if self.journal is None:
+            return None
+        return self._read_journal_columns(cursor, track_ids)
+    
+    def _journal_after(self, cursor, op: str, before: Optional[Dict[str, tuple]]) -> None:
+        """Journal a write before its transaction commits.
+        
+        A crash after the commit then cannot leave an unjournaled change.
+        An entry left by a write that was rolled back instead is harmless:
+        undo skips rows whose values differ from the entry's "after".
+        """
+        if self.journal is None or not before:
+            return
+        after = self._read_journal_columns(cursor, before.keys())
+        self.journal.record(op, before, after)
+    
+    def undo_journal_entries(
+        self, entries: List[JournalEntry], force: bool = False
+    ) -> Optional[Tuple[int, List[str]]]:
+        """Restore rows to their values from before a journaled run.
+        
+        Runs in one transaction. Each row gets the values it had before the
+        run's first write to it. Rows changed since the run's last write
+        (for example edited in Rekordbox) are left alone unless force is set.
+        
+        Args:
+            entries: Journal entries of one run, in write order
+            force: Restore rows even if they changed since the run
+            
+        Returns:
+            (rows restored, IDs skipped) or None if the transaction failed
+        """
+        if not self.connected or self.db is None:
+            self.error_message = "No database connection"
+            return None
+        
+        original: Dict[str, list] = {}
+        final: Dict[str, list] = {}
+        for entry in entries:
+            original.setdefault(entry.track_id, entry.before)
+            final[entry.track_id] = entry.after
+        
+        conn = None
+        try:
+            conn = self.db.engine.raw_connection()
+            cursor = conn.cursor()
+            current = self._read_journal_columns(cursor, original)
+            
+            restore_rows = []
+            skipped = []
+            for track_id, values in original.items():
+                row = current.get(track_id)
+                if row is not None and list(row) == list(values):
+                    # Already back to its original values (e.g. a repeated undo)
+                    continue
+                if row is None or (not force and list(row) != list(final[track_id])):
+                    skipped.append(track_id)
+                    continue
+                restore_rows.append((*values, track_id))
+            
+            if restore_rows:
+                cursor.executemany(RESTORE_SQL, restore_rows)
+            conn.commit()
+        except Exception as e:
+            self.error_message = f"Failed to undo changes: {str(e)}"
+            try:
+                if conn:
+                    conn.rollback()
+            except Exception:
+                pass
+            return None
+        finally:
+            if conn:
+                conn.close()
+        
+        self.invalidate_content_cache()
+        return len(restore_rows), skipped
+    
     def is_streaming_track(self, track_id: int) -> bool:
         """Check if track is currently a streaming track.
         
@@ -454,37 +813,27 @@ class RekordboxAdapter:
                 self.error_message = f"Track ID {track_id} not found in database"
                 return False
             
-            # Clear analysis data fields
-            # Fields that exist in Rekordbox 6 database:
-            # - AnalysisDataPath: Path to .DAT/.EXT files
-            # - Analysed: Flag indicating if track has been analyzed (0 = not analyzed)
-            # - SearchStr: Cached search string
-            # - AnalysisUpdated: Timestamp of last analysis update
-            update_query = """
-                UPDATE djmdContent 
-                SET AnalysisDataPath = '',
-                    Analysed = 0,
-                    SearchStr = '',
-                    AnalysisUpdated = ''
-                WHERE ID = ?
-            """
+            before = self._journal_before(cursor, [track_id])
             
-            cursor.execute(update_query, (track_id,))
-            conn.commit()
+            # Clear analysis data fields
+            cursor.execute(REANALYZE_SQL, (track_id,))
             
             # Verify update worked
-            if cursor.rowcount == 1:
-                return True
-            else:
+            if cursor.rowcount != 1:
+                conn.rollback()
                 self.error_message = f"Update affected {cursor.rowcount} rows, expected 1"
                 return False
             
+            self._journal_after(cursor, "reanalyze", before)
+            conn.commit()
+            return True
+            
         except Exception as e:
             self.error_message = f"Failed to force re-analyze: {str(e)}"
             try:
                 if conn:
                     conn.rollback()
-            except:
+            except Exception:
                 pass
             return False
     
@@ -494,3 +843,4 @@ class RekordboxAdapter:
             # pyrekordbox doesn't require explicit close, but we clear reference
             self.db = None
             self.connected = False
+            self.invalidate_content_cache()
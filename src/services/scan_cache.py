@@ -0,0 +1,215 @@
+"""Persistent directory scan cache for the file path matcher.
+
+Stores the music files found in every scanned directory together with the
+directory's modification time in a small SQLite database. A directory's
+mtime changes whenever an entry is added, removed or renamed in it, so on
+later scans only directories with a new mtime are listed again; all other
+directories reuse their cached files (including the cleaned filenames) and
+subdirectories, at the cost of one stat call each. The stat calls and
+listings run on a thread pool, so round trips to a network share overlap;
+the database is only touched by the calling thread.
+"""
+
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from lib.text_utils import normalize_filename, split_words
+from models.music_file import MusicFile
+
+# Bump when the cached columns or the filename cleaning change
+SCAN_CACHE_VERSION = 1
+
+# Directories modified this recently may still change within the same mtime
+# tick, so they are listed again on the next scan
+RECENT_MTIME_WINDOW_NS = 2_000_000_000
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS entries (
+    directory TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    filename_clean TEXT,
+    PRIMARY KEY (directory, position)
+);
+"""
+
+# (name, is_dir, filename_clean) of one directory entry
+CachedEntry = Tuple[str, bool, Optional[str]]
+
+# Lists one directory: ((path, filename, stem) of music files, subdirectory paths)
+DirectoryLister = Callable[[str], Tuple[List[Tuple[str, str, str]], List[str]]]
+
+# Threads listing directories concurrently (scans are latency-bound on NAS mounts)
+SCAN_THREADS = 8
+
+
+class ScanCache:
+    """Scan directories for music files, reusing unchanged directory listings."""
+
+    def __init__(self, cache_path: str):
+        """Initialize scan cache.
+
+        Args:
+            cache_path: SQLite file holding the cache (created if missing)
+        """
+        self.cache_path = cache_path
+        self.listed_dirs = 0
+        self.cached_dirs = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.cache_path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCAN_CACHE_VERSION:
+            conn.executescript("DROP TABLE IF EXISTS directories; DROP TABLE IF EXISTS entries;")
+            conn.execute(f"PRAGMA user_version = {SCAN_CACHE_VERSION}")
+        conn.executescript(SCHEMA_SQL)
+        return conn
+
+    def scan(
+        self, scan_dir: str, list_directory: DirectoryLister, threads: int = SCAN_THREADS
+    ) -> List[MusicFile]:
+        """Recursively collect music files below scan_dir.
+
+        Files are returned in the same order as an os.walk based scan.
+        Subdirectories are stat'ed (and listed if changed) on a thread pool
+        as soon as their parent is known.
+
+        Args:
+            scan_dir: Directory to scan
+            list_directory: Lists one directory (runs in a scan thread)
+            threads: Number of scan threads
+
+        Returns:
+            List of MusicFile entries
+        """
+        self.listed_dirs = 0
+        self.cached_dirs = 0
+        root = os.path.abspath(scan_dir)
+        conn = self._connect()
+
+        try:
+            cached_mtimes: Dict[str, Optional[int]] = dict(
+                conn.execute("SELECT path, mtime_ns FROM directories")
+            )
+            recent_limit = time.time_ns() - RECENT_MTIME_WINDOW_NS
+            visited: Set[str] = set()
+            music_files: List[MusicFile] = []
+
+            def visit(directory: str) -> Tuple[Optional[int], Optional[List[CachedEntry]]]:
+                """Stat a directory and list it unless the cache is current.
+
+                Returns:
+                    (mtime or None if unreadable, entries or None if cached)
+                """
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    return None, None
+                cached_mtime = cached_mtimes.get(os.path.abspath(directory))
+                if cached_mtime is not None and cached_mtime == mtime_ns:
+                    return mtime_ns, None
+                return mtime_ns, self._list_directory(directory, list_directory)
+
+            executor = ThreadPoolExecutor(max_workers=threads)
+            try:
+                pending: List[Tuple[str, Future]] = [(scan_dir, executor.submit(visit, scan_dir))]
+                with conn:
+                    while pending:
+                        directory, future = pending.pop()
+                        key = os.path.abspath(directory)
+                        visited.add(key)
+
+                        mtime_ns, entries = future.result()
+                        if mtime_ns is None:
+                            continue
+
+                        if entries is None:
+                            entries = self._load_entries(conn, key)
+                            self.cached_dirs += 1
+                        else:
+                            stored_mtime = mtime_ns if mtime_ns < recent_limit else None
+                            self._store_entries(conn, key, stored_mtime, entries)
+                            self.listed_dirs += 1
+
+                        subdirs = []
+                        for name, is_dir, filename_clean in entries:
+                            path = os.path.join(directory, name)
+                            if is_dir:
+                                subdirs.append((path, executor.submit(visit, path)))
+                            else:
+                                music_files.append(MusicFile(
+                                    file_path=str(Path(path)),
+                                    filename=name,
+                                    filename_clean=filename_clean,
+                                    filename_words=split_words(filename_clean)
+                                ))
+
+                        # Depth-first, first subdirectory next (same as os.walk)
+                        pending.extend(reversed(subdirs))
+
+                    self._prune(conn, root, visited)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+        finally:
+            conn.close()
+
+        return music_files
+
+    @staticmethod
+    def _list_directory(directory: str, list_directory: DirectoryLister) -> List[CachedEntry]:
+        """List a directory's music files and subdirectories as cache entries."""
+        files, subdirs = list_directory(directory)
+        entries: List[CachedEntry] = [
+            (filename, False, normalize_filename(stem).text) for _, filename, stem in files
+        ]
+        entries.extend((os.path.basename(path), True, None) for path in subdirs)
+        return entries
+
+    @staticmethod
+    def _load_entries(conn: sqlite3.Connection, directory: str) -> List[CachedEntry]:
+        rows = conn.execute(
+            "SELECT name, is_dir, filename_clean FROM entries WHERE directory = ? ORDER BY position",
+            (directory,),
+        )
+        return [(name, bool(is_dir), filename_clean) for name, is_dir, filename_clean in rows]
+
+    @staticmethod
+    def _store_entries(
+        conn: sqlite3.Connection,
+        directory: str,
+        mtime_ns: Optional[int],
+        entries: Iterable[CachedEntry],
+    ) -> None:
+        conn.execute("DELETE FROM entries WHERE directory = ?", (directory,))
+        conn.executemany(
+            "INSERT INTO entries (directory, position, name, is_dir, filename_clean) VALUES (?, ?, ?, ?, ?)",
+            [
+                (directory, position, name, int(is_dir), filename_clean)
+                for position, (name, is_dir, filename_clean) in enumerate(entries)
+            ],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO directories (path, mtime_ns) VALUES (?, ?)",
+            (directory, mtime_ns),
+        )
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, root: str, visited: Set[str]) -> None:
+        """Drop cached directories below root that no longer exist."""
+        prefix = os.path.join(root, '')
+        stale = [
+            (path,)
+            for (path,) in conn.execute("SELECT path FROM directories")
+            if path.startswith(prefix) and path not in visited
+        ]
+        conn.executemany("DELETE FROM entries WHERE directory = ?", stale)
+        conn.executemany("DELETE FROM directories WHERE path = ?", stale)
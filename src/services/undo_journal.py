@@ -0,0 +1,141 @@
+"""Row-level undo journal for Rekordbox database writes.
+
+Every write the adapter makes to djmdContent (linking a track to a local
+file, clearing its analysis data) appends one JSON line per row with the
+row's journaled columns before and after the write. ``rekordbox-undo``
+replays a run's "before" values in one transaction, so a bad
+``--apply`` can be reverted without restoring a whole database backup and
+losing unrelated edits made since.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# djmdContent columns changed by link-local writes, in journal order
+JOURNAL_COLUMNS = (
+    "FolderPath",
+    "FileSize",
+    "ServiceID",
+    "AnalysisDataPath",
+    "Analysed",
+    "SearchStr",
+    "AnalysisUpdated",
+)
+
+
+@dataclass
+class JournalEntry:
+    """Journaled column values of one row around one write."""
+    run: str
+    op: str  # 'link' or 'reanalyze'
+    track_id: str
+    before: List[Any]  # JOURNAL_COLUMNS values before the write
+    after: List[Any]  # ... and right after it
+
+
+@dataclass
+class JournalRun:
+    """Summary of the writes made by one connection."""
+    run: str
+    rows: int
+    undone: bool = False
+
+
+def default_journal_path(db_path: Path) -> Path:
+    """Get the journal location for a database (next to it)."""
+    db_path = Path(db_path)
+    return db_path.parent / f"{db_path.stem}.undo.jsonl"
+
+
+class UndoJournal:
+    """Append-only JSONL journal of row changes."""
+
+    def __init__(self, path: Path, run_id: Optional[str] = None):
+        """Initialize the journal.
+
+        Args:
+            path: Journal file (created on the first write)
+            run_id: ID grouping the writes of this session (default: timestamp)
+        """
+        self.path = Path(path)
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    def _append(self, lines: Sequence[Dict[str, Any]]) -> None:
+        """Append lines and flush them to disk."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(
+        self, op: str, before: Dict[str, Sequence[Any]], after: Dict[str, Sequence[Any]]
+    ) -> None:
+        """Journal a write.
+
+        Called before the write's transaction commits, so every committed
+        change is in the journal. If the transaction is rolled back instead,
+        the entry stays behind but is never replayed: undo skips rows whose
+        values are not the entry's "after" values.
+
+        Args:
+            op: Kind of write ('link' or 'reanalyze')
+            before: Row ID -> JOURNAL_COLUMNS values before the write
+            after: Row ID -> JOURNAL_COLUMNS values after the write
+        """
+        self._append([
+            {"run": self.run_id, "op": op, "id": track_id,
+             "before": list(values), "after": list(after.get(track_id, values))}
+            for track_id, values in before.items()
+        ])
+
+    def mark_undone(self, run_id: str) -> None:
+        """Record that a run has been reverted."""
+        self._append([{"run": run_id, "undone": True}])
+
+    def _lines(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        lines = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for raw in f:
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    lines.append(json.loads(raw))
+                except ValueError:
+                    # A line cut short by a crash; everything before it is intact
+                    continue
+        return lines
+
+    def runs(self) -> List[JournalRun]:
+        """Get journaled runs, oldest first."""
+        runs: Dict[str, JournalRun] = {}
+        for line in self._lines():
+            run = runs.setdefault(line["run"], JournalRun(run=line["run"], rows=0))
+            if line.get("undone"):
+                run.undone = True
+            else:
+                run.rows += 1
+        return list(runs.values())
+
+    def last_run(self) -> Optional[str]:
+        """Get the newest run that has not been undone."""
+        pending = [run.run for run in self.runs() if not run.undone and run.rows]
+        return pending[-1] if pending else None
+
+    def entries(self, run_id: str) -> List[JournalEntry]:
+        """Get a run's entries in the order they were written."""
+        return [
+            JournalEntry(
+                run=line["run"], op=line["op"], track_id=str(line["id"]),
+                before=line["before"], after=line["after"],
+            )
+            for line in self._lines()
+            if line["run"] == run_id and not line.get("undone")
+        ]
@@ -0,0 +1,58 @@
+"""Tests for the one-to-one track/file assignment."""
+import itertools
+import random
+
+from src.lib.assignment import assign_candidates, greedy_assignment
+
+
+def _best_possible(candidates):
+    """Brute-force (matched count, total similarity) of the best assignment."""
+    tracks = sorted(candidates)
+    best = (0, 0.0)
+    options = [[None] + candidates[t] for t in tracks]
+    for choice in itertools.product(*options):
+        files = [c[0] for c in choice if c]
+        if len(files) != len(set(files)):
+            continue
+        score = (len(files), round(sum(c[1] for c in choice if c), 9))
+        best = max(best, score)
+    return best
+
+
+class TestAssignCandidates:
+    """Test suite for assign_candidates."""
+
+    def test_conflict_falls_back_to_second_candidate(self):
+        """Test that the losing track takes its next-best file."""
+        candidates = {
+            0: [(10, 0.9), (11, 0.85)],
+            1: [(10, 0.8)],
+        }
+
+        assignment = assign_candidates(candidates)
+
+        assert assignment == {0: (11, 0.85), 1: (10, 0.8)}
+        assert greedy_assignment(candidates) == {0: (10, 0.9)}
+
+    def test_without_conflicts_everyone_keeps_best(self):
+        """Test that unique best files are assigned unchanged."""
+        candidates = {0: [(1, 0.7), (2, 0.6)], 1: [(2, 0.9), (1, 0.65)]}
+
+        assert assign_candidates(candidates) == {0: (1, 0.7), 1: (2, 0.9)}
+
+    def test_optimal_against_brute_force(self):
+        """Test that the assignment maximizes matches, then total similarity."""
+        rng = random.Random(7)
+        for _ in range(200):
+            candidates = {}
+            for track in range(rng.randint(1, 6)):
+                files = rng.sample(range(5), rng.randint(1, 3))
+                options = [(f, round(rng.uniform(0.6, 1.0), 2)) for f in files]
+                candidates[track] = sorted(options, key=lambda c: (-c[1], c[0]))
+
+            assignment = assign_candidates(candidates)
+            files = [f for f, _ in assignment.values()]
+
+            assert len(files) == len(set(files))
+            score = (len(assignment), round(sum(s for _, s in assignment.values()), 9))
+            assert score == _best_possible(candidates)
@@ -275,6 +275,79 @@ class TestAudioConverter:
             assert "8" in cmd
             assert "flac" in cmd
 
+    def test_build_ffmpeg_command_stream_copy(self):
+        """Test that stream copy skips the encoder and its settings."""
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
+            converter = AudioConverter()
+            
+            source = Path("/test/input.aac")
+            output = Path("/test/input.m4a")
+            config = converter.FORMAT_CONFIGS["aac"]
+            
+            cmd = converter._build_ffmpeg_command(source, output, config, codec="copy")
+            
+            assert cmd[cmd.index("-codec:a") + 1] == "copy"
+            assert "-b:a" not in cmd
+
+    def test_convert_remuxes_matching_codec(self, tmp_path):
+        """Test that a source already holding the target codec is remuxed."""
+        with patch("shutil.which", side_effect=lambda x: "/usr/bin/" + x):
+            converter = AudioConverter()
+            
+            source = tmp_path / "test.aac"
+            source.write_text("fake aac data")
+            output = tmp_path / "test.m4a"
+            
+            def fake_run(cmd, **kwargs):
+                if cmd[0].endswith("ffprobe"):
+                    return Mock(returncode=0, stdout='{"streams": [{"codec_name": "aac"}]}')
+                output.touch()
+                return Mock(returncode=0, stderr="")
+            
+            with patch("subprocess.run", side_effect=fake_run) as mock_run:
+                result = converter.convert(source, "aac")
+            
+            assert result.success
+            ffmpeg_cmd = mock_run.call_args[0][0]
+            assert ffmpeg_cmd[ffmpeg_cmd.index("-codec:a") + 1] == "copy"
+
+    def test_convert_pcm_keeps_bit_depth(self, tmp_path):
+        """Test that PCM to PCM keeps the source's bit depth, defaulting when unknown."""
+        with patch("shutil.which", side_effect=lambda x: "/usr/bin/" + x):
+            converter = AudioConverter()
+            config = converter.FORMAT_CONFIGS["aiff"]
+            source = tmp_path / "test.wav"
+            source.write_text("fake wav data")
+            
+            for codec, expected in (("pcm_s24le", "pcm_s24be"), ("pcm_s16le", "pcm_s16be"), ("pcm_f32le", None)):
+                probe = Mock(returncode=0, stdout='{"streams": [{"codec_name": "%s"}]}' % codec)
+                converter._probe = None
+                with patch("subprocess.run", return_value=probe):
+                    assert converter._stream_codec(source, config) == expected
+            
+            cmd = converter._build_ffmpeg_command(source, tmp_path / "test.aiff", config, "pcm_s24be")
+            assert cmd[cmd.index("-codec:a") + 1] == "pcm_s24be"
+
+    def test_convert_does_not_probe_incompatible_source(self, tmp_path):
+        """Test that re-encoding conversions run ffmpeg without probing."""
+        with patch("shutil.which", side_effect=lambda x: "/usr/bin/" + x):
+            converter = AudioConverter()
+            
+            source = tmp_path / "test.mp3"
+            source.write_text("fake mp3 data")
+            output = tmp_path / "test.wav"
+            
+            def fake_run(cmd, **kwargs):
+                output.touch()
+                return Mock(returncode=0, stderr="")
+            
+            with patch("subprocess.run", side_effect=fake_run) as mock_run:
+                result = converter.convert(source, "wav")
+            
+            assert result.success
+            assert mock_run.call_count == 1
+            assert "pcm_s16le" in mock_run.call_args[0][0]
+
     def test_probe_format(self, tmp_path):
         """Test probing audio format."""
         with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
@@ -298,8 +371,108 @@ class TestAudioConverter:
             
             mock_result = Mock()
             mock_result.returncode = 0
-            mock_result.stdout = "alac\n"
+            mock_result.stdout = '{"streams": [{"codec_name": "alac"}], "format": {}}'
             
             with patch("subprocess.run", return_value=mock_result):
                 format_str = converter.probe_format(source)
                 assert format_str == "alac"
+
+    def test_is_conversion_needed_probes_m4a_codec(self, tmp_path):
+        """Test that .m4a files are told apart as AAC or ALAC by probing."""
+        with patch("shutil.which", side_effect=lambda x: "/usr/bin/" + x):
+            converter = AudioConverter()
+            
+            source = tmp_path / "test.m4a"
+            source.touch()
+            
+            mock_result = Mock()
+            mock_result.returncode = 0
+            mock_result.stdout = '{"streams": [{"codec_name": "alac"}], "format": {}}'
+            
+            with patch("subprocess.run", return_value=mock_result) as mock_run:
+                assert not converter.is_conversion_needed(source, "alac")
+                assert converter.is_conversion_needed(source, "aac")
+                assert converter.is_conversion_needed(source, "m4a")
+                # Probed once, then memoized
+                assert mock_run.call_count == 1
+
+
+class TestConvertMany:
+    """Test suite for concurrent batch conversion."""
+
+    def _converter(self):
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
+            return AudioConverter()
+
+    def test_runs_jobs_concurrently(self, tmp_path):
+        """Test that several ffmpeg processes run at the same time."""
+        import threading
+        import time
+        from src.services.audio_converter import ConversionJob
+
+        converter = self._converter()
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_run(cmd, **kwargs):
+            with lock:
+                running.append(cmd)
+                peak.append(len(running))
+            time.sleep(0.05)
+            Path(cmd[-1]).write_bytes(b"out")
+            with lock:
+                running.remove(cmd)
+            return Mock(returncode=0, stderr="")
+
+        jobs = []
+        for i in range(6):
+            source = tmp_path / f"track{i}.flac"
+            source.write_bytes(b"in")
+            jobs.append(ConversionJob(source_path=source, target_format="aiff", context=i))
+
+        with patch("subprocess.run", side_effect=fake_run):
+            results = list(converter.convert_many(jobs, max_workers=3))
+
+        assert sorted(job.context for job, _ in results) == list(range(6))
+        assert all(result.success for _, result in results)
+        assert max(peak) == 3
+
+    def test_pulls_jobs_lazily(self, tmp_path):
+        """Test that jobs are taken from the iterable as slots free up."""
+        from src.services.audio_converter import ConversionJob
+
+        converter = self._converter()
+        produced = []
+
+        def jobs():
+            for i in range(10):
+                produced.append(i)
+                yield ConversionJob(source_path=tmp_path / f"missing{i}.flac", target_format="aiff")
+
+        results = converter.convert_many(jobs(), max_workers=1)
+        next(results)
+
+        assert len(produced) <= 3
+        results.close()
+
+    def test_same_output_file_is_not_converted_twice(self, tmp_path):
+        """Test that jobs writing the same output run one after the other."""
+        from src.services.audio_converter import ConversionJob
+
+        converter = self._converter()
+        for ext in ("flac", "wav"):
+            (tmp_path / f"song.{ext}").write_bytes(b"in")
+
+        def fake_run(cmd, **kwargs):
+            Path(cmd[-1]).write_bytes(b"out")
+            return Mock(returncode=0, stderr="")
+
+        jobs = [
+            ConversionJob(source_path=tmp_path / "song.flac", target_format="aiff"),
+            ConversionJob(source_path=tmp_path / "song.wav", target_format="aiff"),
+        ]
+        with patch("subprocess.run", side_effect=fake_run):
+            results = [result for _, result in converter.convert_many(jobs, max_workers=2)]
+
+        assert sorted(r.success for r in results) == [False, True]
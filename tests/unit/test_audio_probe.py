@@ -0,0 +1,144 @@
+"""Tests for the memoizing ffprobe wrapper."""
+import json
+import os
+import subprocess
+from unittest.mock import Mock, patch
+
+from src.services.audio_probe import AudioInfo, AudioProbe, parse_ffprobe_json
+
+FLAC_OUTPUT = json.dumps({
+    "streams": [{
+        "codec_name": "flac",
+        "sample_rate": "44100",
+        "channels": 2,
+        "bits_per_sample": 0,
+        "bits_per_raw_sample": "24",
+    }],
+    "format": {"duration": "215.400000"},
+})
+
+
+def _ffprobe_result(stdout=FLAC_OUTPUT, returncode=0):
+    result = Mock()
+    result.returncode = returncode
+    result.stdout = stdout
+    return result
+
+
+class TestParseFfprobeJson:
+    """Test suite for ffprobe JSON parsing."""
+
+    def test_parses_all_fields(self):
+        """Test that one JSON document yields every property."""
+        info = parse_ffprobe_json(FLAC_OUTPUT)
+
+        assert info == AudioInfo(
+            codec="flac", sample_rate=44100, bit_depth=24, channels=2, duration=215.4
+        )
+
+    def test_pcm_bit_depth(self):
+        """Test that PCM streams report bit depth via bits_per_sample."""
+        output = json.dumps({"streams": [{"codec_name": "pcm_s16le", "bits_per_sample": 16}]})
+
+        assert parse_ffprobe_json(output).bit_depth == 16
+
+    def test_no_audio_stream(self):
+        """Test that files without an audio stream give None."""
+        assert parse_ffprobe_json('{"streams": [], "format": {}}') is None
+        assert parse_ffprobe_json("not json") is None
+
+
+class TestAudioProbe:
+    """Test suite for AudioProbe memoization."""
+
+    def test_probes_each_file_once(self, tmp_path):
+        """Test that repeated probes of an unchanged file run ffprobe once."""
+        source = tmp_path / "track.flac"
+        source.write_bytes(b"data")
+        probe = AudioProbe(ffprobe_path="/usr/bin/ffprobe")
+
+        with patch("subprocess.run", return_value=_ffprobe_result()) as mock_run:
+            first = probe.probe(source)
+            second = probe.probe(source)
+
+        assert first == second
+        assert first.codec == "flac"
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-of") + 1] == "json"
+
+    def test_changed_file_is_probed_again(self, tmp_path):
+        """Test that a new mtime invalidates the memoized result."""
+        source = tmp_path / "track.flac"
+        source.write_bytes(b"data")
+        probe = AudioProbe(ffprobe_path="/usr/bin/ffprobe")
+
+        with patch("subprocess.run", return_value=_ffprobe_result()) as mock_run:
+            probe.probe(source)
+            os.utime(source, ns=(1_600_000_000 * 10**9, 1_600_000_000 * 10**9))
+            probe.probe(source)
+
+        assert mock_run.call_count == 2
+
+    def test_persistent_cache(self, tmp_path):
+        """Test that results survive in the SQLite cache across instances."""
+        source = tmp_path / "track.flac"
+        source.write_bytes(b"data")
+        cache_path = tmp_path / "probes.db"
+
+        with patch("subprocess.run", return_value=_ffprobe_result()) as mock_run:
+            AudioProbe(ffprobe_path="/usr/bin/ffprobe", cache_path=cache_path).probe(source)
+            info = AudioProbe(ffprobe_path="/usr/bin/ffprobe", cache_path=cache_path).probe(source)
+
+        assert info.bit_depth == 24
+        assert mock_run.call_count == 1
+
+    def test_failed_probes_are_not_stored(self, tmp_path):
+        """Test that timeouts and ffprobe errors are retried by later runs."""
+        source = tmp_path / "track.flac"
+        source.write_bytes(b"data")
+        cache_path = tmp_path / "probes.db"
+
+        for failure in (
+            {"side_effect": subprocess.TimeoutExpired("ffprobe", 60)},
+            {"return_value": _ffprobe_result(stdout="", returncode=1)},
+        ):
+            probe = AudioProbe(ffprobe_path="/usr/bin/ffprobe", cache_path=cache_path)
+            with patch("subprocess.run", **failure) as mock_run:
+                assert probe.probe(source) is None
+                assert probe.probe(source) is None
+            assert mock_run.call_count == 1
+            probe.close()
+
+        with patch("subprocess.run", return_value=_ffprobe_result()):
+            info = AudioProbe(ffprobe_path="/usr/bin/ffprobe", cache_path=cache_path).probe(source)
+
+        assert info.codec == "flac"
+
+    def test_missing_file_or_ffprobe(self, tmp_path):
+        """Test that missing inputs give None without running ffprobe."""
+        source = tmp_path / "track.flac"
+        source.write_bytes(b"data")
+
+        with patch("subprocess.run") as mock_run:
+            assert AudioProbe(ffprobe_path="/usr/bin/ffprobe").probe(tmp_path / "gone.flac") is None
+            with patch("shutil.which", return_value=None):
+                assert AudioProbe().probe(source) is None
+
+        mock_run.assert_not_called()
+
+    def test_probe_many(self, tmp_path):
+        """Test probing several files concurrently."""
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"track{i}.flac"
+            path.write_bytes(b"data")
+            paths.append(path)
+        probe = AudioProbe(ffprobe_path="/usr/bin/ffprobe")
+
+        with patch("subprocess.run", return_value=_ffprobe_result()) as mock_run:
+            results = probe.probe_many(paths + paths[:1], max_workers=2)
+
+        assert list(results) == paths
+        assert all(info.codec == "flac" for info in results.values())
+        assert mock_run.call_count == 4
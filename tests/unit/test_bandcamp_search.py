@@ -0,0 +1,179 @@
+"""Tests for the HTTP Bandcamp search."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.services.bandcamp_search import BandcampSearcher, parse_search_results
+
+SEARCH_PAGE = """
+<html><body><ul class="result-items">
+  <li class="searchresult data-search" data-search='{"type": "a"}'>
+    <a class="artcont" href="https://label.bandcamp.com/album/night-drive?from=search">
+      <div class="art"><img src="a.jpg"></div>
+    </a>
+    <div class="result-info">
+      <div class="itemtype">ALBUM</div>
+      <div class="heading"><a href="https://label.bandcamp.com/album/night-drive">Night Drive</a></div>
+      <div class="subhead">by Moon Unit</div>
+      <div class="length">8 tracks, 41 minutes</div>
+    </div>
+  </li>
+  <li class="searchresult data-search" data-search='{"type": "t"}'>
+    <a class="artcont" href="https://moonunit.bandcamp.com/track/night-drive?from=search&amp;search_item_id=1">
+      <div class="art"><img src="t.jpg"></div>
+    </a>
+    <div class="result-info">
+      <div class="itemtype">
+        TRACK
+      </div>
+      <div class="heading">
+        <a href="https://moonunit.bandcamp.com/track/night-drive">Night Drive &amp; Dawn</a>
+      </div>
+      <div class="subhead">
+        from Night Drive
+        by Moon Unit
+      </div>
+    </div>
+  </li>
+  <li class="searchresult data-search">
+    <div class="result-info">
+      <div class="heading"><a href="https://other.bandcamp.com/track/x">Other - Something Else</a></div>
+    </div>
+  </li>
+</ul></body></html>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []
+    lock = threading.Lock()
+    throttle_first = False
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append(self.path)
+            throttle = cls.throttle_first and len(cls.requests) == 1
+        time.sleep(0.05)
+        if throttle:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        body = SEARCH_PAGE.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.requests = []
+    _Handler.throttle_first = False
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/search"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _tracks(count):
+    return [{"id": str(i), "artist": "Moon Unit", "title": "Night Drive"} for i in range(count)]
+
+
+class TestParseSearchResults:
+    """Test suite for search page parsing."""
+
+    def test_keeps_tracks_only(self):
+        """Test that album results are dropped and track fields are extracted."""
+        results, total = parse_search_results(SEARCH_PAGE)
+
+        assert total == 3
+        assert [(r.artist, r.title, r.url) for r in results] == [
+            ("Moon Unit", "Night Drive & Dawn", "https://moonunit.bandcamp.com/track/night-drive"),
+            ("Other", "Something Else", "https://other.bandcamp.com/track/x"),
+        ]
+
+    def test_empty_page(self):
+        """Test that a page without results parses to nothing."""
+        assert parse_search_results("<html><body>No results</body></html>") == ([], 0)
+
+
+class TestBandcampSearcher:
+    """Test suite for concurrent HTTP searches against a local server."""
+
+    def test_resolves_best_match(self, server):
+        """Test that a track resolves to its best matching result."""
+        searcher = BandcampSearcher(search_url=server, requests_per_second=0)
+
+        [outcome] = searcher.resolve_many(_tracks(1))
+
+        assert outcome.error is None
+        assert outcome.best_match.url == "https://moonunit.bandcamp.com/track/night-drive"
+        query = parse_qs(urlsplit(_Handler.requests[0]).query)
+        assert query == {"q": ["Moon Unit Night Drive"], "item_type": ["t"]}
+
+    def test_concurrency_is_bounded(self, server):
+        """Test that no more than `concurrency` searches are in flight."""
+        searcher = BandcampSearcher(search_url=server, concurrency=3, requests_per_second=0)
+        fetch = searcher._fetch
+        lock = threading.Lock()
+        counts = {"in_flight": 0, "max": 0}
+
+        def counting_fetch(url):
+            with lock:
+                counts["in_flight"] += 1
+                counts["max"] = max(counts["max"], counts["in_flight"])
+            try:
+                return fetch(url)
+            finally:
+                with lock:
+                    counts["in_flight"] -= 1
+
+        searcher._fetch = counting_fetch
+        seen = []
+
+        outcomes = searcher.resolve_many(_tracks(12), on_result=seen.append)
+
+        assert [o.track_id for o in outcomes] == [str(i) for i in range(12)]
+        assert len(seen) == 12
+        assert 1 < counts["max"] <= 3
+
+    def test_rate_limit_spaces_requests(self, server):
+        """Test that request starts are spaced by the rate limit."""
+        searcher = BandcampSearcher(search_url=server, concurrency=4, requests_per_second=20)
+
+        start = time.monotonic()
+        searcher.resolve_many(_tracks(5))
+
+        assert time.monotonic() - start >= 4 / 20
+
+    def test_retries_throttled_requests(self, server):
+        """Test that a 429 response is retried."""
+        _Handler.throttle_first = True
+        searcher = BandcampSearcher(search_url=server, requests_per_second=0)
+
+        [outcome] = searcher.resolve_many(_tracks(1))
+
+        assert outcome.error is None
+        assert len(_Handler.requests) == 2
+
+    def test_unreachable_server_is_an_error(self):
+        """Test that connection failures become outcome errors."""
+        searcher = BandcampSearcher(
+            search_url="http://127.0.0.1:9/search", requests_per_second=0, timeout=2
+        )
+
+        [outcome] = searcher.resolve_many(_tracks(1))
+
+        assert outcome.error
+        assert outcome.best_match is None
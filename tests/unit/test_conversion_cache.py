@@ -0,0 +1,95 @@
+"""Tests for the conversion cache."""
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.services.audio_converter import AudioConverter
+from src.services.conversion_cache import ConversionCache, conversion_params
+
+
+def _fake_ffmpeg(cmd, **kwargs):
+    Path(cmd[-1]).write_bytes(b"converted")
+    return Mock(returncode=0, stderr="")
+
+
+def _converter(tmp_path):
+    with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
+        return AudioConverter(cache_path=tmp_path / "cache" / "conversions.db")
+
+
+class TestConversionCache:
+    """Test suite for reusing earlier conversions."""
+
+    def test_second_run_reuses_output(self, tmp_path):
+        """Test that an identical conversion is not run again."""
+        source = tmp_path / "song.flac"
+        source.write_bytes(b"flac data")
+
+        with patch("subprocess.run", side_effect=_fake_ffmpeg) as run:
+            first = _converter(tmp_path).convert(source, "aiff")
+            second = _converter(tmp_path).convert(source, "aiff")
+
+        assert first.success and not first.cached
+        assert second.success and second.cached
+        assert second.output_path == first.output_path.resolve()
+        assert run.call_count == 1
+
+    def test_other_output_dir_gets_copy(self, tmp_path):
+        """Test that a cached output in another directory is copied to the requested one."""
+        source = tmp_path / "song.flac"
+        source.write_bytes(b"flac data")
+        first_dir = tmp_path / "first"
+        second_dir = tmp_path / "second"
+
+        with patch("subprocess.run", side_effect=_fake_ffmpeg) as run:
+            first = _converter(tmp_path).convert(source, "aiff", output_dir=first_dir)
+            second = _converter(tmp_path).convert(source, "aiff", output_dir=second_dir)
+
+        assert run.call_count == 1
+        assert second.success and second.cached
+        assert second.output_path == second_dir / "song.aiff"
+        assert second.output_path.read_bytes() == first.output_path.read_bytes()
+
+    def test_changed_output_is_not_reused(self, tmp_path):
+        """Test that an output modified since the conversion is not trusted."""
+        source = tmp_path / "song.flac"
+        source.write_bytes(b"flac data")
+
+        with patch("subprocess.run", side_effect=_fake_ffmpeg):
+            first = _converter(tmp_path).convert(source, "aiff")
+            first.output_path.write_bytes(b"edited by hand")
+            second = _converter(tmp_path).convert(source, "aiff")
+
+        assert not second.success
+        assert "already exists" in second.error_message
+
+    def test_same_audio_elsewhere_hits_cache(self, tmp_path):
+        """Test that the key is the source content, not its path."""
+        cache = ConversionCache(tmp_path / "conversions.db")
+        params = conversion_params("aiff", {"codec": "pcm_s16be"})
+        original = tmp_path / "a.flac"
+        copy = tmp_path / "b.flac"
+        output = tmp_path / "a.aiff"
+        original.write_bytes(b"x" * 300_000)
+        copy.write_bytes(b"x" * 300_000)
+        output.write_bytes(b"out")
+
+        cache.store(original, params, output)
+
+        assert cache.lookup(copy, params) == output.resolve()
+        assert cache.lookup(copy, conversion_params("flac", {"codec": "flac"})) is None
+
+    def test_changed_source_misses(self, tmp_path):
+        """Test that editing the source invalidates its entry."""
+        cache = ConversionCache(tmp_path / "conversions.db")
+        params = conversion_params("aiff", {"codec": "pcm_s16be"})
+        source = tmp_path / "a.flac"
+        output = tmp_path / "a.aiff"
+        source.write_bytes(b"original")
+        output.write_bytes(b"out")
+        cache.store(source, params, output)
+
+        source.write_bytes(b"re-encoded")
+        os.utime(source, ns=(1, 1))
+
+        assert cache.lookup(source, params) is None
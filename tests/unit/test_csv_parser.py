@@ -0,0 +1,75 @@
+"""Tests for the CSV mapping parser."""
+import pytest
+
+from src.lib.csv_parser import CSVParser, CSVRowError, TrackMapping
+
+
+def _write_csv(path, rows):
+    path.write_text("rekordboxId,artist,song title,file path\n" + "".join(rows), encoding="utf-8")
+    return str(path)
+
+
+class TestIterParse:
+    """Test suite for lazy CSV parsing."""
+
+    def test_yields_mappings_with_file_info(self, tmp_path):
+        """Test that rows carry resolved path, existence and size."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"12345")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"1,Artist,Song,{audio}\n",
+            f"2,Artist,Missing,{tmp_path / 'missing.mp3'}\n",
+        ])
+
+        first, second = CSVParser().iter_parse(csv_path)
+
+        assert first.rekordbox_id == 1 and first.file_exists and first.file_size == 5
+        assert first.row_num == 2
+        assert not second.file_exists and second.file_size == 0
+
+    def test_bad_row_does_not_abort(self, tmp_path):
+        """Test that an invalid row is yielded as an error between good rows."""
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            "1,A,One,/music/one.mp3\n",
+            "x,B,Two,/music/two.mp3\n",
+            "3,C,Three,/music/three.mp3\n",
+        ])
+
+        items = list(CSVParser().iter_parse(csv_path, stat_batch_size=2))
+
+        assert [type(i) for i in items] == [TrackMapping, CSVRowError, TrackMapping]
+        assert items[1].row_num == 3
+        assert items[1].artist == "B"
+        assert "Invalid Rekordbox ID" in items[1].message
+
+    def test_is_lazy(self, tmp_path):
+        """Test that only the first batch is read before the first row."""
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"{i},Artist,Song {i},/music/{i}.mp3\n" for i in range(1, 1001)
+        ])
+        parser = CSVParser()
+        calls = []
+        original = parser._resolve_path
+        parser._resolve_path = lambda m, *args: (calls.append(m.row_num), original(m, *args))
+
+        rows = parser.iter_parse(csv_path, stat_batch_size=10)
+        first = next(rows)
+
+        assert first.rekordbox_id == 1
+        assert len(calls) == 10
+        rows.close()
+
+    def test_header_errors_raise_immediately(self, tmp_path):
+        """Test that missing columns fail before any row is read."""
+        path = tmp_path / "map.csv"
+        path.write_text("artist,title\nA,B\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="file_path"):
+            CSVParser().iter_parse(str(path))
+
+    def test_parse_still_raises_on_bad_row(self, tmp_path):
+        """Test that the list-based parse keeps failing on the first bad row."""
+        csv_path = _write_csv(tmp_path / "map.csv", [",A,,/music/a.mp3\n"])
+
+        with pytest.raises(ValueError, match="Error parsing row 2"):
+            CSVParser().parse(csv_path)
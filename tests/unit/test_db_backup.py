@@ -0,0 +1,96 @@
+"""Tests for deduplicated database backups."""
+import os
+from unittest.mock import patch
+
+from src.services import db_backup
+from src.services.db_backup import DatabaseBackups, copy_file
+
+
+def _database(tmp_path, content=b"sqlite page data"):
+    db_path = tmp_path / "master.db"
+    db_path.write_bytes(content)
+    return db_path
+
+
+class TestDatabaseBackups:
+    """Test suite for backup deduplication and retention."""
+
+    def test_first_backup_copies(self, tmp_path):
+        """Test that the first backup copies the database with its mtime."""
+        db_path = _database(tmp_path)
+
+        result = DatabaseBackups(db_path).backup()
+
+        assert not result.reused
+        assert result.method in ("reflink", "copy")
+        assert result.path.name.startswith("master.backup.")
+        assert result.path.read_bytes() == db_path.read_bytes()
+        assert result.path.stat().st_mtime_ns == db_path.stat().st_mtime_ns
+
+    def test_unchanged_database_reuses_backup(self, tmp_path):
+        """Test that a second backup of the same database copies nothing."""
+        db_path = _database(tmp_path)
+        backups = DatabaseBackups(db_path)
+        first = backups.backup()
+
+        with patch.object(db_backup, "copy_file") as copy:
+            second = backups.backup()
+
+        assert second.reused
+        assert second.path == first.path
+        copy.assert_not_called()
+
+    def test_touched_but_identical_database_reuses_backup(self, tmp_path):
+        """Test that a new mtime alone falls back to comparing hashes."""
+        db_path = _database(tmp_path)
+        backups = DatabaseBackups(db_path)
+        first = backups.backup()
+        os.utime(db_path, ns=(1_700_000_000 * 10**9, 1_700_000_000 * 10**9))
+
+        second = backups.backup()
+
+        assert second.reused
+        assert second.path == first.path
+        assert backups.list_backups() == [first.path]
+
+    def test_changed_database_gets_new_backup(self, tmp_path):
+        """Test that a modified database is copied again."""
+        db_path = _database(tmp_path)
+        backups = DatabaseBackups(db_path)
+        first = backups.backup()
+        db_path.write_bytes(b"sqlite page DATA")  # Same size, new content
+        os.utime(db_path, ns=(1_700_000_000 * 10**9, 1_700_000_000 * 10**9))
+
+        second = backups.backup()
+
+        assert not second.reused
+        assert second.path != first.path
+        assert second.path.read_bytes() == b"sqlite page DATA"
+
+    def test_retention_deletes_oldest(self, tmp_path):
+        """Test that only the newest backups are kept."""
+        db_path = _database(tmp_path)
+        for stamp in ("20240101_000000", "20240102_000000", "20240103_000000"):
+            (tmp_path / f"master.backup.{stamp}.db").write_bytes(b"old")
+        backups = DatabaseBackups(db_path, keep=2)
+
+        result = backups.backup()
+
+        names = [path.name for path in backups.list_backups()]
+        assert names == ["master.backup.20240103_000000.db", result.path.name]
+
+
+class TestCopyFile:
+    """Test suite for the copy fallback."""
+
+    def test_falls_back_to_plain_copy(self, tmp_path):
+        """Test that an unsupported reflink falls back to copying."""
+        source = _database(tmp_path)
+        target = tmp_path / "copy.db"
+
+        with patch.object(db_backup, "_reflink", return_value=False):
+            method = copy_file(source, target)
+
+        assert method == "copy"
+        assert target.read_bytes() == source.read_bytes()
+        assert not (tmp_path / "copy.db.partial").exists()
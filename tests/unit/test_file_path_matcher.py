@@ -0,0 +1,165 @@
+"""Tests for the file path matcher service."""
+import os
+from pathlib import Path
+
+from src.models.track_record import TrackRecord
+from src.services.file_path_matcher import MUSIC_EXTENSIONS, FilePathMatcher, iter_music_files
+
+FILES = [
+    "Objekt - Ganzfeld.mp3",
+    "Blawan - Why They Hide Their Bodies Under My Garage.flac",
+    "Surgeon - Badger Bite (Original Mix).wav",
+    "Surgeon - Badger Bite (Dub).aiff",
+    "Robert Hood - Minus.mp3",
+    "01 Minus.mp3",
+    "Nina Kraviz - Ghetto Kraviz.m4a",
+    "notes.txt",
+]
+
+TRACKS = [
+    ("Objekt", "Ganzfeld"),
+    ("Blawan", "Why They Hide Their Bodies Under My Garage?"),
+    ("Surgeon", "Badger Bite"),
+    ("Robert Hood", "Minus"),
+    ("Robert Hood", "Minus (Remastered)"),
+    ("Nina Kraviz", "Ghetto Kraviz"),
+    ("Unknown", "Nothing Alike"),
+]
+
+
+def _matcher(tmp_path, **kwargs):
+    for name in FILES:
+        (tmp_path / name).write_text("x")
+    matcher = FilePathMatcher(similarity_threshold=0.6, **kwargs)
+    matcher.tracks = [
+        TrackRecord(rekordbox_id=str(i), artist=artist, title=title, streaming="Yes")
+        for i, (artist, title) in enumerate(TRACKS)
+    ]
+    matcher.music_files = sorted(
+        matcher.scan_music_files(str(tmp_path)), key=lambda f: f.file_path
+    )
+    return matcher
+
+
+def _outcome(matcher):
+    return [(t.matched_file_path, t.confidence_score) for t in matcher.tracks]
+
+
+class TestFilePathMatcher:
+    """Test suite for track-to-file matching."""
+
+    def test_scan_skips_non_music_files(self, tmp_path):
+        """Test that only audio extensions are collected."""
+        matcher = _matcher(tmp_path)
+        assert len(matcher.music_files) == len(FILES) - 1
+        assert all(not f.filename.endswith(".txt") for f in matcher.music_files)
+
+    def test_matches_expected_files(self, tmp_path):
+        """Test that tracks pick the file named after them."""
+        matcher = _matcher(tmp_path)
+        matcher.match_tracks_to_files()
+
+        matched = {t.title: t.matched_file_path for t in matcher.tracks}
+        assert matched["Ganzfeld"].endswith("Objekt - Ganzfeld.mp3")
+        assert matched["Nothing Alike"] is None
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test that worker processes produce identical results."""
+        serial = _matcher(tmp_path)
+        serial_count = serial.match_tracks_to_files()
+
+        parallel = _matcher(tmp_path, workers=2)
+        parallel_count = parallel.match_tracks_to_files()
+
+        assert parallel_count == serial_count
+        assert _outcome(parallel) == _outcome(serial)
+        assert parallel.duplicate_files_resolved == serial.duplicate_files_resolved
+
+    def test_index_prefilter_matches_full_scan(self, tmp_path):
+        """Test that pre-filtered candidates give the same best files."""
+        matcher = _matcher(tmp_path)
+        indexed = [matcher._find_best_file(t) for t in matcher.tracks]
+
+        full_scan = []
+        for track in matcher.tracks:
+            best = None
+            for i, music_file in enumerate(matcher.music_files):
+                similarity = matcher._calculate_similarity(track, music_file)
+                if similarity >= matcher.similarity_threshold and (best is None or similarity > best[1]):
+                    best = (i, similarity)
+            full_scan.append(best)
+
+        assert indexed == full_scan
+
+    def test_title_candidates_drop_only_gated_files(self, tmp_path):
+        """Test that every skipped file fails the title similarity gate."""
+        matcher = _matcher(tmp_path)
+        index = matcher._get_file_index()
+
+        for track in matcher.tracks:
+            title = matcher._clean_track_info(track.title)
+            candidates = set(index.title_candidates(title, frozenset(title.split())))
+            for i, music_file in enumerate(matcher.music_files):
+                if i not in candidates:
+                    assert matcher._calculate_title_similarity(title, music_file.filename_clean) < 0.3
+            assert len(candidates) < len(matcher.music_files)
+
+
+class TestIterMusicFiles:
+    """Test suite for the concurrent directory scanner."""
+
+    def _walk(self, scan_dir):
+        """Reference os.walk scan (the scanner's previous implementation)."""
+        found = []
+        for root, _, files in os.walk(Path(scan_dir)):
+            for file in files:
+                file_path = Path(root) / file
+                if file_path.suffix.lower() in MUSIC_EXTENSIONS:
+                    found.append((str(file_path), file_path.name))
+        return found
+
+    def test_same_files_and_order_as_os_walk(self, tmp_path):
+        """Test that nested directories are yielded in os.walk order."""
+        for path in [
+            "a/1.mp3", "a/b/2.FLAC", "a/b/c/3.wav", "a/b/cover.jpg",
+            "d/4.aiff", "d/.mp3", "d/noext", "5.m4a", "e/f/6.ogg",
+        ]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("x")
+
+        scanned = [(f.file_path, f.filename) for f in iter_music_files(str(tmp_path), threads=3)]
+
+        assert scanned == self._walk(tmp_path)
+        assert len(scanned) == 6
+
+    def test_does_not_follow_directory_symlinks(self, tmp_path):
+        """Test that symlinked directories are skipped like os.walk does."""
+        (tmp_path / "real").mkdir()
+        (tmp_path / "real" / "song.mp3").write_text("x")
+        os.symlink(tmp_path / "real", tmp_path / "link")
+
+        scanned = [f.filename for f in iter_music_files(str(tmp_path))]
+
+        assert scanned == ["song.mp3"]
+
+
+class TestAssignment:
+    """Test suite for one-to-one track/file assignment in the matcher."""
+
+    def test_recovers_track_losing_duplicate_file(self, tmp_path):
+        """Test that a track losing its best file falls back to another."""
+        for name in ["Artist - Song.mp3", "Artist - Song (Live).mp3"]:
+            (tmp_path / name).write_text("x")
+        matcher = FilePathMatcher(similarity_threshold=0.6)
+        matcher.tracks = [
+            TrackRecord(rekordbox_id="1", artist="Artist", title="Song", streaming="Yes"),
+            TrackRecord(rekordbox_id="2", artist="Artist", title="Song", streaming="Yes"),
+        ]
+        matcher.music_files = matcher.scan_music_files(str(tmp_path))
+
+        assert matcher.match_tracks_to_files() == 2
+        assert matcher.duplicate_files_resolved == 1
+        assert matcher.tracks_recovered == 1
+        assert {t.matched_file_path for t in matcher.tracks} == {
+            f.file_path for f in matcher.music_files
+        }
@@ -0,0 +1,81 @@
+"""Tests for fuzzy artist/title matching."""
+import random
+
+import pytest
+
+from src.lib.fuzzy_matcher import FuzzyMatcher, TrackIndex
+from src.models.track import Track
+
+
+def _brute_force(matcher, artist, title, tracks):
+    """Reference implementation: score every track."""
+    scored = []
+    for track in tracks:
+        similarity = matcher.calculate_similarity(
+            artist, title, track.artist or '', track.title or ''
+        )
+        if similarity >= matcher.threshold:
+            scored.append((similarity, track.id))
+    scored.sort(key=lambda c: c[0], reverse=True)
+    return scored
+
+
+def _library(size=300, seed=7):
+    rng = random.Random(seed)
+    words = ["deep", "night", "acid", "dream", "love", "warehouse", "echo",
+             "sunrise", "bass", "groove", "(original mix)", "[remastered]",
+             "dub", "tension", "hypnotic", "velvet", "loop"]
+    artists = ["DJ Koze", "Ben Klock", "Nina Kraviz", "Surgeon", "Robert Hood",
+               "Objekt", "Peggy Gou", "Ø [Phase]", "Blawan", "Kerri Chandler"]
+    tracks = []
+    for i in range(size):
+        title = " ".join(rng.sample(words, rng.randint(1, 4)))
+        tracks.append(Track(id=i, artist=rng.choice(artists), title=title, folder_path=""))
+    tracks.append(Track(id=size, artist="", title="", folder_path=""))
+    return tracks
+
+
+class TestFuzzyMatcherIndex:
+    """Test suite for index-backed matching."""
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.5, 0.7, 0.75, 0.9])
+    def test_index_matches_full_scan(self, threshold):
+        """Test that indexed lookups return the same best match as a full scan."""
+        tracks = _library()
+        matcher = FuzzyMatcher(threshold)
+        index = matcher.build_index(tracks)
+        queries = [(t.artist, t.title) for t in tracks[::17]] + [
+            ("Surgeon", "acid loop dub"), ("Unknown", "nothing alike"), ("", ""),
+        ]
+
+        for artist, title in queries:
+            expected = _brute_force(matcher, artist, title, tracks)
+            match = matcher.find_best_match(artist, title, index)
+
+            if not expected:
+                assert match is None
+                continue
+            assert (match.similarity, match.track_id) == expected[0]
+            ambiguous = len(expected) > 1 and expected[0][0] - expected[1][0] < 0.05
+            assert match.ambiguous == ambiguous
+
+    def test_accepts_plain_track_list(self):
+        """Test that a list of tracks still works without a prebuilt index."""
+        tracks = [Track(id=1, artist="Objekt", title="Ganzfeld", folder_path="")]
+        matcher = FuzzyMatcher(0.75)
+
+        match = matcher.find_best_match("Objekt", "Ganzfeld (Original Mix)", tracks)
+
+        assert match.track_id == 1
+
+    def test_index_only_lists_tracks_sharing_words(self):
+        """Test that candidate blocking uses the inverted word index."""
+        tracks = [
+            Track(id=1, artist="Objekt", title="Ganzfeld", folder_path=""),
+            Track(id=2, artist="Blawan", title="Why They Hide", folder_path=""),
+        ]
+        index = FuzzyMatcher().build_index(tracks)
+
+        assert isinstance(index, TrackIndex)
+        assert index.candidates({"ganzfeld"}) == [0]
+        assert index.candidates({"blawan", "objekt"}) == [0, 1]
@@ -0,0 +1,62 @@
+"""Tests for the link-local checkpoint file."""
+from pathlib import Path
+
+from src.lib.csv_parser import TrackMapping
+from src.services.link_checkpoint import (
+    COMMITTED, CONVERTED, CheckpointEntry, LinkCheckpoint, default_checkpoint_path,
+)
+
+
+def _mapping(row_num, file_path):
+    return TrackMapping(artist="A", title="T", file_path=Path(file_path), row_num=row_num)
+
+
+class TestLinkCheckpoint:
+    """Test suite for LinkCheckpoint."""
+
+    def test_default_path_next_to_csv(self, tmp_path):
+        """Test that the checkpoint sits next to the CSV."""
+        assert default_checkpoint_path(tmp_path / "tracks.csv") == tmp_path / "tracks.checkpoint.csv"
+
+    def test_round_trip_latest_status_wins(self, tmp_path):
+        """Test that a reload sees the last recorded status of each row."""
+        checkpoint = LinkCheckpoint(tmp_path / "c.csv")
+        checkpoint.record([CheckpointEntry(2, "/a.flac", 7, CONVERTED, "/a.aiff", 5, "aiff")])
+        checkpoint.record([CheckpointEntry(2, "/a.flac", 7, COMMITTED)])
+        checkpoint.record([CheckpointEntry(3, "/b.flac", None, CONVERTED, "/b.aiff", 9, "aiff")])
+
+        loaded = LinkCheckpoint(tmp_path / "c.csv")
+        assert loaded.load() == 2
+        assert loaded.get(_mapping(2, "/a.flac")).status == COMMITTED
+        entry = loaded.get(_mapping(3, "/b.flac"))
+        assert (entry.track_id, entry.output_path, entry.output_size) == (None, "/b.aiff", 9)
+
+    def test_row_with_other_file_not_matched(self, tmp_path):
+        """Test that an edited CSV row does not inherit progress."""
+        checkpoint = LinkCheckpoint(tmp_path / "c.csv")
+        checkpoint.record([CheckpointEntry(2, "/a.flac", 7, COMMITTED)])
+
+        assert checkpoint.get(_mapping(2, "/other.flac")) is None
+
+    def test_truncated_line_ignored(self, tmp_path):
+        """Test that a line cut short by a crash is skipped."""
+        path = tmp_path / "c.csv"
+        LinkCheckpoint(path).record([CheckpointEntry(2, "/a.flac", 7, COMMITTED)])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("3,/b.flac,")
+
+        checkpoint = LinkCheckpoint(path)
+        assert checkpoint.load() == 1
+
+        # Progress recorded after the crash is still readable
+        checkpoint.record([CheckpointEntry(4, "/c.flac", 9, COMMITTED)])
+        assert LinkCheckpoint(path).load() == 2
+
+    def test_reset_discards_progress(self, tmp_path):
+        """Test that reset removes the file."""
+        checkpoint = LinkCheckpoint(tmp_path / "c.csv")
+        checkpoint.record([CheckpointEntry(2, "/a.flac", 7, COMMITTED)])
+        checkpoint.reset()
+
+        assert not checkpoint.path.exists()
+        assert checkpoint.load() == 0
@@ -0,0 +1,416 @@
+"""Tests for the link-local orchestration service."""
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.models.track import Track
+from src.services.link_local_service import LinkLocalService
+
+
+def _write_csv(path, rows):
+    path.write_text("rekordboxId,artist,song title,file path\n" + "".join(rows), encoding="utf-8")
+    return path
+
+
+def _adapter(tracks):
+    adapter = Mock()
+    adapter.get_tracks_by_ids.side_effect = lambda ids: {
+        i: tracks[i] for i in ids if i in tracks
+    }
+    adapter.get_track_by_id.return_value = None
+    adapter.apply_link_batch.return_value = True
+    return adapter
+
+
+def _streaming_track(track_id, artist, title):
+    return Track(id=track_id, title=title, artist=artist, folder_path="", file_size=0)
+
+
+class TestStreamingExecute:
+    """Test suite for processing CSV rows as they are parsed."""
+
+    def test_bad_row_becomes_error_and_processing_continues(self, tmp_path):
+        """Test that an unparseable row does not stop the run."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"x")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"1,A,One,{audio}\n",
+            f"oops,B,Two,{audio}\n",
+            f"3,C,Three,{audio}\n",
+        ])
+        adapter = _adapter({1: _streaming_track(1, "A", "One"), 3: _streaming_track(3, "C", "Three")})
+
+        service = LinkLocalService(csv_path, adapter, dry_run=True)
+        results = service.execute()
+
+        assert [r.action for r in results] == ["updated", "error", "updated"]
+        assert "Invalid Rekordbox ID" in results[1].reason
+        assert service.error_count == 1
+        assert service.updated_count == 2
+
+    def test_tracks_prefetched_per_batch(self, tmp_path):
+        """Test that database lookups are batched as rows stream in."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"x")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"{i},A,Song {i},{audio}\n" for i in range(1, 6)
+        ])
+        adapter = _adapter({i: _streaming_track(i, "A", f"Song {i}") for i in range(1, 6)})
+
+        with patch("src.services.link_local_service.PROCESS_BATCH_SIZE", 2):
+            results = LinkLocalService(csv_path, adapter, dry_run=True).execute()
+
+        assert len(results) == 5
+        assert [call.args[0] for call in adapter.get_tracks_by_ids.call_args_list] == [
+            [1, 2], [3, 4], [5]
+        ]
+
+    def test_limit_stops_reading(self, tmp_path):
+        """Test that --limit processes only the first rows."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"x")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"{i},A,Song {i},{audio}\n" for i in range(1, 6)
+        ])
+        adapter = _adapter({i: _streaming_track(i, "A", f"Song {i}") for i in range(1, 6)})
+
+        results = LinkLocalService(csv_path, adapter, dry_run=True, limit=2).execute()
+
+        assert len(results) == 2
+
+
+class TestBackgroundConversion:
+    """Test suite for conversions overlapping with row processing."""
+
+    def test_converted_files_are_linked(self, tmp_path):
+        """Test that every track is written with its converted file."""
+        csv_rows = []
+        tracks = {}
+        for i in range(1, 5):
+            source = tmp_path / f"song{i}.flac"
+            source.write_bytes(b"flac")
+            csv_rows.append(f"{i},A,Song {i},{source}\n")
+            tracks[i] = _streaming_track(i, "A", f"Song {i}")
+        csv_path = _write_csv(tmp_path / "map.csv", csv_rows)
+        adapter = _adapter(tracks)
+
+        def fake_run(cmd, **kwargs):
+            from pathlib import Path
+            Path(cmd[-1]).write_bytes(b"aiff!")
+            return Mock(returncode=0, stderr="")
+
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"), \
+                patch("subprocess.run", side_effect=fake_run):
+            service = LinkLocalService(
+                csv_path, adapter, dry_run=False, convert_format="aiff", conversion_workers=2
+            )
+            results = service.execute()
+
+        assert [r.track_mapping.rekordbox_id for r in results] == [1, 2, 3, 4]
+        assert all(r.action == "converted" for r in results)
+        updates = adapter.apply_link_batch.call_args.args[0]
+        assert sorted(u.track_id for u in updates) == [1, 2, 3, 4]
+        assert all(str(u.file_path).endswith(".aiff") and u.file_size == 5 for u in updates)
+        assert service.converted_count == 4
+
+    def test_pcm_source_keeps_bit_depth(self, tmp_path):
+        """Test that a 24-bit WAV linked as AIFF is rewritten as 24-bit PCM."""
+        source = tmp_path / "song.wav"
+        source.write_bytes(b"wav")
+        csv_path = _write_csv(tmp_path / "map.csv", [f"1,A,Song,{source}\n"])
+        adapter = _adapter({1: _streaming_track(1, "A", "Song")})
+        ffmpeg_cmds = []
+
+        def fake_run(cmd, **kwargs):
+            from pathlib import Path
+            if cmd[0].endswith("ffprobe"):
+                return Mock(returncode=0, stdout='{"streams": [{"codec_name": "pcm_s24le"}]}')
+            ffmpeg_cmds.append(cmd)
+            Path(cmd[-1]).write_bytes(b"aiff!")
+            return Mock(returncode=0, stderr="")
+
+        with patch("shutil.which", side_effect=lambda x: "/usr/bin/" + x), \
+                patch("subprocess.run", side_effect=fake_run):
+            service = LinkLocalService(
+                csv_path, adapter, dry_run=False, convert_format="aiff",
+                conversion_cache_path=tmp_path / "cache.db"
+            )
+            results = service.execute()
+
+        assert [r.action for r in results] == ["converted"]
+        assert len(ffmpeg_cmds) == 1
+        assert ffmpeg_cmds[0][ffmpeg_cmds[0].index("-codec:a") + 1] == "pcm_s24be"
+
+
+class TestCheckpointResume:
+    """Test suite for resuming interrupted runs from the checkpoint."""
+
+    def test_resume_skips_committed_rows(self, tmp_path):
+        """Test that rows committed before a crash are not processed again."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"x")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"{i},A,Song {i},{audio}\n" for i in range(1, 6)
+        ])
+        tracks = {i: _streaming_track(i, "A", f"Song {i}") for i in range(1, 6)}
+        checkpoint = tmp_path / "map.checkpoint.csv"
+
+        adapter = _adapter(tracks)
+        adapter.apply_link_batch.side_effect = [True, KeyboardInterrupt()]
+        with patch("src.services.link_local_service.CHECKPOINT_COMMIT_SIZE", 2):
+            service = LinkLocalService(csv_path, adapter, dry_run=False, checkpoint_path=checkpoint)
+            try:
+                service.execute()
+            except KeyboardInterrupt:
+                pass
+
+        adapter = _adapter(tracks)
+        service = LinkLocalService(
+            csv_path, adapter, dry_run=False, checkpoint_path=checkpoint, resume=True
+        )
+        results = service.execute()
+
+        assert [r.track_mapping.rekordbox_id for r in results] == [3, 4, 5]
+        assert adapter.get_tracks_by_ids.call_args.args[0] == [3, 4, 5]
+        assert service.resumed_count == 2
+
+        # A fresh run starts over
+        service = LinkLocalService(csv_path, _adapter(tracks), dry_run=False, checkpoint_path=checkpoint)
+        assert len(service.execute()) == 5
+
+    def test_resume_reuses_finished_conversions(self, tmp_path):
+        """Test that conversions finished before a crash are linked without converting again."""
+        csv_rows = []
+        tracks = {}
+        for i in range(1, 4):
+            source = tmp_path / f"song{i}.flac"
+            source.write_bytes(b"flac")
+            csv_rows.append(f"{i},A,Song {i},{source}\n")
+            tracks[i] = _streaming_track(i, "A", f"Song {i}")
+        csv_path = _write_csv(tmp_path / "map.csv", csv_rows)
+        checkpoint = tmp_path / "map.checkpoint.csv"
+
+        def fake_run(cmd, **kwargs):
+            from pathlib import Path
+            Path(cmd[-1]).write_bytes(b"aiff!")
+            return Mock(returncode=0, stderr="")
+
+        adapter = _adapter(tracks)
+        adapter.apply_link_batch.side_effect = KeyboardInterrupt()
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"), \
+                patch("subprocess.run", side_effect=fake_run):
+            service = LinkLocalService(
+                csv_path, adapter, dry_run=False, convert_format="aiff", checkpoint_path=checkpoint
+            )
+            try:
+                service.execute()
+            except KeyboardInterrupt:
+                pass
+
+        adapter = _adapter(tracks)
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"), \
+                patch("subprocess.run") as run:
+            service = LinkLocalService(
+                csv_path, adapter, dry_run=False, convert_format="aiff",
+                checkpoint_path=checkpoint, resume=True
+            )
+            results = service.execute()
+
+        run.assert_not_called()
+        assert all(r.action == "converted" for r in results)
+        updates = adapter.apply_link_batch.call_args.args[0]
+        assert sorted(u.track_id for u in updates) == [1, 2, 3]
+        assert all(str(u.file_path).endswith(".aiff") and u.file_size == 5 for u in updates)
+
+
+class TestLinkPlan:
+    """Test suite for saving a dry run as a plan and applying it."""
+
+    def _dry_run(self, tmp_path, **kwargs):
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"x")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"1,A,One,{audio}\n",
+            f"2,A,Wrong,{audio}\n",
+            f"3,A,Three,{audio}\n",
+        ])
+        tracks = {
+            1: _streaming_track(1, "A", "One"),
+            2: _streaming_track(2, "A", "Two"),
+            3: _streaming_track(3, "A", "Three"),
+        }
+        plan_path = tmp_path / "plan.json"
+        LinkLocalService(csv_path, _adapter(tracks), dry_run=True, plan_path=plan_path, **kwargs).execute()
+        return audio, csv_path, tracks, plan_path
+
+    def test_apply_plan_writes_reviewed_updates(self, tmp_path):
+        """Test that the planned updates are written without reading the CSV."""
+        from src.services.link_plan import LinkPlan
+
+        audio, csv_path, tracks, plan_path = self._dry_run(tmp_path, force_reanalyze=False)
+        csv_path.unlink()
+
+        plan = LinkPlan.load(plan_path)
+        assert [entry.action for entry in plan.entries] == ["updated", "skipped", "updated"]
+        assert plan.settings["force_reanalyze"] is False
+
+        adapter = _adapter(tracks)
+        service = LinkLocalService(csv_path, adapter, dry_run=False, plan=plan, **plan.settings)
+        results = service.execute()
+
+        assert [r.track_mapping.row_num for r in results] == [2, 4]
+        assert adapter.get_tracks_by_ids.call_args.args[0] == [1, 3]
+        updates = adapter.apply_link_batch.call_args.args[0]
+        assert [(u.track_id, u.file_size, u.reanalyze) for u in updates] == [(1, 1, False), (3, 1, False)]
+        assert all(str(u.file_path) == str(audio.resolve()) for u in updates)
+
+    def test_changed_file_refused(self, tmp_path):
+        """Test that a file modified since the dry run is not linked."""
+        from src.services.link_plan import LinkPlan
+
+        audio, csv_path, tracks, plan_path = self._dry_run(tmp_path)
+        audio.write_bytes(b"changed")
+
+        adapter = _adapter(tracks)
+        results = LinkLocalService(csv_path, adapter, dry_run=False, plan=LinkPlan.load(plan_path)).execute()
+
+        assert [r.reason for r in results] == ["File changed since plan"] * 2
+        adapter.apply_link_batch.assert_not_called()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        """Test that a file that is not a plan is refused."""
+        from src.services.link_plan import LinkPlan
+
+        path = tmp_path / "plan.json"
+        path.write_text('{"version": 99}', encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            LinkPlan.load(path)
+
+
+class TestPipeline:
+    """Test suite for the staged pipeline executor."""
+
+    def _rows(self, tmp_path, count, suffix="mp3"):
+        csv_rows = []
+        tracks = {}
+        for i in range(1, count + 1):
+            source = tmp_path / f"song{i}.{suffix}"
+            source.write_bytes(b"audio")
+            csv_rows.append(f"{i},A,Song {i},{source}\n")
+            tracks[i] = _streaming_track(i, "A", f"Song {i}")
+        return _write_csv(tmp_path / "map.csv", csv_rows), tracks
+
+    def test_same_results_as_serial(self, tmp_path, capsys):
+        """Test that the pipeline produces the serial results, one output block per row."""
+        csv_path, tracks = self._rows(tmp_path, 6)
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write("oops,B,Bad,/nowhere.mp3\n")
+        tracks[3] = _streaming_track(3, "A", "Other title")
+
+        serial = LinkLocalService(csv_path, _adapter(tracks), dry_run=True).execute()
+        capsys.readouterr()
+        service = LinkLocalService(csv_path, _adapter(tracks), dry_run=True, pipeline=True)
+        piped = service.execute()
+        out = capsys.readouterr().out
+
+        assert [(r.track_mapping.row_num, r.action, r.reason) for r in piped] == [
+            (r.track_mapping.row_num, r.action, r.reason) for r in serial
+        ]
+        assert out.index("[3] → A - Song 3") < out.index("Artist/title mismatch") < out.index("[4] ")
+        assert service.stage_stats["match"].items == 7
+        assert service.stage_stats["write"].items == 5
+        assert "Pipeline stages" in out
+
+    def test_conversions_written_by_single_writer(self, tmp_path):
+        """Test that converted rows are written in one batch after their conversions."""
+        csv_path, tracks = self._rows(tmp_path, 5, suffix="flac")
+        adapter = _adapter(tracks)
+
+        def fake_run(cmd, **kwargs):
+            from pathlib import Path
+            Path(cmd[-1]).write_bytes(b"aiff!")
+            return Mock(returncode=0, stderr="")
+
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"), \
+                patch("subprocess.run", side_effect=fake_run):
+            service = LinkLocalService(
+                csv_path, adapter, dry_run=False, convert_format="aiff",
+                conversion_workers=3, pipeline=True
+            )
+            results = service.execute()
+
+        assert [r.action for r in results] == ["converted"] * 5
+        assert adapter.apply_link_batch.call_count == 1
+        updates = adapter.apply_link_batch.call_args.args[0]
+        assert sorted(u.track_id for u in updates) == [1, 2, 3, 4, 5]
+        assert all(str(u.file_path).endswith(".aiff") for u in updates)
+        assert service.stage_stats["convert"].items == 5
+        assert service.stage_stats["convert"].workers == 3
+
+    def test_strict_stops_at_first_error(self, tmp_path):
+        """Test that strict mode stops the pipeline after the first error."""
+        csv_path, tracks = self._rows(tmp_path, 50)
+        del tracks[2]
+        adapter = _adapter(tracks)
+
+        service = LinkLocalService(csv_path, adapter, dry_run=False, strict=True, pipeline=True)
+        results = service.execute()
+
+        assert [r.action for r in results] == ["updated", "error"]
+        assert [u.track_id for u in adapter.apply_link_batch.call_args.args[0]] == [1]
+
+    def test_stage_failure_still_writes_finished_rows(self, tmp_path):
+        """Test that rows validated before a stage thread fails are written before it is raised."""
+        csv_path, tracks = self._rows(tmp_path, 5)
+        adapter = _adapter(tracks)
+        service = LinkLocalService(csv_path, adapter, dry_run=False, pipeline=True)
+        match_stage = service._match_stage
+
+        def failing_match(job):
+            if job.mapping.rekordbox_id == 3:
+                raise RuntimeError("matcher crashed")
+            return match_stage(job)
+
+        service._match_stage = failing_match
+        with pytest.raises(RuntimeError, match="matcher crashed"):
+            service.execute()
+
+        assert adapter.apply_link_batch.call_count == 1
+        assert [u.track_id for u in adapter.apply_link_batch.call_args.args[0]] == [1, 2]
+        assert service.pending_updates == []
+
+    def test_limit(self, tmp_path):
+        """Test that --limit reads only the first rows."""
+        csv_path, tracks = self._rows(tmp_path, 10)
+
+        service = LinkLocalService(csv_path, _adapter(tracks), dry_run=True, limit=3, pipeline=True)
+        results = service.execute()
+
+        assert [r.track_mapping.rekordbox_id for r in results] == [1, 2, 3]
+        assert service.stage_stats["read"].items == 3
+
+
+class TestDuplicateTrackIds:
+    """Test suite for CSV rows resolving to the same database track."""
+
+    def test_second_row_for_same_track_skipped(self, tmp_path):
+        """Test that a track queued by one row is not linked again by a later row."""
+        first = tmp_path / "a.mp3"
+        second = tmp_path / "b.mp3"
+        first.write_bytes(b"x")
+        second.write_bytes(b"yy")
+        csv_path = _write_csv(tmp_path / "map.csv", [
+            f"1,A,One,{first}\n",
+            f"1,A,One,{second}\n",
+        ])
+        adapter = _adapter({1: _streaming_track(1, "A", "One")})
+
+        service = LinkLocalService(csv_path, adapter, dry_run=False)
+        results = service.execute()
+
+        assert [r.action for r in results] == ["updated", "skipped"]
+        assert results[1].reason == "Already linked in this run"
+        assert service.updated_count == 1
+        updates = adapter.apply_link_batch.call_args.args[0]
+        assert [(u.track_id, u.file_size) for u in updates] == [(1, 1)]
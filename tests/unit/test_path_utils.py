@@ -0,0 +1,63 @@
+"""Tests for path utilities."""
+import os
+from unittest.mock import patch
+
+from src.lib.path_utils import DirectoryCache, normalize_path, stat_path
+
+
+def _reference(path):
+    normalized = normalize_path(path)
+    exists = normalized.exists()
+    return normalized, exists, normalized.stat().st_size if exists else 0
+
+
+class TestStatPath:
+    """Test suite for cached path lookups."""
+
+    def _tree(self, tmp_path):
+        (tmp_path / "music").mkdir()
+        (tmp_path / "other").mkdir()
+        (tmp_path / "music" / "song.mp3").write_bytes(b"abc")
+        (tmp_path / "other" / "target.mp3").write_bytes(b"abcdef")
+        os.symlink(tmp_path / "other" / "target.mp3", tmp_path / "music" / "link.mp3")
+        os.symlink(tmp_path / "music", tmp_path / "music-link")
+        return tmp_path
+
+    def test_matches_normalize_and_stat(self, tmp_path):
+        """Test that results equal normalize_path plus exists/stat."""
+        root = self._tree(tmp_path)
+        paths = [
+            root / "music" / "song.mp3",
+            root / "music" / "missing.mp3",
+            root / "music" / "link.mp3",
+            root / "music-link" / "song.mp3",
+            root / "music" / ".." / "other" / "target.mp3",
+            root / "nowhere" / "song.mp3",
+        ]
+        directories = DirectoryCache()
+
+        for path in paths:
+            assert stat_path(str(path), directories) == _reference(str(path))
+
+    def test_directory_listed_once(self, tmp_path):
+        """Test that many files in one directory share a single listing."""
+        root = self._tree(tmp_path)
+        directories = DirectoryCache()
+
+        with patch("src.lib.path_utils.os.scandir", wraps=os.scandir) as scandir:
+            for name in ["song.mp3", "missing.mp3", "a.mp3", "b.mp3"]:
+                stat_path(str(root / "music" / name), directories)
+
+        assert scandir.call_count == 1
+
+    def test_missing_files_not_stated(self, tmp_path):
+        """Test that names absent from the listing skip the stat call."""
+        root = self._tree(tmp_path)
+        directories = DirectoryCache()
+        directories.get(root / "music")
+
+        with patch("src.lib.path_utils.os.stat") as stat:
+            result = stat_path(str(root / "music" / "missing.mp3"), directories)
+
+        assert result[1:] == (False, 0)
+        stat.assert_not_called()
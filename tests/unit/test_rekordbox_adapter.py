@@ -0,0 +1,356 @@
+"""Tests for RekordboxAdapter track lookups."""
+import sqlite3
+from unittest.mock import Mock, patch
+
+from src.services.rekordbox import LocalLinkUpdate, RekordboxAdapter
+from src.services.undo_journal import UndoJournal
+
+
+def _connected_adapter():
+    adapter = RekordboxAdapter()
+    adapter.db = Mock()
+    adapter.connected = True
+    return adapter
+
+
+def _sqlite_adapter(db_file):
+    """Build an adapter whose raw connections point at a SQLite file."""
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE djmdContent (
+            ID VARCHAR(255) PRIMARY KEY, Title VARCHAR(255), ArtistID VARCHAR(255),
+            FolderPath VARCHAR(255), FileSize INTEGER, ServiceID INTEGER,
+            AnalysisDataPath VARCHAR(255) DEFAULT 'PIONEER/USBANLZ/x.DAT',
+            Analysed INTEGER DEFAULT 105, SearchStr VARCHAR(255) DEFAULT 'x',
+            AnalysisUpdated VARCHAR(255) DEFAULT '2024-01-01'
+        );
+        CREATE TABLE djmdArtist (ID VARCHAR(255) PRIMARY KEY, Name VARCHAR(255));
+        CREATE TABLE djmdSongMyTag (
+            ID VARCHAR(255) PRIMARY KEY, MyTagID VARCHAR(255), ContentID VARCHAR(255)
+        );
+        INSERT INTO djmdArtist VALUES ('100', 'Moon Unit'), ('101', 'Other');
+        INSERT INTO djmdContent (ID, Title, ArtistID, FolderPath, FileSize, ServiceID) VALUES
+            ('1', 'Empty path', '100', '', 0, 0),
+            ('2', 'Local', '101', '/music/local.mp3', 100, 0),
+            ('3', 'Tidal', '100', '/Music/TIDAL/cache/x.mp4', 0, 0),
+            ('4', 'Service', NULL, '/music/service.mp3', 0, 7),
+            ('5', 'Untagged', '999', '', 0, 0);
+        INSERT INTO djmdSongMyTag VALUES
+            ('a', '10', '1'), ('b', '10', '2'), ('c', '20', '3'),
+            ('d', '20', '4'), ('e', '30', '2');
+    """)
+    conn.commit()
+    conn.close()
+
+    adapter = _connected_adapter()
+    adapter.db.engine.raw_connection.side_effect = lambda: sqlite3.connect(db_file)
+    return adapter
+
+
+class TestTrackLookup:
+    """Test suite for ID-based track lookups."""
+
+    def test_get_track_by_id_uses_primary_key_lookup(self, tmp_path):
+        """Test that a single track is fetched by ID without a table scan."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        track = adapter.get_track_by_id(2)
+
+        assert adapter.db.engine.raw_connection.call_count == 1
+        assert track.title == "Local"
+        assert track.artist == "Other"
+        assert sorted(track.my_tag_ids) == ["10", "30"]
+        assert not track.is_streaming
+
+    def test_get_track_by_id_not_found(self, tmp_path):
+        """Test that a missing ID returns None with an error message."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        assert adapter.get_track_by_id(7) is None
+        assert "not found" in adapter.error_message
+
+    def test_get_tracks_by_ids_batches_in_query(self, tmp_path):
+        """Test that several IDs are resolved with chunked IN queries."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        with patch("src.services.rekordbox.ID_LOOKUP_CHUNK_SIZE", 2):
+            tracks = adapter.get_tracks_by_ids([1, 2, 2, 9])
+
+        assert set(tracks) == {1, 2}
+        # 3 unique IDs with a chunk size of 2 -> two queries
+        assert adapter.db.engine.raw_connection.call_count == 2
+
+
+class TestContentSnapshot:
+    """Test suite for the in-memory content snapshot."""
+
+    def test_single_projection_query(self, tmp_path):
+        """Test that the whole library loads in one query, artists and tags included."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        streaming = adapter.get_streaming_tracks()
+        track = adapter.get_track_by_id(1)
+        batch = adapter.get_tracks_by_ids([1, 2])
+
+        assert [t.id for t in streaming] == [1, 3, 4, 5]
+        assert track.artist == "Moon Unit"
+        assert track.my_tag_ids == ["10"]
+        assert set(batch) == {1, 2}
+        snapshot = adapter._content_snapshot
+        # Missing artists (no ArtistID or a dangling one) become empty strings
+        assert snapshot[4].artist == "" and snapshot[5].artist == ""
+        assert snapshot[5].my_tag_ids == []
+        assert adapter.db.engine.raw_connection.call_count == 1
+        adapter.db.get_content.assert_not_called()
+
+    def test_update_patches_snapshot(self, tmp_path):
+        """Test that linking a track updates the cached record."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+        adapter.get_streaming_tracks()
+
+        assert adapter.update_track_to_local(1, "/music/new.aiff", 1234)
+
+        track = adapter.get_track_by_id(1)
+        assert track.folder_path == "/music/new.aiff"
+        assert track.file_size == 1234
+        assert [t.id for t in adapter.get_streaming_tracks()] == [3, 4, 5]
+        # One read for the snapshot, one connection for the write
+        assert adapter.db.engine.raw_connection.call_count == 2
+
+    def test_close_drops_snapshot(self, tmp_path):
+        """Test that closing the connection discards cached content."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+        adapter.get_streaming_tracks()
+
+        adapter.close()
+
+        assert adapter._content_snapshot is None
+
+
+class TestTagQueries:
+    """Test suite for SQL-side MyTag filtering."""
+
+    def _fetch(self, adapter, tag_ids, streaming_only=False):
+        with patch.object(
+            adapter, "get_tracks_by_ids",
+            side_effect=lambda ids: {i: Mock(id=i) for i in ids},
+        ):
+            tracks = adapter.get_tracks_by_mytags(tag_ids, streaming_only=streaming_only)
+        return sorted(t.id for t in tracks)
+
+    def test_filters_by_tag_in_sql(self, tmp_path):
+        """Test that only tracks carrying a requested tag are returned."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        assert self._fetch(adapter, ["10"]) == [1, 2]
+        assert self._fetch(adapter, ["10", "30"]) == [1, 2]
+        assert self._fetch(adapter, ["20"]) == [3, 4]
+
+    def test_streaming_only(self, tmp_path):
+        """Test empty paths, service paths and ServiceID count as streaming."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        assert self._fetch(adapter, ["10", "20"], streaming_only=True) == [1, 3, 4]
+
+    def test_streaming_check_matches_track_model(self, tmp_path):
+        """Test that whitespace-only paths count as streaming, as Track objects do."""
+        db_file = tmp_path / "master.db"
+        adapter = _sqlite_adapter(db_file)
+        conn = sqlite3.connect(db_file)
+        conn.executemany(
+            "INSERT INTO djmdContent (ID, Title, ArtistID, FolderPath, FileSize, ServiceID) "
+            "VALUES (?, 'Blank', '100', ?, 0, 0)",
+            [("6", "\t\n"), ("7", "\u00a0 ")],
+        )
+        conn.executemany(
+            "INSERT INTO djmdSongMyTag VALUES (?, '40', ?)", [("f", "6"), ("g", "7")]
+        )
+        conn.commit()
+        conn.close()
+
+        assert self._fetch(adapter, ["40"], streaming_only=True) == [6, 7]
+        assert all(track.is_streaming for track in adapter.get_tracks_by_ids([6, 7]).values())
+
+    def test_no_tags_returns_empty(self, tmp_path):
+        """Test that an empty tag list does not query the database."""
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+
+        assert adapter.get_tracks_by_mytags([]) == []
+        adapter.db.engine.raw_connection.assert_not_called()
+
+
+class TestBatchWrites:
+    """Test suite for transactional batch updates."""
+
+    def _rows(self, db_file):
+        conn = sqlite3.connect(db_file)
+        rows = conn.execute(
+            "SELECT ID, FolderPath, FileSize, ServiceID, Analysed FROM djmdContent ORDER BY ID"
+        ).fetchall()
+        conn.close()
+        return {row[0]: row[1:] for row in rows}
+
+    def test_applies_all_updates_in_one_commit(self, tmp_path):
+        """Test that link and re-analysis updates share one connection."""
+        db_file = tmp_path / "master.db"
+        adapter = _sqlite_adapter(db_file)
+
+        ok = adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10, reanalyze=True),
+            LocalLinkUpdate(track_id=4, file_path="/music/b.aiff", file_size=20),
+        ])
+
+        assert ok
+        assert adapter.db.engine.raw_connection.call_count == 1
+        rows = self._rows(db_file)
+        assert rows["1"] == ("/music/a.aiff", 10, 0, 0)
+        assert rows["4"] == ("/music/b.aiff", 20, 0, 105)
+
+    def test_missing_track_rolls_back_whole_batch(self, tmp_path):
+        """Test that a missing ID leaves every row untouched."""
+        db_file = tmp_path / "master.db"
+        adapter = _sqlite_adapter(db_file)
+        before = self._rows(db_file)
+
+        ok = adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10),
+            LocalLinkUpdate(track_id=999, file_path="/music/b.aiff", file_size=20),
+        ])
+
+        assert not ok
+        assert "expected 2" in adapter.error_message
+        assert self._rows(db_file) == before
+
+
+class TestUndoJournal:
+    """Test suite for journaling writes and undoing them."""
+
+    def _journaled_adapter(self, tmp_path):
+        adapter = _sqlite_adapter(tmp_path / "master.db")
+        adapter.journal = UndoJournal(tmp_path / "master.undo.jsonl", run_id="run1")
+        return adapter
+
+    def _row(self, db_file, track_id):
+        conn = sqlite3.connect(db_file)
+        row = conn.execute(
+            "SELECT FolderPath, FileSize, ServiceID, Analysed FROM djmdContent WHERE ID = ?",
+            (track_id,),
+        ).fetchone()
+        conn.close()
+        return row
+
+    def test_batch_write_is_journaled_and_undone(self, tmp_path):
+        """Test that undo restores every column a batch changed."""
+        adapter = self._journaled_adapter(tmp_path)
+        db_file = tmp_path / "master.db"
+        before = {tid: self._row(db_file, tid) for tid in ("1", "4")}
+
+        assert adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10, reanalyze=True),
+            LocalLinkUpdate(track_id=4, file_path="/music/b.aiff", file_size=20),
+        ])
+        entries = adapter.journal.entries("run1")
+        assert [(e.op, e.track_id) for e in entries] == [("link", "1"), ("link", "4")]
+
+        restored, skipped = adapter.undo_journal_entries(entries)
+
+        assert (restored, skipped) == (2, [])
+        assert {tid: self._row(db_file, tid) for tid in ("1", "4")} == before
+        assert self._row(db_file, "2") == ("/music/local.mp3", 100, 0, 105)
+
+    def test_undo_uses_values_from_before_the_first_write(self, tmp_path):
+        """Test that a row written twice goes back to its original values."""
+        adapter = self._journaled_adapter(tmp_path)
+        db_file = tmp_path / "master.db"
+        original = self._row(db_file, "1")
+        adapter.db.engine.raw_connection.side_effect = None
+        adapter.db.engine.raw_connection.return_value = sqlite3.connect(db_file)
+
+        assert adapter.update_track_to_local(1, "/music/a.aiff", 10)
+        assert adapter.force_reanalyze(1)
+        adapter.db.engine.raw_connection.side_effect = lambda: sqlite3.connect(db_file)
+
+        entries = adapter.journal.entries("run1")
+        assert [e.op for e in entries] == ["link", "reanalyze"]
+        adapter.undo_journal_entries(entries)
+
+        assert self._row(db_file, "1") == original
+
+    def test_rows_changed_since_are_skipped(self, tmp_path):
+        """Test that rows edited after the run are only restored with force."""
+        adapter = self._journaled_adapter(tmp_path)
+        db_file = tmp_path / "master.db"
+        adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10),
+        ])
+        conn = sqlite3.connect(db_file)
+        conn.execute("UPDATE djmdContent SET FolderPath = '/music/moved.aiff' WHERE ID = '1'")
+        conn.commit()
+        conn.close()
+        entries = adapter.journal.entries("run1")
+
+        assert adapter.undo_journal_entries(entries) == (0, ["1"])
+        assert self._row(db_file, "1")[0] == "/music/moved.aiff"
+        assert adapter.undo_journal_entries(entries, force=True) == (1, [])
+        assert self._row(db_file, "1")[0] == ""
+
+    def test_repeated_undo_after_partial_undo_skips_nothing(self, tmp_path):
+        """Test that rows an earlier undo restored are not reported as skipped again."""
+        adapter = self._journaled_adapter(tmp_path)
+        db_file = tmp_path / "master.db"
+        adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10),
+            LocalLinkUpdate(track_id=4, file_path="/music/b.aiff", file_size=20),
+        ])
+        conn = sqlite3.connect(db_file)
+        conn.execute("UPDATE djmdContent SET FolderPath = '/music/moved.aiff' WHERE ID = '4'")
+        conn.commit()
+        conn.close()
+        entries = adapter.journal.entries("run1")
+
+        assert adapter.undo_journal_entries(entries) == (1, ["4"])
+        conn = sqlite3.connect(db_file)
+        conn.execute("UPDATE djmdContent SET FolderPath = '/music/b.aiff' WHERE ID = '4'")
+        conn.commit()
+        conn.close()
+
+        assert adapter.undo_journal_entries(entries) == (1, [])
+
+    def test_failed_batch_is_not_journaled(self, tmp_path):
+        """Test that a rolled back batch leaves no journal entries."""
+        adapter = self._journaled_adapter(tmp_path)
+
+        assert not adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10),
+            LocalLinkUpdate(track_id=999, file_path="/music/b.aiff", file_size=20),
+        ])
+
+        assert adapter.journal.entries("run1") == []
+
+    def test_failed_commit_entries_are_not_undone(self, tmp_path):
+        """Test that entries journaled ahead of a failed commit leave rows alone on undo."""
+        adapter = self._journaled_adapter(tmp_path)
+        db_file = tmp_path / "master.db"
+        original = self._row(db_file, "1")
+
+        class FailingCommit:
+            def __init__(self):
+                self._conn = sqlite3.connect(db_file)
+
+            def __getattr__(self, name):
+                return getattr(self._conn, name)
+
+            def commit(self):
+                raise sqlite3.OperationalError("database is locked")
+
+        adapter.db.engine.raw_connection.side_effect = FailingCommit
+        assert not adapter.apply_link_batch([
+            LocalLinkUpdate(track_id=1, file_path="/music/a.aiff", file_size=10, reanalyze=True),
+        ])
+        adapter.db.engine.raw_connection.side_effect = lambda: sqlite3.connect(db_file)
+
+        entries = adapter.journal.entries("run1")
+        assert [e.track_id for e in entries] == ["1"]
+        assert self._row(db_file, "1") == original
+        assert adapter.undo_journal_entries(entries) == (0, [])
+        assert self._row(db_file, "1") == original
@@ -0,0 +1,135 @@
+"""Tests for the persistent scan cache."""
+import os
+import threading
+
+from src.services.file_path_matcher import FilePathMatcher, _list_music_dir
+from src.services.scan_cache import ScanCache
+
+OLD_MTIME_NS = 1_600_000_000 * 10**9
+
+
+def _library(root):
+    (root / "A").mkdir()
+    (root / "A" / "deep").mkdir()
+    (root / "B").mkdir()
+    for path in [
+        "top.mp3",
+        "A/Artist - One.mp3",
+        "A/deep/Artist - Two (Remix).flac",
+        "B/Other - Three.mp3",
+        "B/cover.jpg",
+    ]:
+        (root / path).write_text("x")
+    _age_dirs(root)
+
+
+def _age_dirs(root):
+    """Give directories an old mtime so the cache trusts them."""
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def _walk_scan(root):
+    matcher = FilePathMatcher()
+    return [(f.file_path, f.filename_clean) for f in matcher.scan_music_files(str(root))]
+
+
+def _cache_scan(cache, root):
+    return [(f.file_path, f.filename_clean) for f in cache.scan(str(root), _list_music_dir)]
+
+
+class TestScanCache:
+    """Test suite for directory mtime based scan caching."""
+
+    def test_matches_os_walk_scan(self, tmp_path):
+        """Test that cached scans return the same files in the same order."""
+        root = tmp_path / "music"
+        root.mkdir()
+        _library(root)
+        cache = ScanCache(str(tmp_path / "cache.db"))
+
+        first = _cache_scan(cache, root)
+        second = _cache_scan(cache, root)
+
+        assert first == _walk_scan(root)
+        assert second == first
+        assert cache.listed_dirs == 0
+        assert cache.cached_dirs == 4
+
+    def test_relists_only_changed_directories(self, tmp_path):
+        """Test that a new file is picked up by listing its directory again."""
+        root = tmp_path / "music"
+        root.mkdir()
+        _library(root)
+        cache = ScanCache(str(tmp_path / "cache.db"))
+        _cache_scan(cache, root)
+
+        (root / "A" / "deep" / "New - Four.mp3").write_text("x")
+        (root / "B" / "Other - Three.mp3").unlink()
+
+        files = _cache_scan(cache, root)
+
+        assert files == _walk_scan(root)
+        assert cache.listed_dirs == 2
+        assert cache.cached_dirs == 2
+
+    def test_recent_directories_are_not_trusted(self, tmp_path):
+        """Test that a directory changed during the mtime tick is listed again."""
+        root = tmp_path / "music"
+        root.mkdir()
+        (root / "one.mp3").write_text("x")
+        cache = ScanCache(str(tmp_path / "cache.db"))
+
+        _cache_scan(cache, root)
+        _cache_scan(cache, root)
+
+        assert cache.listed_dirs == 1
+
+    def test_removed_directories_are_pruned(self, tmp_path):
+        """Test that cache rows of deleted directories are dropped."""
+        root = tmp_path / "music"
+        root.mkdir()
+        _library(root)
+        cache = ScanCache(str(tmp_path / "cache.db"))
+        _cache_scan(cache, root)
+
+        for name in os.listdir(root / "A" / "deep"):
+            os.remove(root / "A" / "deep" / name)
+        os.rmdir(root / "A" / "deep")
+        _cache_scan(cache, root)
+
+        conn = cache._connect()
+        paths = {path for (path,) in conn.execute("SELECT path FROM directories")}
+        conn.close()
+        assert str(root / "A" / "deep") not in paths
+        assert str(root / "A") in paths
+
+    def test_matcher_uses_cache(self, tmp_path):
+        """Test that FilePathMatcher scans through the cache when configured."""
+        root = tmp_path / "music"
+        root.mkdir()
+        _library(root)
+        matcher = FilePathMatcher(scan_cache_path=str(tmp_path / "cache.db"))
+
+        files = matcher.scan_music_files(str(root))
+
+        assert [(f.file_path, f.filename_clean) for f in files] == _walk_scan(root)
+        assert (tmp_path / "cache.db").exists()
+
+    def test_directories_listed_on_scan_threads(self, tmp_path):
+        """Test that a cold cached scan lists directories on the thread pool."""
+        root = tmp_path / "music"
+        root.mkdir()
+        _library(root)
+        cache = ScanCache(str(tmp_path / "cache.db"))
+        listing_threads = []
+
+        def list_dir(directory):
+            listing_threads.append(threading.current_thread())
+            return _list_music_dir(directory)
+
+        files = [(f.file_path, f.filename_clean) for f in cache.scan(str(root), list_dir, threads=4)]
+
+        assert files == _walk_scan(root)
+        assert len(listing_threads) == 4
+        assert threading.main_thread() not in listing_threads
@@ -0,0 +1,70 @@
+"""Tests for shared text normalization."""
+import re
+
+import pytest
+
+from src.lib.text_utils import clean_text, normalize_filename, normalize_text
+
+SAMPLES = [
+    "",
+    "Deep Night (Original Mix)",
+    "Acid [Remastered 2019]  -  Dub",
+    "Ø [Phase] - Rising (Planetary Assault Systems Remix)",
+    "Björk — Hyperballad",
+    "01-artist_-_title_03",
+    "track.mp3",
+    "version.1.2",
+    "   spaced    out   ",
+]
+
+
+def _reference_clean_text(text):
+    """Cleaning chain previously inlined in the matchers."""
+    if not text:
+        return ""
+    text = re.sub(r'\([^)]*\)', '', text)
+    text = re.sub(r'\[[^\]]*\]', '', text)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text.lower()
+
+
+def _reference_clean_filename(filename):
+    """Filename cleaning previously in FilePathMatcher._clean_filename."""
+    if '.' in filename:
+        parts = filename.rsplit('.', 1)
+        if len(parts) == 2 and len(parts[1]) <= 4 and parts[1].isalpha():
+            filename = parts[0]
+    for pattern in [r'\([^)]*\)', r'\[[^\]]*\]', r'[-_]\d+$']:
+        filename = re.sub(pattern, ' ', filename, flags=re.IGNORECASE)
+    filename = re.sub(r'\s+', ' ', filename).strip()
+    filename = re.sub(r'[^\w\s]', '', filename)
+    return filename.lower()
+
+
+class TestTextUtils:
+    """Test suite for cached normalization helpers."""
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_clean_text_matches_previous_behaviour(self, text):
+        """Test that artist/title cleaning is unchanged."""
+        assert clean_text(text) == _reference_clean_text(text)
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_clean_filename_matches_previous_behaviour(self, text):
+        """Test that filename cleaning is unchanged."""
+        assert normalize_filename(text).text == _reference_clean_filename(text)
+
+    def test_words_are_presplit(self):
+        """Test that the word set comes with the cleaned text."""
+        normalized = normalize_text("Deep Night (Original Mix) Deep")
+        assert normalized.text == "deep night deep"
+        assert normalized.words == frozenset({"deep", "night"})
+
+    def test_results_are_memoized(self):
+        """Test that repeated strings are served from the cache."""
+        normalize_text.cache_clear()
+        first = normalize_text("Cache Me (Dub)")
+        second = normalize_text("Cache Me (Dub)")
+        assert first is second
+        assert normalize_text.cache_info().hits == 1
@@ -0,0 +1,32 @@
+"""Tests for the Track model."""
+from src.models.track import Track, is_streaming_path
+
+
+class TestStreamingClassification:
+    """Test suite for streaming-track classification."""
+
+    def test_empty_path_is_streaming(self):
+        """Test that missing or blank paths mark streaming tracks."""
+        assert is_streaming_path(None)
+        assert is_streaming_path("")
+        assert is_streaming_path("   ")
+
+    def test_service_names_match_case_insensitively(self):
+        """Test that any streaming service in the path is detected."""
+        assert is_streaming_path("/Users/dj/Music/TIDAL/track.mp4")
+        assert is_streaming_path("C:\\\\Apple Music\\\\song.m4a")
+        assert not is_streaming_path("/Users/dj/Music/House/track.aiff")
+
+    def test_classification_stored_on_record(self):
+        """Test that the flag is computed once and stored as a field."""
+        track = Track(id=1, folder_path="/music/local.mp3")
+        assert track.is_streaming is False
+
+        track = Track(id=2, folder_path="")
+        assert track.is_streaming is True
+
+    def test_explicit_classification_is_kept(self):
+        """Test that a caller-provided flag (e.g. from ServiceID) wins."""
+        track = Track(id=1, folder_path="/music/local.mp3", is_streaming=True)
+        assert track.is_streaming is True
+        assert track.to_csv_row()["streaming"] == "Yes"
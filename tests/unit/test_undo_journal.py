@@ -0,0 +1,49 @@
+"""Tests for the undo journal file."""
+from src.services.undo_journal import UndoJournal, default_journal_path
+
+
+class TestUndoJournal:
+    """Test suite for recording and listing journaled runs."""
+
+    def test_default_path_next_to_database(self, tmp_path):
+        """Test that the journal lives beside the database."""
+        assert default_journal_path(tmp_path / "master.db") == tmp_path / "master.undo.jsonl"
+
+    def test_runs_and_last_run(self, tmp_path):
+        """Test that undone runs are skipped when picking the run to revert."""
+        path = tmp_path / "master.undo.jsonl"
+        first = UndoJournal(path, run_id="a")
+        first.record("link", {"1": ["", 0, 7]}, {"1": ["/x.aiff", 10, 0]})
+        second = UndoJournal(path, run_id="b")
+        second.record("link", {"2": ["", 0, 0], "3": ["", 0, 0]}, {})
+
+        assert [(r.run, r.rows, r.undone) for r in first.runs()] == [
+            ("a", 1, False), ("b", 2, False)
+        ]
+        assert first.last_run() == "b"
+
+        second.mark_undone("b")
+
+        assert first.last_run() == "a"
+        assert [(e.track_id, e.before, e.after) for e in first.entries("a")] == [
+            ("1", ["", 0, 7], ["/x.aiff", 10, 0])
+        ]
+        # Missing "after" values default to the "before" ones
+        assert first.entries("b")[0].after == ["", 0, 0]
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        """Test that a line cut short by a crash does not hide earlier entries."""
+        path = tmp_path / "master.undo.jsonl"
+        journal = UndoJournal(path, run_id="a")
+        journal.record("link", {"1": ["", 0, 7]}, {"1": ["/x.aiff", 10, 0]})
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"run":"a","op":"li')
+
+        assert len(journal.entries("a")) == 1
+
+    def test_missing_journal(self, tmp_path):
+        """Test that a journal file that does not exist has no runs."""
+        journal = UndoJournal(tmp_path / "none.jsonl")
+
+        assert journal.runs() == []
+        assert journal.last_run() is None